@@ -1,28 +1,36 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
+import time
+
+_script_t0 = time.perf_counter()
+
 import os
+import sys
 import base64
-import requests
-import numpy as np
-import json
-
-
-CORE_150_COLS = ["语文", "数学", "英语"]
-ELECTIVE_FUFEN_COLS = [
-    "历史赋分",
-    "地理赋分",
-    "政治赋分",
-    "物理赋分",
-    "化学赋分",
-    "生物赋分",
-    "技术赋分",
-]
-ELECTIVE_SUBJECTS = ["历史", "地理", "政治", "物理", "化学", "生物", "技术"]
+import streamlit as st
+
+from gaokao.profiling import StartupProfile
+
+# 冷启动耗时记录（GAOKAO_PROFILE_STARTUP=1 时开启）
+profile = StartupProfile.from_env(_script_t0)
+
 
 DEFAULT_AI_BASE_URL = "https://dashscope.aliyuncs.com/compatible-mode/v1"
 DEFAULT_AI_MODEL = "qwen-plus"
 
+# 后台任务名称
+AI_JOB = "ai_chat"
+ADMISSION_JOB = "admission"
+REPORT_JOB = "batch_reports"
+JOB_POLL_SECONDS = 1.0
+
+# 录取结果磁盘缓存上限（MB），超出后淘汰最久未访问的结果
+RESULT_CACHE_MB = int(os.environ.get("GAOKAO_RESULT_CACHE_MB", "256"))
+
+WEBFONT_NAME = "webfont-subset.woff2"
+EMBED_FONT_MAX_BYTES = 200_000  # 约 200KB
+
+# 批量报告进程池的启动方式：服务进程中有多个线程，fork 出的子进程可能继承被占用的锁
+REPORT_START_METHOD = "spawn"
+
 # 设置页面配置
 st.set_page_config(
     page_title="高考数据分析看板",
@@ -38,41 +46,76 @@ def get_font_base64(font_path):
         data = f.read()
     return base64.b64encode(data).decode()
 
-# 尝试加载字体
+
 app_dir = os.path.dirname(os.path.abspath(__file__))
-font_path = os.path.join(app_dir, "static", "京華老宋体v3.0.ttf")
-font_base64 = ""
-font_loaded = False
-font_error = None
-
-# 说明：在 Streamlit Cloud 上把大字体文件以 Base64 内嵌到 CSS，
-# 可能导致首屏传输内容过大，触发 WebSocket 断开，从而表现为页面一直加载。
-# 因此默认仅在字体较小或显式开启时才进行内嵌。
-EMBED_FONT_MAX_BYTES = 200_000  # 约 200KB
-embed_font_for_css = os.environ.get("GAOKAO_EMBED_FONT", "0") == "1"
-try:
-    if os.path.exists(font_path):
-        font_size = os.path.getsize(font_path)
-        if embed_font_for_css or font_size <= EMBED_FONT_MAX_BYTES:
-            font_base64 = get_font_base64(font_path)
-            font_loaded = bool(font_base64)
+
+
+# scripts/build_webfont.py 生成的子集字体（仅含界面与数据用字），通过静态文件服务加载
+WEBFONT_PATH = os.path.join(app_dir, "static", WEBFONT_NAME)
+
+
+def _webfont_mtime():
+    """子集字体的修改时间，不存在时为 None；每次重跑只做一次 stat。"""
+    try:
+        return int(os.path.getmtime(WEBFONT_PATH))
+    except OSError:
+        return None
+
+
+@st.cache_resource(max_entries=4)
+def _build_font_face_css(webfont_mtime):
+    """字体检查按子集字体的版本（mtime）缓存，返回 (@font-face CSS, 错误信息)。"""
+    font_path = os.path.join(app_dir, "static", "京華老宋体v3.0.ttf")
+    font_base64 = ""
+    font_url = ""
+    font_loaded = False
+    font_error = None
+
+    # 说明：在 Streamlit Cloud 上把大字体文件以 Base64 内嵌到 CSS，
+    # 可能导致首屏传输内容过大，触发 WebSocket 断开，从而表现为页面一直加载。
+    # 因此默认仅在字体较小或显式开启时才进行内嵌。
+    embed_font_for_css = os.environ.get("GAOKAO_EMBED_FONT", "0") == "1"
+    try:
+        if webfont_mtime is not None:
+            # 以 mtime 作为版本号（也是本函数的缓存键）：字体重建后无需重启服务，浏览器缓存也随之失效
+            font_url = f"app/static/{WEBFONT_NAME}?v={webfont_mtime}"
+            font_loaded = True
+        elif os.path.exists(font_path):
+            font_size = os.path.getsize(font_path)
+            if embed_font_for_css or font_size <= EMBED_FONT_MAX_BYTES:
+                font_base64 = get_font_base64(font_path)
+                font_loaded = bool(font_base64)
+            else:
+                # 字体存在但不内嵌（使用后备字体），以提升线上稳定性
+                font_loaded = False
         else:
-            # 字体存在但不内嵌（使用后备字体），以提升线上稳定性
-            font_loaded = False
-    else:
-        font_error = f"字体文件未找到: {font_path}"
-except Exception as e:
-    font_error = f"字体加载失败: {e}"
-
-font_face_css = ""
-if font_loaded:
-    font_face_css = f"""
-    /* 引入本地字体 (Base64 嵌入) */
-    @font-face {{
-        font-family: 'GlobalFont';
-        src: url('data:font/ttf;base64,{font_base64}') format('truetype');
-    }}
-    """
+            font_error = f"字体文件未找到: {font_path}"
+    except Exception as e:
+        font_error = f"字体加载失败: {e}"
+
+    font_face_css = ""
+    if font_url:
+        font_face_css = f"""
+        /* 引入子集化网页字体 (静态文件，可被浏览器缓存) */
+        @font-face {{
+            font-family: 'GlobalFont';
+            src: url('{font_url}') format('woff2');
+            font-display: swap;
+        }}
+        """
+    elif font_loaded:
+        font_face_css = f"""
+        /* 引入本地字体 (Base64 嵌入) */
+        @font-face {{
+            font-family: 'GlobalFont';
+            src: url('data:font/ttf;base64,{font_base64}') format('truetype');
+        }}
+        """
+    return font_face_css, font_error
+
+
+with profile.section("font_css"):
+    font_face_css, font_error = _build_font_face_css(_webfont_mtime())
 
 # 自定义 CSS 美化
 st.markdown(f"""
@@ -134,99 +177,394 @@ with col_header2:
     st.markdown("### 🚀 智能分析 · 科学填报 · 模拟录取")
 
 st.markdown("---")
+profile.mark("first_paint")
+
+# 较重的依赖放在首屏内容发出之后再导入；plotly 与 requests 在实际绘图/调用 AI 时才导入
+with profile.section("import:pandas"):
+    import pandas as pd
+with profile.section("import:numpy"):
+    import numpy as np
+with profile.section("import:gaokao"):
+    from gaokao.admission import DEFAULT_ROUNDS, MODE_PARALLEL, MODE_ROUNDS, MODES, build_choices, simulate_admission
+    from gaokao.analytics import application_pressure
+    from gaokao.choices import MAX_CHOICES, encode_plan
+    from gaokao.data import CORE_150_COLS, ELECTIVE_FUFEN_COLS, ELECTIVE_SUBJECTS, PLAN_FILE, VOL_FILE, data_mtime, load_datasets
+    from gaokao.datasets import load_manifest
+    from gaokao.export import available_formats, export_bytes
+    from gaokao.jobs import session_runner
+    from gaokao.metrics import registry as metrics
+    from gaokao.optimizer import DEFAULT_K, cutoffs_from_plan, major_utilities, optimize_choices
+    from gaokao.paging import PagedTable
+    from gaokao.query import ScoreSegments, plan_score_column
+    from gaokao.reports import REPORT_FORMATS, build_context, generate_archive
+    from gaokao.result_cache import ResultCache, result_key
+    from gaokao.storage import DB_FILENAME, FrameStore, SqliteStore
+    from gaokao.whatif import CutoffTable, what_if
+
+
+def _plotly_express():
+    """首次渲染图表时才导入 plotly.express。"""
+    if "plotly.express" not in sys.modules:
+        with profile.section("import:plotly.express"):
+            import plotly.express
+    return sys.modules["plotly.express"]
+
 
 # 数据加载函数 (使用缓存提高性能)
-def _data_cache_buster() -> float:
-    app_dir = os.path.dirname(os.path.abspath(__file__))
-    base_path = os.path.join(app_dir, "data")
-    candidates = [
-        "赋分后的高考模拟数据_with_sciences.csv",
-        "赋分后的高考模拟数据.csv",
-        "高考考生位次.csv",
-        "招生计划.csv",
-        "志愿填报结果.csv",
-    ]
-    mtimes = []
-    for fn in candidates:
-        path = os.path.join(base_path, fn)
-        if os.path.exists(path):
-            try:
-                mtimes.append(os.path.getmtime(path))
-            except OSError:
-                pass
-    return float(max(mtimes)) if mtimes else 0.0
+# 确保从脚本所在目录读取资源，避免因启动目录不同导致找不到 data/static
+DATA_ROOT = os.environ.get("GAOKAO_DATA_DIR", os.path.join(app_dir, "data"))
 
+# 数据后端：csv（默认，整表读入内存）或 sqlite（先执行 python -m gaokao.storage import）
+DATA_BACKEND = os.environ.get("GAOKAO_BACKEND", "csv")
+USE_SQLITE = DATA_BACKEND == "sqlite"
 
-@st.cache_data
-def load_data(cache_buster: float):
-    # 确保从脚本所在目录读取资源，避免因启动目录不同导致找不到 data/static
-    app_dir = os.path.dirname(os.path.abspath(__file__))
-    base_path = os.path.join(app_dir, "data")
-    
-    # 1. 加载成绩数据（优先使用带三科的文件，如果存在）
-    candidate_files = [
-        "赋分后的高考模拟数据_with_sciences.csv",
-        "赋分后的高考模拟数据.csv",
-    ]
-    score_file = None
-    for fn in candidate_files:
-        path = os.path.join(base_path, fn)
-        if os.path.exists(path):
-            score_file = path
-            break
-
-    if score_file:
-        df_score = pd.read_csv(score_file)
-        # 计算总成绩（浙江3+3）：语数英原始分(150) + 选考等级分(100)中的最高三门
-        for c in CORE_150_COLS:
-            if c not in df_score.columns:
-                st.error(f"未找到成绩列: {c}")
-                return None, None, None, None
-
-        main = df_score[CORE_150_COLS].apply(pd.to_numeric, errors="coerce")
-        elective_cols = [c for c in ELECTIVE_FUFEN_COLS if c in df_score.columns]
-
-        if elective_cols:
-            elective = df_score[elective_cols].apply(pd.to_numeric, errors="coerce")
-            vals = elective.to_numpy(dtype=float)
-            vals = np.where(np.isnan(vals), -np.inf, vals)
-            top3 = np.sort(vals, axis=1)[:, -3:]
-            top3_sum = np.where(np.isneginf(top3), 0.0, top3).sum(axis=1)
-        else:
-            top3_sum = 0.0
+# 同时保留在内存中的数据集（分区）个数：切回这些分区时直接命中缓存，更早的分区被淘汰
+MAX_ACTIVE_PARTITIONS = int(os.environ.get("GAOKAO_MAX_PARTITIONS", "2"))
 
-        df_score["总成绩"] = main.sum(axis=1) + top3_sum
-    else:
-        st.error(f"未找到成绩文件（尝试过: {candidate_files}）")
-        return None, None, None, None
+# 数据集切换器：分区清单见 gaokao/datasets.py；只有一个数据集时不显示
+try:
+    manifest = load_manifest(DATA_ROOT)
+except ValueError as e:
+    st.error(str(e))
+    st.stop()
+with st.sidebar:
+    if len(manifest.partitions) > 1:
+        st.selectbox(
+            "📁 数据集",
+            manifest.keys,
+            index=manifest.keys.index(manifest.get(None).key),
+            format_func=lambda key: manifest.get(key).title,
+            key="dataset",
+        )
+    if manifest.missing:
+        st.warning(f"以下数据集在清单中登记但找不到成绩文件: {', '.join(manifest.missing)}")
+try:
+    partition = manifest.get(st.session_state.get("dataset"))
+except ValueError:
+    # 清单变更后会话中记住的数据集已不存在
+    partition = manifest.get(None)
+except FileNotFoundError:
+    partition = None
+DATA_DIR = manifest.path_of(partition) if partition is not None else DATA_ROOT
+# 未显式指定数据库时，每个分区使用自己目录下的 SQLite 数据库
+DB_PATH = os.environ.get("GAOKAO_DB", os.path.join(DATA_DIR, DB_FILENAME))
 
-    # 2. 加载位次数据
-    rank_file = os.path.join(base_path, "高考考生位次.csv")
-    if os.path.exists(rank_file):
-        df_rank = pd.read_csv(rank_file)
-    else:
-        df_rank = None
 
-    # 3. 加载招生计划
-    plan_file = os.path.join(base_path, "招生计划.csv")
-    if os.path.exists(plan_file):
-        df_plan = pd.read_csv(plan_file)
-    else:
-        df_plan = None
+def _data_cache_buster():
+    """缓存键：(分区, 数据文件修改时间)。各分区的缓存互不影响，切换分区不会使其它分区的缓存失效。"""
+    key = partition.key if partition is not None else None
+    if USE_SQLITE:
+        return key, os.path.getmtime(DB_PATH) if os.path.exists(DB_PATH) else 0.0
+    return key, data_mtime(DATA_DIR)
 
-    # 4. 加载志愿填报结果 (用于录取模拟)
-    vol_file = os.path.join(base_path, "志愿填报结果.csv")
-    if os.path.exists(vol_file):
-        df_vol = pd.read_csv(vol_file)
-    else:
-        df_vol = None
-        
-    return df_score, df_rank, df_plan, df_vol
+
+@st.cache_data(max_entries=MAX_ACTIVE_PARTITIONS)
+def load_data(cache_buster: tuple, data_path: str, _misses: list):
+    # 函数体只在 st.cache_data 未命中时执行；_misses 不参与缓存键，由调用方用来判断本次是否命中
+    _misses.append(data_path)
+    try:
+        if USE_SQLITE:
+            return SqliteStore(data_path).load_datasets()
+        return load_datasets(data_path)
+    except (FileNotFoundError, ValueError) as e:
+        st.error(str(e))
+        return None, None, None, None
 
 # 加载数据（cache_buster 用于当 CSV 更新后自动刷新缓存）
-df_score, df_rank, df_plan, df_vol = load_data(_data_cache_buster())
+_load_data_misses = []
+_cache_buster = _data_cache_buster()
+with profile.section("load_data"), metrics.timer("load_data"):
+    df_score, df_rank, df_plan, df_vol = load_data(_cache_buster, DB_PATH if USE_SQLITE else DATA_DIR, _load_data_misses)
+metrics.record_cache("load_data", hit=not _load_data_misses)
+profile.mark("data_loaded")
+
+
+@st.cache_resource(max_entries=MAX_ACTIVE_PARTITIONS)
+def _get_store(cache_buster: tuple, _df_score, _df_plan):
+    """个人查询与志愿推荐的数据访问层，按数据版本在进程内共享。"""
+    if USE_SQLITE:
+        return SqliteStore(DB_PATH)
+    return FrameStore(_df_score, _df_plan)
+
+job_runner = session_runner(st.session_state)
+
+
+@st.cache_resource
+def _get_result_cache():
+    cache_dir = os.environ.get("GAOKAO_CACHE_DIR", os.path.join(app_dir, ".cache", "admission"))
+    return ResultCache(cache_dir, disk_bytes=RESULT_CACHE_MB * 1024 * 1024)
+
+
+result_cache = _get_result_cache()
+
+
+def _admission_options():
+    """录取页选择的规则与参数（未打开录取页时取默认值）。"""
+    mode = st.session_state.get("admission_mode", MODE_PARALLEL)
+    if mode != MODE_ROUNDS:
+        return {"mode": mode}
+    return {
+        "mode": mode,
+        "adjust_default": bool(st.session_state.get("admission_adjust", False)),
+        "max_rounds": int(st.session_state.get("admission_rounds", DEFAULT_ROUNDS)),
+    }
+
+
+def _admission_result_key():
+    options = _admission_options()
+    # 默认规则沿用原缓存键，已有的缓存结果仍然有效
+    variant = "" if options["mode"] == MODE_PARALLEL else "|".join(f"{k}={v}" for k, v in sorted(options.items()))
+    if USE_SQLITE:
+        return result_key(DB_PATH, DB_PATH, variant)
+    return result_key(os.path.join(DATA_DIR, PLAN_FILE), os.path.join(DATA_DIR, VOL_FILE), variant)
+
+
+@st.cache_resource(max_entries=MAX_ACTIVE_PARTITIONS)
+def _get_choice_matrix(cache_buster: tuple, _df_plan, _df_vol):
+    """志愿矩阵（考生 × K 的 int32 专业 id）在数据加载后只构建一次。"""
+    with metrics.timer("build_choice_matrix"):
+        return build_choices(_df_plan, _df_vol)
+
+
+@st.cache_resource(max_entries=MAX_ACTIVE_PARTITIONS)
+def _get_plan_index(cache_buster: tuple, _df_plan):
+    """招生计划的专业编码，与志愿矩阵中的专业 id 一致。"""
+    return encode_plan(_df_plan)
+
+
+@st.cache_resource(max_entries=4)
+def _get_cutoff_ranks(cache_key, _plan, _df_plan, _score_col, _segments, _cutoffs=None):
+    """各专业录取位次线：有录取模拟结果时取模拟中的位次线，否则由分数线换算。"""
+    if _cutoffs is not None:
+        return _cutoffs.cutoff_ranks(np.arange(len(_plan)))
+    return cutoffs_from_plan(_plan, _df_plan, _score_col, _segments)
+
+
+@st.cache_resource(max_entries=MAX_ACTIVE_PARTITIONS)
+def _get_pressure_report(cache_buster: tuple, _choices):
+    """报考热度统计按数据版本缓存。"""
+    with metrics.timer("application_pressure"):
+        return application_pressure(_choices)
+
+
+@st.cache_resource(max_entries=MAX_ACTIVE_PARTITIONS)
+def _get_score_segments(cache_buster: tuple, _df_rank, _df_score):
+    """一分一段表与考生总分。优先使用位次表，使推演位次与志愿数据中的位次同源。"""
+    source = _df_rank if _df_rank is not None and "总成绩" in _df_rank.columns else _df_score
+    totals = pd.to_numeric(source["总成绩"], errors="coerce")
+    # SQLite 后端只加载图表所需的成绩列，没有准考证号时推演直接使用查询到的总分
+    scores_by_id = dict(zip(source["准考证号"].astype(str), totals.tolist())) if "准考证号" in source.columns else {}
+    return ScoreSegments(totals.to_numpy(dtype=float)), scores_by_id
+
+
+@st.cache_resource(max_entries=4)
+def _get_cutoffs(admission_key: str, _choices, _df_result):
+    """各专业录取位次表，随录取结果（缓存键）更新。"""
+    return CutoffTable.from_result(_choices, _df_result)
+
+
+@st.fragment
+def _render_what_if(exam_id, fallback_score):
+    """分数增减推演：拖动滑块时只重跑本片段，不重新模拟录取。"""
+    st.markdown("#### 🔮 如果多考几分？")
+    if df_plan is None or df_vol is None:
+        st.caption("缺少招生计划或志愿数据，无法推演。")
+        return
+
+    admission_key = _admission_result_key()
+    admission = result_cache.get(admission_key)
+    if admission is None:
+        st.info("请先在「录取模拟」页运行一次模拟录取，推演基于该次结果中各专业的录取位次。")
+        return
+
+    choices = _get_choice_matrix(_cache_buster, df_plan, df_vol)
+    row = choices.row_of(exam_id)
+    if row is None:
+        st.caption("该考生没有志愿填报记录。")
+        return
+    # 模拟录取使用志愿数据中填报的位次；推演以它为基准，只叠加一分一段表上的位次变化，
+    # 使分数不变时的推演结果与模拟一致
+    filed_rank = pd.to_numeric(choices.candidates["位次"].iloc[row], errors="coerce")
+
+    segments, scores_by_id = _get_score_segments(_cache_buster, df_rank, df_score)
+    base_score = scores_by_id.get(exam_id, fallback_score)
+    delta = st.slider("总分变化", min_value=-30, max_value=30, value=0, key=f"whatif_{exam_id}")
+
+    with metrics.timer("tab2_what_if"):
+        shift = segments.rank_for_score(base_score + delta) - segments.rank_for_score(base_score)
+        base_rank = segments.rank_for_score(base_score) if pd.isna(filed_rank) else int(filed_rank)
+        new_rank = max(base_rank + shift, 1)
+        cutoffs = _get_cutoffs(admission_key, choices, admission.df_result)
+        df_what_if = what_if(choices, cutoffs, exam_id, new_rank)
+
+    w_col1, w_col2 = st.columns(2)
+    w_col1.metric("推演总分", f"{base_score + delta:.0f} 分", delta=f"{delta:+d}" if delta else None)
+    w_col2.metric(
+        "推演位次",
+        f"{new_rank}",
+        delta=f"{new_rank - base_rank:+d}" if new_rank != base_rank else None,
+        delta_color="inverse",
+    )
+    st.dataframe(df_what_if, hide_index=True, width='stretch')
+
+
+@st.cache_resource(max_entries=8)
+def _get_paged_table(key, _df, category_cols: tuple = (), range_col=None):
+    """分页表格的索引只按 key 构建一次，筛选/翻页时复用。"""
+    return PagedTable(_df, category_cols=category_cols, range_col=range_col)
+
+
+@st.fragment
+def _render_paged_table(table, key: str, column_config=None):
+    """分页表格：筛选、排序、翻页只重跑本片段，且只把当前页发送到浏览器。"""
+    filters = {}
+    n_filters = len(table.category_cols) + (1 if table.range_col else 0)
+    filter_cols = st.columns(max(n_filters, 1))
+    for col, box in zip(table.category_cols, filter_cols):
+        value = box.selectbox(col, table.options(col), index=None, placeholder="全部", key=f"{key}_f_{col}")
+        if value is not None:
+            filters[col] = value
+
+    value_range = None
+    bounds = table.range_bounds()
+    if bounds is not None and bounds[0] < bounds[1]:
+        picked = filter_cols[-1].slider(
+            f"{table.range_col}范围", bounds[0], bounds[1], bounds, key=f"{key}_range",
+        )
+        if tuple(picked) != tuple(bounds):
+            value_range = picked
+
+    s_col1, s_col2, s_col3, s_col4 = st.columns([2, 1, 1, 1])
+    sort_by = s_col1.selectbox(
+        "排序", list(table.df.columns), index=None, placeholder="默认顺序", key=f"{key}_sort",
+    )
+    descending = s_col2.toggle("降序", key=f"{key}_desc", disabled=sort_by is None)
+    page_size = s_col3.selectbox("每页行数", [20, 50, 100, 200], index=1, key=f"{key}_size")
+    page_no = s_col4.number_input("页码", min_value=1, value=1, step=1, key=f"{key}_page")
+
+    with metrics.timer("paged_table"):
+        page = table.page(
+            filters=filters,
+            value_range=value_range,
+            sort_by=sort_by,
+            ascending=not descending,
+            page=page_no,
+            page_size=page_size,
+        )
+
+    st.dataframe(page.frame, width='stretch', hide_index=True, column_config=column_config)
+    st.caption(f"共 {page.total} 条（全部 {len(table)} 条），第 {page.page}/{page.pages} 页")
+
+
+def _render_download(df, key: str, label: str, file_stem: str):
+    """按需导出：点击下载时才分块写出，不在每次重跑时生成整份文件。"""
+    d_col1, d_col2 = st.columns([1, 2], vertical_alignment="bottom")
+    fmt = d_col1.selectbox("导出格式", available_formats(), format_func=lambda f: f.label, key=f"{key}_fmt")
+    d_col2.download_button(
+        label=f"📥 {label} ({fmt.label})",
+        data=lambda: export_bytes(df, fmt.name),
+        file_name=f"{file_stem}{fmt.suffix}",
+        mime=fmt.mime,
+        key=f"{key}_download",
+    )
+
+
+def _run_admission(key, df_plan, df_vol, choices, options, progress=None):
+    with metrics.timer("admission_simulate"):
+        df_result = simulate_admission(df_plan, df_vol, progress=progress, choices=choices, **options)
+    return result_cache.put(key, df_result)
+
+
+def _run_reports(ctx, fmt, progress=None):
+    """在进程池中生成批量报告，返回临时 zip 文件（ReportArchive，会话结束后随之删除）。"""
+    with metrics.timer("batch_reports"):
+        return generate_archive(ctx, fmt, progress=progress, start_method=REPORT_START_METHOD)
+
+
+def _render_batch_reports(df_cohort):
+    """批量报告：对侧边栏筛选后的考生逐人生成成绩卡、雷达图、位次与推荐志愿，打包下载。"""
+    st.caption(f"为侧边栏筛选后的 {len(df_cohort)} 名考生各生成一份报告（与上方成绩单相同的成绩卡与雷达图，外加位次和推荐志愿），打包为 zip。")
+    if not {"准考证号", "姓名"}.issubset(df_cohort.columns):
+        st.info("当前数据后端未加载考生信息列，请在命令行使用 python -m gaokao.reports 生成。")
+        return
+
+    b_col1, b_col2 = st.columns([1, 2])
+    fmt = b_col1.selectbox("报告格式", list(REPORT_FORMATS), format_func=REPORT_FORMATS.get, key="report_fmt")
+    totals = pd.to_numeric(df_cohort["总成绩"], errors="coerce")
+    lo, hi = int(np.floor(totals.min())), int(np.ceil(totals.max()))
+    score_range = b_col2.slider("总分范围", lo, hi, (lo, hi), key="report_range") if lo < hi else (lo, hi)
+    cohort = df_cohort[totals.between(*score_range)]
+
+    if st.button(
+        f"🖨️ 生成 {len(cohort)} 份报告",
+        disabled=cohort.empty or bool(job_runner.running(REPORT_JOB)),
+    ):
+        segments, _ = _get_score_segments(_cache_buster, df_rank, df_score)
+        job = job_runner.submit(
+            REPORT_JOB, _run_reports, build_context(cohort, df_plan, segments), fmt, with_progress=True,
+        )
+        job.message = "正在启动进程池..."
+        st.session_state.report_error = None
+
+    _render_job_status(REPORT_JOB)
+
+    if st.session_state.get("report_error"):
+        st.error(f"生成报告失败：{st.session_state.report_error}")
+
+    archive = st.session_state.get("report_zip")
+    if archive is not None and not archive.closed:
+        summary = archive.summary
+        st.success(
+            f"已生成 {summary.count} 份报告（{summary.workers} 个进程，用时 {summary.seconds:.1f} 秒）"
+        )
+        st.download_button(
+            label="📥 下载报告压缩包",
+            data=archive.read_bytes,
+            file_name="成绩报告.zip",
+            mime="application/zip",
+            key="report_download",
+        )
+
+
+def _collect_finished_jobs():
+    """把已完成的后台任务结果写回会话状态，避免重复计算。"""
+    for job in job_runner.finished():
+        job_runner.pop(job.name)
+        error = job.future.exception()
+        if job.name == AI_JOB:
+            content = f"调用失败：{error}" if error else job.future.result()
+            st.session_state.ai_messages.append({"role": "assistant", "content": content})
+        elif job.name == ADMISSION_JOB:
+            # 结果已由任务写入 result_cache，这里只记录错误
+            st.session_state.admission_error = str(error) if error else None
+        elif job.name == REPORT_JOB:
+            st.session_state.report_error = str(error) if error else None
+            if error is None:
+                # 新的压缩包替换上一次的临时文件
+                previous = st.session_state.get("report_zip")
+                if previous is not None:
+                    previous.close()
+                st.session_state.report_zip = job.future.result()
+
+
+def _render_job_status(*names):
+    """在后台任务运行期间定时刷新进度；任务结束后整页重跑以展示结果。"""
+    @st.fragment(run_every=JOB_POLL_SECONDS)
+    def _poll():
+        running = job_runner.running(*names)
+        if not running:
+            st.rerun()
+        for job in running:
+            label = job.message or "任务进行中..."
+            st.progress(job.progress, text=f"{label}（已用时 {job.elapsed:.0f} 秒）")
+
+    if job_runner.running(*names):
+        _poll()
+
 
 if df_score is not None:
+    store = _get_store(_cache_buster, df_score, df_plan)
+
     # 侧边栏 - 全局筛选
     with st.sidebar:
         st.header("🔍 控制面板")
@@ -300,11 +638,16 @@ if df_score is not None:
                 "messages": messages,
                 "temperature": 0.2,
             }
-            resp = requests.post(url, headers=headers, json=payload, timeout=60)
+            import requests
+
+            with metrics.timer("ai_call"):
+                resp = requests.post(url, headers=headers, json=payload, timeout=60)
             resp.raise_for_status()
             data = resp.json()
             return data["choices"][0]["message"]["content"]
 
+        _collect_finished_jobs()
+
         with st.container(height=300):
             for m in st.session_state.ai_messages:
                 if m["role"] == "system":
@@ -312,23 +655,23 @@ if df_score is not None:
                 with st.chat_message(m["role"]):
                     st.markdown(m["content"])
 
-        user_prompt = st.chat_input("输入你的问题…")
+        _render_job_status(AI_JOB)
+
+        user_prompt = st.chat_input("输入你的问题…", disabled=bool(job_runner.running(AI_JOB)))
         if user_prompt and user_prompt.strip():
             st.session_state.ai_messages.append({"role": "user", "content": user_prompt.strip()})
-            try:
-                with st.spinner("AI 思考中..."):
-                    answer = _call_openai_compatible(st.session_state.ai_messages)
-                st.session_state.ai_messages.append({"role": "assistant", "content": answer})
-                st.rerun()
-            except Exception as e:
-                st.session_state.ai_messages.append({"role": "assistant", "content": f"调用失败：{e}"})
-                st.rerun()
+            # 在后台线程调用 AI，期间可继续浏览其它标签页
+            job = job_runner.submit(AI_JOB, _call_openai_compatible, list(st.session_state.ai_messages))
+            job.message = "AI 思考中..."
+            st.rerun()
 
     # 创建标签页
-    tab1, tab2, tab3, tab4 = st.tabs(["📈 成绩整体分析", "🔍 个人成绩查询", "🏫 志愿填报参考", "🎓 录取模拟"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(
+        ["📈 成绩整体分析", "🔍 个人成绩查询", "🏫 志愿填报参考", "🎓 录取模拟", "🔥 报考热度"]
+    )
 
     # --- Tab 1: 成绩整体分析 ---
-    with tab1:
+    with tab1, metrics.timer("tab1_charts"):
         st.header("📊 模拟高考成绩概览")
         
         # 关键指标 (KPI)
@@ -350,6 +693,7 @@ if df_score is not None:
         with c1:
             with st.container():
                 # 直方图：总成绩分布
+                px = _plotly_express()
                 fig_hist = px.histogram(
                     df_filtered, 
                     x="总成绩", 
@@ -370,6 +714,7 @@ if df_score is not None:
                 # 简单的melt操作用于绘图
                 if subjects:
                     df_melted = df_filtered.melt(value_vars=subjects, var_name="科目", value_name="分数")
+                    px = _plotly_express()
                     fig_box = px.box(
                         df_melted, 
                         x="科目", 
@@ -383,7 +728,7 @@ if df_score is not None:
                     st.info("未检测到分科成绩列，无法展示箱线图。")
 
     # --- Tab 2: 个人成绩查询 ---
-    with tab2:
+    with tab2, metrics.timer("tab2_search"):
         st.header("🔍 个人成绩单查询")
         
         col_search, col_padding = st.columns([1, 2])
@@ -392,9 +737,7 @@ if df_score is not None:
         
         if search_input:
             # 模糊匹配
-            mask = (df_score['姓名'].astype(str).str.contains(search_input)) | \
-                   (df_score['准考证号'].astype(str).str.contains(search_input))
-            student_result = df_score[mask]
+            student_result = store.find_students(search_input)
             
             if not student_result.empty:
                 st.success(f"🎉 查询成功！共找到 {len(student_result)} 条记录")
@@ -437,6 +780,7 @@ if df_score is not None:
                                 # 确保是数值
                                 scores = pd.to_numeric(pd.Series(scores), errors="coerce").fillna(0).tolist()
                                 df_radar = pd.DataFrame({"r": scores, "theta": labels})
+                                px = _plotly_express()
                                 fig_radar = px.line_polar(
                                     df_radar,
                                     r="r",
@@ -449,16 +793,21 @@ if df_score is not None:
                                 st.plotly_chart(fig_radar, width='stretch')
                             else:
                                 st.info("未检测到该考生完整的主课/选考数据。")
+
+                        _render_what_if(str(row['准考证号']), row['总成绩'])
             else:
                 st.warning("未找到匹配的学生信息，请检查输入是否正确。")
 
+        with st.expander("📦 批量生成成绩报告"):
+            _render_batch_reports(df_filtered)
+
     # --- Tab 3: 志愿填报参考 ---
-    with tab3:
+    with tab3, metrics.timer("tab3_recommend"):
         st.header("🏫 智能志愿推荐参考")
         
         if df_plan is not None:
             # 子标签页：总分推荐 和 详细成绩推荐
-            sub_tab1, sub_tab2 = st.tabs(["📊 基于总分推荐", "📝 输入详细成绩推荐"])
+            sub_tab1, sub_tab2, sub_tab3 = st.tabs(["📊 基于总分推荐", "📝 输入详细成绩推荐", "🧮 志愿表优化"])
             
             with sub_tab1:
                 st.info("💡 基于您的总成绩和位次，筛选历年录取情况（模拟数据）。")
@@ -468,38 +817,25 @@ if df_score is not None:
                     my_score = st.number_input("输入你的预估总分", min_value=0, max_value=750, value=int(df_filtered['总成绩'].mean()))
                 
                 # 简单的推荐逻辑：推荐 录取分 <= 我的分数 的学校，且分差在一定范围内
-                # 假设招生计划表有 '最低投档分' 或类似字段
-                # 先检查列名
-                # st.write(df_plan.columns) # 调试用
-                
-                # 尝试寻找分数线列
-                score_col = None
-                for col in df_plan.columns:
-                    if '分' in col:
-                        score_col = col
-                        break
+                # 分数线列取招生计划中第一个含“分”的列（如 '最低投档分'）
+                score_col = plan_score_column(df_plan)
                 
                 if score_col:
-                    # 筛选逻辑： 录取分 <= 我的分数 且 录取分 > 我的分数 - 30 (冲稳保的简单模拟)
-                    # 注意：实际数据中可能是字符串或含有非数字，需要处理
                     try:
-                        # 清洗数据，确保是数字
-                        df_plan_clean = df_plan.copy()
-                        df_plan_clean[score_col] = pd.to_numeric(df_plan_clean[score_col], errors='coerce')
-                        df_plan_clean = df_plan_clean.dropna(subset=[score_col])
-                        
                         # 推荐区间：[我的分数-40, 我的分数+10] (可以冲一点，也可以保底)
-                        recommendations = df_plan_clean[
-                            (df_plan_clean[score_col] <= my_score + 10) & 
-                            (df_plan_clean[score_col] >= my_score - 40)
-                        ].sort_values(by=score_col, ascending=False)
+                        recommendations = store.recommend(my_score)
                         
                         st.write(f"为您推荐 **{len(recommendations)}** 个可能的志愿方向 (分数范围: {my_score-40} - {my_score+10}):")
                         
-                        # 使用 data_editor 展示更美观的表格
-                        st.dataframe(
-                            recommendations,
-                            width='stretch',
+                        # 推荐结果留在服务端，分页展示
+                        _render_paged_table(
+                            _get_paged_table(
+                                ("tab3_total", _cache_buster, my_score),
+                                recommendations,
+                                ("院校名称", "专业名称"),
+                                score_col,
+                            ),
+                            "tab3_total",
                             column_config={
                                 "院校名称": st.column_config.TextColumn("院校名称", help="学校名称"),
                                 score_col: st.column_config.ProgressColumn(
@@ -511,11 +847,13 @@ if df_score is not None:
                                 ),
                             }
                         )
+                        _render_download(recommendations, "tab3_total", "下载推荐结果", f"志愿推荐_{my_score}分")
                         
                         if not recommendations.empty:
                             # 简单的统计图
                             if '院校名称' in recommendations.columns:
                                 top_schools = recommendations['院校名称'].value_counts().head(10)
+                                px = _plotly_express()
                                 fig_schools = px.bar(
                                     x=top_schools.index, 
                                     y=top_schools.values, 
@@ -575,29 +913,23 @@ if df_score is not None:
                     # 使用计算的总分进行推荐
                     my_score = total_score
                     
-                    score_col = None
-                    for col in df_plan.columns:
-                        if '分' in col:
-                            score_col = col
-                            break
+                    score_col = plan_score_column(df_plan)
                     
                     if score_col:
                         try:
-                            df_plan_clean = df_plan.copy()
-                            df_plan_clean[score_col] = pd.to_numeric(df_plan_clean[score_col], errors='coerce')
-                            df_plan_clean = df_plan_clean.dropna(subset=[score_col])
-                            
                             # 推荐区间：[我的分数-40, 我的分数+10]
-                            recommendations = df_plan_clean[
-                                (df_plan_clean[score_col] <= my_score + 10) & 
-                                (df_plan_clean[score_col] >= my_score - 40)
-                            ].sort_values(by=score_col, ascending=False)
+                            recommendations = store.recommend(my_score)
                             
                             st.success(f"为您推荐 **{len(recommendations)}** 个可能的志愿方向 (分数范围: {my_score-40:.1f} - {my_score+10:.1f}):")
                             
-                            st.dataframe(
-                                recommendations,
-                                width='stretch',
+                            _render_paged_table(
+                                _get_paged_table(
+                                    ("tab3_detail", _cache_buster, my_score),
+                                    recommendations,
+                                    ("院校名称", "专业名称"),
+                                    score_col,
+                                ),
+                                "tab3_detail",
                                 column_config={
                                     "院校名称": st.column_config.TextColumn("院校名称", help="学校名称"),
                                     "专业名称": st.column_config.TextColumn("专业名称", help="专业名称"),
@@ -614,6 +946,7 @@ if df_score is not None:
                             if not recommendations.empty:
                                 # 按学校分组显示
                                 school_recs = recommendations.groupby('院校名称').size().sort_values(ascending=False).head(10)
+                                px = _plotly_express()
                                 fig_schools = px.bar(
                                     x=school_recs.index, 
                                     y=school_recs.values, 
@@ -627,114 +960,233 @@ if df_score is not None:
                             st.error(f"数据处理出错: {e}")
                     else:
                         st.warning("在招生计划表中未找到分数线相关列，无法自动推荐。请检查数据源。")
+
+            with sub_tab3:
+                st.info("💡 根据位次、专业偏好和各专业录取概率，自动挑选并排序志愿，使期望效用最大（平行志愿规则）。")
+
+                plan_index = _get_plan_index(_cache_buster, df_plan)
+                segments, _ = _get_score_segments(_cache_buster, df_rank, df_score)
+
+                o_col1, o_col2 = st.columns(2)
+                with o_col1:
+                    opt_score = st.number_input(
+                        "预估总分", min_value=0, max_value=750, value=int(df_filtered['总成绩'].mean()), key="opt_score",
+                    )
+                    opt_k = st.number_input("志愿个数", min_value=1, max_value=MAX_CHOICES, value=DEFAULT_K, key="opt_k")
+                    opt_rank = segments.rank_for_score(opt_score)
+                    st.metric("对应位次", f"{opt_rank}")
+                with o_col2:
+                    major_options = sorted(pd.unique(plan_index.majors).tolist())
+                    liked = st.multiselect("偏好专业", major_options, key="opt_liked")
+                    liked_weight = st.slider("偏好专业权重", min_value=1.0, max_value=5.0, value=2.0, step=0.5, key="opt_weight")
+                    disliked = st.multiselect("不考虑的专业", major_options, key="opt_disliked")
+
+                # 录取概率依据：当前规则下已有的模拟结果优先，否则用招生计划中的分数线
+                admission_key = _admission_result_key() if df_vol is not None else None
+                admission = result_cache.get(admission_key) if admission_key else None
+                opt_score_col = plan_score_column(df_plan)
+                if admission is not None:
+                    cutoffs = _get_cutoffs(admission_key, _get_choice_matrix(_cache_buster, df_plan, df_vol), admission.df_result)
+                    cutoff_ranks = _get_cutoff_ranks(("sim", admission_key), plan_index, df_plan, opt_score_col, segments, cutoffs)
+                    source = "模拟录取结果中的录取位次线"
+                elif opt_score_col:
+                    cutoff_ranks = _get_cutoff_ranks(("plan", _cache_buster), plan_index, df_plan, opt_score_col, segments)
+                    source = f"招生计划中的“{opt_score_col}”换算的位次"
+                else:
+                    cutoff_ranks = None
+
+                if cutoff_ranks is None:
+                    st.warning("既没有录取模拟结果，招生计划中也没有分数线列，无法估计录取概率。")
+                else:
+                    weights = {m: liked_weight for m in liked}
+                    weights.update({m: 0.0 for m in disliked})
+                    with metrics.timer("tab3_optimize"):
+                        optimized = optimize_choices(
+                            plan_index,
+                            opt_rank,
+                            cutoff_ranks,
+                            major_utilities(plan_index, major_weights=weights),
+                            k=int(opt_k),
+                        )
+
+                    m_col1, m_col2 = st.columns(2)
+                    m_col1.metric("期望效用", f"{optimized.expected_utility:.3f}")
+                    m_col2.metric("被录取概率", f"{optimized.admit_probability:.1%}")
+                    st.dataframe(
+                        optimized.table,
+                        width='stretch',
+                        hide_index=True,
+                        column_config={
+                            "录取概率": st.column_config.ProgressColumn("录取概率", format="percent", min_value=0, max_value=1),
+                            "在此志愿录取": st.column_config.ProgressColumn("在此志愿录取", format="percent", min_value=0, max_value=1),
+                            "效用": st.column_config.NumberColumn("效用", format="%.2f"),
+                        },
+                    )
+                    st.caption(f"录取概率依据：{source}；参与搜索的专业 {optimized.candidates} 个。")
         else:
             st.warning("缺少招生计划数据文件 (招生计划.csv)，无法进行志愿推荐。")
 
     # --- Tab 4: 录取模拟 ---
-    with tab4:
+    with tab4, metrics.timer("tab4_simulate"):
         st.header("🎓 平行志愿录取模拟")
         st.markdown("根据 **招生计划** 和 **考生志愿填报结果**，模拟平行志愿录取过程，并生成录取结果文件。")
 
         if df_plan is not None and df_vol is not None:
+            # 宽表/长表志愿统一编码为志愿矩阵
+            choices = _get_choice_matrix(_cache_buster, df_plan, df_vol)
+
             col_sim1, col_sim2 = st.columns(2)
             with col_sim1:
                 st.info(f"招生计划总数: {df_plan['招收人数'].sum()} 人")
             with col_sim2:
-                st.info(f"填报志愿人数: {len(df_vol)} 人")
-
-            if st.button("🚀 开始模拟录取", type="primary"):
-                with st.spinner("正在进行模拟录取，请稍候..."):
-                    # 1. 初始化招生计划字典 {(院校, 专业): 剩余名额}
-                    plan_dict = {}
-                    for _, row in df_plan.iterrows():
-                        key = (row['院校名称'], row['专业名称'])
-                        plan_dict[key] = row['招收人数']
-                    
-                    # 2. 准备录取结果列表
-                    admission_results = []
-                    
-                    # 3. 按位次排序 (确保位次小的优先)
-                    # 假设 df_vol 已经有 '位次' 列，如果没有则需要合并
-                    if '位次' not in df_vol.columns:
-                        st.error("志愿填报数据中缺少 '位次' 列，无法进行排序录取。")
-                    else:
-                        df_vol_sorted = df_vol.sort_values(by='位次')
-                        
-                        # 4. 遍历每一位考生
-                        for _, student in df_vol_sorted.iterrows():
-                            admitted = False
-                            admitted_school = None
-                            admitted_major = None
-                            
-                            # 遍历该考生的6个志愿
-                            for i in range(1, 7):
-                                school_col = f'报考院校{i}'
-                                major_col = f'报考专业{i}'
-                                
-                                # 检查列是否存在
-                                if school_col not in student or major_col not in student:
-                                    continue
-                                    
-                                school = student[school_col]
-                                major = student[major_col]
-                                
-                                # 跳过空志愿
-                                if pd.isna(school) or pd.isna(major):
-                                    continue
-                                
-                                key = (school, major)
-                                
-                                # 检查是否有剩余名额
-                                if key in plan_dict and plan_dict[key] > 0:
-                                    # 录取成功
-                                    plan_dict[key] -= 1
-                                    admitted = True
-                                    admitted_school = school
-                                    admitted_major = major
-                                    break # 退出志愿循环，处理下一位考生
-                            
-                            # 记录结果
-                            admission_results.append({
-                                '位次': student['位次'],
-                                '准考证号': student['准考证号'],
-                                '姓名': student['姓名'],
-                                '录取状态': '录取' if admitted else '滑档',
-                                '录取院校': admitted_school if admitted else None,
-                                '录取专业': admitted_major if admitted else None
-                            })
-                        
-                        # 5. 生成结果 DataFrame
-                        df_result = pd.DataFrame(admission_results)
-                        
-                        # 展示结果统计
-                        st.success("模拟录取完成！")
-                        
-                        res_col1, res_col2, res_col3 = st.columns(3)
-                        total_students = len(df_result)
-                        admitted_count = len(df_result[df_result['录取状态'] == '录取'])
-                        failed_count = total_students - admitted_count
-                        
-                        res_col1.metric("总考生数", total_students)
-                        res_col2.metric("成功录取", admitted_count)
-                        res_col3.metric("滑档人数", failed_count)
-                        
-                        # 展示详细数据
-                        st.subheader("录取结果详情")
-                        st.dataframe(df_result)
-                        
-                        # 下载按钮
-                        csv = df_result.to_csv(index=False).encode('utf-8-sig')
-                        st.download_button(
-                            label="📥 下载录取结果文件 (CSV)",
-                            data=csv,
-                            file_name='录取结果文件.csv',
-                            mime='text/csv',
-                        )
+                st.info(f"填报志愿人数: {len(choices.candidates)} 人（每人最多 {choices.matrix.shape[1]} 个志愿）")
+
+            r_col1, r_col2, r_col3 = st.columns([2, 1, 1], vertical_alignment="bottom")
+            r_col1.selectbox(
+                "录取规则",
+                list(MODES),
+                format_func=MODES.get,
+                key="admission_mode",
+                help="多轮规则：投档到院校后所填专业均满时，服从调剂者调剂到该校其他专业，否则退档；退档考生进入下一轮征求志愿。",
+            )
+            rounds_mode = st.session_state.admission_mode == MODE_ROUNDS
+            r_col2.number_input(
+                "录取轮数", min_value=1, max_value=5, value=DEFAULT_ROUNDS, key="admission_rounds", disabled=not rounds_mode,
+            )
+            r_col3.checkbox(
+                "未填写时视为服从调剂", key="admission_adjust", disabled=not rounds_mode,
+                help="志愿数据中有“服从调剂”列时以该列为准，此项只用于空值。",
+            )
+
+            # 同一份计划/志愿数据、同一录取规则的结果直接复用缓存（跨重跑、跨会话）
+            admission_key = _admission_result_key()
+            admission = result_cache.get(admission_key)
+            metrics.record_cache("admission_result", admission is not None)
+
+            if st.button(
+                "🚀 开始模拟录取",
+                type="primary",
+                disabled=bool(job_runner.running(ADMISSION_JOB)),
+            ):
+                if '位次' not in df_vol.columns:
+                    st.error("志愿填报数据中缺少 '位次' 列，无法进行排序录取。")
+                elif admission is None:
+                    # 在后台线程中模拟录取，完成后结果写入缓存
+                    job_runner.submit(
+                        ADMISSION_JOB,
+                        _run_admission,
+                        admission_key,
+                        df_plan,
+                        df_vol,
+                        choices,
+                        _admission_options(),
+                        with_progress=True,
+                    )
+                    st.session_state.admission_error = None
+
+            _render_job_status(ADMISSION_JOB)
+
+            if st.session_state.get("admission_error"):
+                st.error(f"模拟录取失败：{st.session_state.admission_error}")
+
+            if admission is not None:
+                df_result = admission.df_result
+
+                # 展示结果统计
+                st.success("模拟录取完成！")
+
+                rejected = admission.stats.get("rejected", 0)
+                res_cols = st.columns(4 if rounds_mode else 3)
+                res_cols[0].metric("总考生数", admission.stats["total"])
+                res_cols[1].metric("成功录取", admission.stats["admitted"])
+                res_cols[2].metric("滑档人数", admission.stats["failed"] - rejected)
+                if rounds_mode:
+                    res_cols[3].metric("退档人数", rejected)
+
+                # 展示详细数据：结果表留在服务端，只发送当前页
+                st.subheader("录取结果详情")
+                _render_paged_table(
+                    _get_paged_table(
+                        ("admission", admission_key),
+                        df_result,
+                        ("录取状态", "录取院校", "录取专业", "是否调剂"),
+                        "位次",
+                    ),
+                    "tab4_result",
+                )
+
+                # 下载按钮
+                _render_download(df_result, "tab4_result", "下载录取结果文件", "录取结果文件")
         else:
             if df_plan is None:
                 st.error("缺少 '招生计划.csv' 文件。")
             if df_vol is None:
                 st.error("缺少 '志愿填报结果.csv' 文件。")
 
+    # --- Tab 5: 报考热度 ---
+    with tab5, metrics.timer("tab5_pressure"):
+        st.header("🔥 报考热度分析")
+        st.markdown("统计每个专业被多少考生填报、位于第几志愿、来自哪些位次段，并与 **招收人数** 对比。")
+
+        if df_plan is not None and df_vol is not None:
+            report = _get_pressure_report(_cache_buster, _get_choice_matrix(_cache_buster, df_plan, df_vol))
+            summary = report.summary
+
+            p_col1, p_col2, p_col3 = st.columns(3)
+            p_col1.metric("计划专业数", len(summary))
+            p_col2.metric("总填报人次", int(summary['填报人次'].sum()))
+            p_col3.metric("报考热度中位数", f"{summary['报考热度'].median():.1f}")
+
+            top_n = st.number_input(
+                "展示报考热度最高的专业数",
+                min_value=1,
+                max_value=max(len(summary), 1),
+                value=min(30, max(len(summary), 1)),
+            )
+            top = summary['报考热度'].fillna(-1).sort_values(ascending=False).index[:top_n]
+
+            st.dataframe(
+                summary.loc[top],
+                width='stretch',
+                hide_index=True,
+                column_config={
+                    "第一志愿占比": st.column_config.NumberColumn("第一志愿占比", format="percent"),
+                    "报考热度": st.column_config.NumberColumn(
+                        "报考热度", help="填报人次 / 招收人数", format="%.2f"
+                    ),
+                },
+            )
+
+            heat = report.by_band.loc[top]
+            heat.index = summary.loc[top, '院校名称'] + " · " + summary.loc[top, '专业名称']
+            px = _plotly_express()
+            fig_heat = px.imshow(
+                heat,
+                aspect="auto",
+                color_continuous_scale="Blues",
+                labels={"x": "位次段", "y": "专业", "color": "填报人次"},
+                title="专业 × 位次段 填报人次热力图",
+            )
+            fig_heat.update_layout(height=max(400, 18 * len(heat)))
+            st.plotly_chart(fig_heat, width='stretch')
+        else:
+            st.warning("缺少招生计划或志愿数据，无法分析报考热度。")
+
 else:
     st.warning("请确保 data 目录下存在数据文件。")
+
+profile.mark("script_end")
+
+# 运行指标：GAOKAO_METRICS_FILE 指定导出路径（.prom 或 .json），GAOKAO_ADMIN=1 显示管理面板
+metrics.maybe_export(os.environ.get("GAOKAO_METRICS_FILE"))
+if os.environ.get("GAOKAO_ADMIN", "0") == "1":
+    with st.sidebar.expander("🛠️ 运行指标"):
+        st.caption("各阶段耗时（最近 1000 次重跑）")
+        st.dataframe(pd.DataFrame(metrics.timing_summary()), hide_index=True)
+        st.caption("缓存命中率")
+        st.dataframe(pd.DataFrame(metrics.cache_summary()), hide_index=True)
+
+if profile.enabled:
+    profile.dump()
+    with st.sidebar.expander("⏱️ 启动耗时 (ms)"):
+        st.json(profile.as_dict())
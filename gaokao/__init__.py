@@ -0,0 +1 @@
+"""高考数据分析看板的核心逻辑（不依赖 Streamlit，可被脚本与服务复用）。"""
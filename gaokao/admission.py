@@ -0,0 +1,278 @@
+"""平行志愿录取模拟。
+
+两种规则：
+- parallel：专业平行志愿，按位次依次检索志愿，录取到第一个仍有名额的专业（一轮）；
+- rounds：院校投档 + 退档/专业调剂。考生投档到第一个仍有名额的院校，在该校按志愿顺序
+  录取专业；所填专业均满时，服从调剂者调剂到该校剩余名额最多的专业，不服从者退档。
+  退档考生进入下一轮（征求志愿），按位次对剩余名额继续投档，跳过已退档的院校。
+"""
+
+import heapq
+from typing import Callable, Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from gaokao.choices import PAD, ChoiceMatrix, build_choice_matrix, encode_plan
+
+
+# 录取规则或结果格式变化时递增，使已缓存的录取结果失效
+ENGINE_VERSION = "2"
+
+# 每批考生开始前，先用向量化运算剔除已满额或无效的志愿，Python 循环只检查剩余志愿
+CHUNK_SIZE = 4096
+
+# 多轮录取的默认轮数：正式投档 + 一轮征求志愿
+DEFAULT_ROUNDS = 2
+ADJUST_COL = "服从调剂"
+_ADJUST_TRUE = {"是", "服从", "1", "true", "yes", "y"}
+
+MODE_PARALLEL = "parallel"
+MODE_ROUNDS = "rounds"
+MODES = {
+    MODE_PARALLEL: "专业平行志愿（一轮）",
+    MODE_ROUNDS: "院校投档 + 退档/调剂（多轮）",
+}
+
+# 多轮录取中每名考生的结果状态
+SLIDE, ADMITTED, REJECTED = 0, 1, 2
+
+ProgressFn = Callable[[float, str], None]
+
+
+def build_choices(df_plan: pd.DataFrame, df_vol: pd.DataFrame) -> ChoiceMatrix:
+    return build_choice_matrix(df_vol, encode_plan(df_plan))
+
+
+def admit(choices: ChoiceMatrix, progress: Optional[ProgressFn] = None) -> np.ndarray:
+    """按位次从小到大依次检索志愿，录取到第一个仍有剩余名额的专业。
+
+    返回与 choices.candidates 行对齐的专业 id 数组，滑档为 PAD。
+    """
+    ranks = choices.ranks
+    order = np.argsort(ranks, kind="stable")
+    matrix = choices.matrix
+    seats = choices.plan.seats.copy()
+    seats_list = seats.tolist()
+
+    total = len(order)
+    admitted = np.full(total, PAD, dtype=np.int32)
+    if matrix.shape[1] == 0 or len(seats) == 0:
+        return admitted
+
+    for start in range(0, total, CHUNK_SIZE):
+        rows = order[start:start + CHUNK_SIZE]
+        block = matrix[rows]
+
+        # 本批开始时仍有名额的志愿；批内名额变化由下方循环逐个检查
+        seats[:] = seats_list
+        valid = block >= 0
+        valid[valid] = seats[block[valid]] > 0
+        # 把有效志愿稳定地挪到每行前部，保持原志愿顺序
+        idx = np.argsort(~valid, axis=1, kind="stable")
+        compact = np.take_along_axis(np.where(valid, block, PAD), idx, axis=1)
+        width = int(valid.sum(axis=1).max())
+
+        for row, prefs in zip(rows.tolist(), compact[:, :width].tolist()):
+            for pid in prefs:
+                if pid < 0:
+                    break
+                if seats_list[pid] > 0:
+                    seats_list[pid] -= 1
+                    admitted[row] = pid
+                    break
+
+        if progress is not None:
+            done = min(start + CHUNK_SIZE, total)
+            progress(done / total, f"已处理 {done}/{total} 名考生")
+
+    return admitted
+
+
+def adjust_flags(choices: ChoiceMatrix, default: bool = False) -> np.ndarray:
+    """每名考生是否服从调剂；志愿数据无“服从调剂”列或该项为空时取 default。"""
+    n = len(choices.candidates)
+    if ADJUST_COL not in choices.candidates.columns:
+        return np.full(n, default, dtype=bool)
+    raw = choices.candidates[ADJUST_COL]
+    flags = raw.astype(str).str.strip().str.lower().isin(_ADJUST_TRUE).to_numpy()
+    return np.where(raw.isna().to_numpy(), default, flags)
+
+
+def _take_largest(heap: list, seats: List[int]) -> Optional[int]:
+    """从院校的 (-剩余名额, 专业 id) 堆中取剩余名额最多的专业；过期条目在此惰性修正。"""
+    while heap:
+        neg, pid = heap[0]
+        left = seats[pid]
+        if left <= 0:
+            heapq.heappop(heap)
+        elif -neg != left:
+            heapq.heapreplace(heap, (-left, pid))
+        else:
+            return pid
+    return None
+
+
+def admit_rounds(
+    choices: ChoiceMatrix,
+    adjust: Optional[np.ndarray] = None,
+    max_rounds: int = DEFAULT_ROUNDS,
+    progress: Optional[ProgressFn] = None,
+):
+    """院校投档 + 退档/调剂的多轮录取。
+
+    返回 (专业 id, 状态, 是否调剂, 录取轮次) 四个与 choices.candidates 行对齐的数组；
+    未录取者专业 id 为 PAD、轮次为 0，状态为 SLIDE（从未投档）或 REJECTED（被退档）。
+    第二轮起只处理上一轮被退档的考生。
+    """
+    if max_rounds < 1:
+        raise ValueError("录取轮数至少为 1")
+    plan = choices.plan
+    matrix = choices.matrix
+    total = len(matrix)
+    if adjust is None:
+        adjust = np.zeros(total, dtype=bool)
+
+    school_codes, school_names = pd.factorize(plan.schools)
+    n_schools = len(school_names)
+    school_of = school_codes.tolist()
+    seats = plan.seats.tolist()
+    school_left = np.bincount(school_codes, weights=plan.seats, minlength=n_schools).astype(np.int64)
+    left_list = school_left.tolist()
+
+    # 每所院校一个按剩余名额排序的最大堆，只在调剂时使用
+    heaps: List[list] = [[] for _ in range(n_schools)]
+    for pid, sid in enumerate(school_of):
+        if seats[pid] > 0:
+            heaps[sid].append((-seats[pid], pid))
+    for heap in heaps:
+        heapq.heapify(heap)
+
+    admitted = np.full(total, PAD, dtype=np.int32)
+    status = np.full(total, SLIDE, dtype=np.int8)
+    adjusted = np.zeros(total, dtype=bool)
+    round_no = np.zeros(total, dtype=np.int8)
+    excluded: Dict[int, Set[int]] = {}
+    adjust_list = adjust.tolist()
+    school_arr = np.asarray(school_codes, dtype=np.int64)
+
+    queue = np.argsort(choices.ranks, kind="stable")
+    if matrix.shape[1] == 0 or len(seats) == 0:
+        return admitted, status, adjusted, round_no
+
+    for rnd in range(1, max_rounds + 1):
+        rejected = []
+        n_queue = len(queue)
+        for start in range(0, n_queue, CHUNK_SIZE):
+            rows = queue[start:start + CHUNK_SIZE]
+            block = matrix[rows]
+
+            # 本批开始时所属院校仍有名额的志愿
+            school_left[:] = left_list
+            valid = block >= 0
+            valid[valid] = school_left[school_arr[block[valid]]] > 0
+            idx = np.argsort(~valid, axis=1, kind="stable")
+            compact = np.take_along_axis(np.where(valid, block, PAD), idx, axis=1)
+            width = int(valid.sum(axis=1).max())
+
+            for row, prefs in zip(rows.tolist(), compact[:, :width].tolist()):
+                skip = excluded.get(row)
+                for k, pid in enumerate(prefs):
+                    if pid < 0:
+                        break
+                    sid = school_of[pid]
+                    if left_list[sid] <= 0 or (skip is not None and sid in skip):
+                        continue
+
+                    # 投档到 sid：按志愿顺序录取该校仍有名额的专业
+                    placed = None
+                    for q in prefs[k:]:
+                        if q < 0:
+                            break
+                        if school_of[q] == sid and seats[q] > 0:
+                            placed = q
+                            break
+                    if placed is None and adjust_list[row]:
+                        placed = _take_largest(heaps[sid], seats)
+                        adjusted[row] = True
+
+                    if placed is None:
+                        status[row] = REJECTED
+                        excluded.setdefault(row, set()).add(sid)
+                        rejected.append(row)
+                    else:
+                        seats[placed] -= 1
+                        left_list[sid] -= 1
+                        admitted[row] = placed
+                        status[row] = ADMITTED
+                        round_no[row] = rnd
+                    break
+
+            if progress is not None:
+                done = min(start + CHUNK_SIZE, n_queue)
+                progress(done / n_queue, f"第 {rnd} 轮：已处理 {done}/{n_queue} 名考生")
+
+        if not rejected:
+            break
+        # 退档考生按位次重新排队，下一轮只处理他们
+        queue = np.asarray(rejected, dtype=np.int64)
+        queue = queue[np.argsort(choices.ranks[queue], kind="stable")]
+
+    return admitted, status, adjusted, round_no
+
+
+def simulate_admission(
+    df_plan: pd.DataFrame,
+    df_vol: pd.DataFrame,
+    progress: Optional[ProgressFn] = None,
+    choices: Optional[ChoiceMatrix] = None,
+    mode: str = MODE_PARALLEL,
+    adjust_default: bool = False,
+    max_rounds: int = DEFAULT_ROUNDS,
+) -> pd.DataFrame:
+    """模拟平行志愿录取，返回按位次排序的录取结果表。
+
+    choices 为预先构建好的志愿矩阵（见 build_choices），未提供时现场构建。
+    mode 为 MODE_ROUNDS 时按多轮规则录取，结果另含“是否调剂”“录取轮次”两列，
+    录取状态可能为“退档”；adjust_default 为未填写“服从调剂”时的默认值。
+    """
+    if mode not in MODES:
+        raise ValueError(f"未知的录取规则: {mode}")
+    if "位次" not in df_vol.columns:
+        raise ValueError("志愿填报数据中缺少 '位次' 列，无法进行排序录取。")
+
+    if choices is None:
+        choices = build_choices(df_plan, df_vol)
+
+    order = np.argsort(choices.ranks, kind="stable")
+    if mode == MODE_ROUNDS:
+        admitted, status, adjusted, round_no = admit_rounds(
+            choices,
+            adjust=adjust_flags(choices, adjust_default),
+            max_rounds=max_rounds,
+            progress=progress,
+        )
+    else:
+        admitted = admit(choices, progress=progress)
+    picked = admitted[order]
+    ok = picked >= 0
+    safe = np.where(ok, picked, 0)
+
+    plan = choices.plan
+    schools = np.where(ok, plan.schools[safe], None) if len(plan) else np.full(len(order), None)
+    majors = np.where(ok, plan.majors[safe], None) if len(plan) else np.full(len(order), None)
+
+    candidates = choices.candidates.iloc[order].reset_index(drop=True)
+    df_result = pd.DataFrame({
+        "位次": candidates["位次"],
+        "准考证号": candidates["准考证号"],
+        "姓名": candidates["姓名"],
+        "录取状态": np.where(ok, "录取", "滑档"),
+        "录取院校": schools,
+        "录取专业": majors,
+    })
+    if mode == MODE_ROUNDS:
+        df_result.loc[status[order] == REJECTED, "录取状态"] = "退档"
+        df_result["是否调剂"] = np.where(ok & adjusted[order], "是", "否")
+        df_result["录取轮次"] = round_no[order]
+    return df_result
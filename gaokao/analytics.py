@@ -0,0 +1,88 @@
+"""报考热度分析：基于志愿矩阵统计每个专业的填报人次、志愿位置与位次段分布。
+
+所有统计都是对志愿矩阵做 np.bincount 分组计数（不展开宽表），省级规模下也在亚秒级。
+"""
+
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from gaokao.choices import ChoiceMatrix
+
+
+# 位次段：按考生位次百分位划分（前 5%、5%-10% ……）
+DEFAULT_BAND_EDGES = (0.05, 0.10, 0.20, 0.40, 0.60, 0.80, 1.00)
+
+
+def band_labels(edges: Sequence[float]) -> List[str]:
+    labels = []
+    lo = 0.0
+    for hi in edges:
+        labels.append(f"前{hi:.0%}" if lo == 0 else f"{lo:.0%}-{hi:.0%}")
+        lo = hi
+    return labels
+
+
+@dataclass
+class PressureReport:
+    summary: pd.DataFrame  # 每个专业一行：招收人数、填报人次、第一志愿人数/占比、报考热度
+    by_position: np.ndarray  # (专业数, K) 各志愿位置的填报人次
+    by_band: pd.DataFrame  # (专业数, 位次段) 填报人次，行与 summary 对齐
+
+
+def _rank_bands(ranks: np.ndarray, edges: Sequence[float]) -> np.ndarray:
+    n = len(ranks)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    # 位次为空的考生排在最后
+    filled = np.where(np.isnan(ranks), np.inf, ranks)
+    order = np.argsort(filled, kind="stable")
+    pct = np.empty(n, dtype=float)
+    pct[order] = (np.arange(n) + 1) / n
+    return np.searchsorted(np.asarray(edges), pct, side="left").clip(max=len(edges) - 1)
+
+
+def application_pressure(
+    choices: ChoiceMatrix,
+    band_edges: Sequence[float] = DEFAULT_BAND_EDGES,
+) -> PressureReport:
+    plan = choices.plan
+    matrix = choices.matrix
+    n_pairs = len(plan)
+    n, k = matrix.shape
+    n_bands = len(band_edges)
+
+    # 无效志愿（空/不在计划中）计入末尾的哨兵桶后丢弃，避免先做一次 nonzero 压缩
+    flat = matrix.ravel().astype(np.int64)
+    invalid = flat < 0
+    cols = np.tile(np.arange(k, dtype=np.int64), n)
+    bands = np.repeat(_rank_bands(choices.ranks, band_edges), k)
+
+    pos_key = flat * k + cols
+    pos_key[invalid] = n_pairs * k
+    by_position = np.bincount(pos_key, minlength=n_pairs * k + 1)[:-1].reshape(n_pairs, k)
+
+    band_key = flat * n_bands + bands
+    band_key[invalid] = n_pairs * n_bands
+    by_band = np.bincount(band_key, minlength=n_pairs * n_bands + 1)[:-1].reshape(n_pairs, n_bands)
+
+    listings = by_position.sum(axis=1)
+    first = by_position[:, 0] if k else np.zeros(n_pairs, dtype=np.int64)
+    seats = plan.seats.astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(seats > 0, listings / seats, np.nan)
+        first_share = np.where(listings > 0, first / listings, 0.0)
+
+    summary = pd.DataFrame({
+        "院校名称": plan.schools,
+        "专业名称": plan.majors,
+        "招收人数": plan.seats,
+        "填报人次": listings,
+        "第一志愿人数": first,
+        "第一志愿占比": first_share,
+        "报考热度": ratio,
+    })
+    by_band_df = pd.DataFrame(by_band, columns=band_labels(band_edges))
+    return PressureReport(summary=summary, by_position=by_position, by_band=by_band_df)
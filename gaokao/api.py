@@ -0,0 +1,168 @@
+"""本地 HTTP/JSON 查询服务：启动时一次性加载数据与索引，各请求线程共享只读数据。
+
+接口：
+    GET /student/{准考证号}            个人成绩与位次
+    GET /rank?score=650                分数→位次
+    GET /recommend?score=600[&below=40&above=10&limit=50]
+    GET /admit[?id=KS00001]            模拟录取统计 / 单个考生录取结果
+    GET /health
+
+用法：python -m gaokao.api --port 8600 [--data-dir data] [--dataset 2025/一模]
+"""
+
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+from gaokao.admission import simulate_admission
+from gaokao.data import default_data_dir, load_datasets
+from gaokao.datasets import load_manifest
+from gaokao.query import RECOMMEND_ABOVE, RECOMMEND_BELOW, ScoreIndex, to_python
+
+
+DEFAULT_PORT = 8600
+DEFAULT_LIMIT = 100
+
+Response = Tuple[int, Any]
+
+
+def _records(df: pd.DataFrame) -> list:
+    cols = [c for c in df.columns if not str(c).startswith("Unnamed")]
+    return [
+        {c: to_python(v) for c, v in zip(cols, row)}
+        for row in df[cols].itertuples(index=False, name=None)
+    ]
+
+
+class QueryService:
+    """与传输层无关的查询入口，handle() 返回 (HTTP 状态码, 可 JSON 序列化的结果)。"""
+
+    def __init__(self, base_path: str) -> None:
+        df_score, _, df_plan, df_vol = load_datasets(base_path)
+        self.index = ScoreIndex(df_score, df_plan)
+        # 响应用到的记录预先转成 dict，请求时只做切片
+        sorted_plan = self.index.sorted_plan
+        self._plan_records = _records(sorted_plan) if sorted_plan is not None else []
+
+        self._admission: Dict[str, Dict[str, Any]] = {}
+        self.admission_stats: Dict[str, int] = {}
+        if df_plan is not None and df_vol is not None and "位次" in df_vol.columns:
+            df_result = simulate_admission(df_plan, df_vol)
+            self._admission = {str(r["准考证号"]): r for r in _records(df_result)}
+            admitted = int((df_result["录取状态"] == "录取").sum())
+            self.admission_stats = {
+                "total": len(df_result),
+                "admitted": admitted,
+                "failed": len(df_result) - admitted,
+            }
+
+    def handle(self, path: str, params: Dict[str, str]) -> Response:
+        parts = [unquote(p) for p in path.strip("/").split("/") if p]
+        if not parts:
+            return 404, {"error": "未知接口"}
+
+        route = parts[0]
+        try:
+            if route == "student" and len(parts) == 2:
+                return self._student(parts[1])
+            if route == "rank":
+                return self._rank(params)
+            if route == "recommend":
+                return self._recommend(params)
+            if route == "admit":
+                return self._admit(params)
+            if route == "health":
+                return 200, {"status": "ok", "students": self.index.total}
+        except (KeyError, ValueError) as e:
+            return 400, {"error": str(e)}
+        return 404, {"error": "未知接口"}
+
+    def _student(self, exam_id: str) -> Response:
+        record = self.index.student(exam_id)
+        if record is None:
+            return 404, {"error": f"未找到考生: {exam_id}"}
+        return 200, record
+
+    def _rank(self, params: Dict[str, str]) -> Response:
+        score = float(params["score"])
+        return 200, {"score": score, "rank": self.index.rank_for_score(score), "total": self.index.total}
+
+    def _recommend(self, params: Dict[str, str]) -> Response:
+        score = float(params["score"])
+        below = float(params.get("below", RECOMMEND_BELOW))
+        above = float(params.get("above", RECOMMEND_ABOVE))
+        limit = int(params.get("limit", DEFAULT_LIMIT))
+        lo, hi = self.index.recommend_range(score, below=below, above=above)
+        # 按分数线从高到低返回
+        items = self._plan_records[max(hi - limit, lo):hi][::-1]
+        return 200, {"score": score, "count": hi - lo, "items": items}
+
+    def _admit(self, params: Dict[str, str]) -> Response:
+        if not self.admission_stats:
+            return 404, {"error": "缺少招生计划或志愿数据，无法模拟录取"}
+        exam_id = params.get("id")
+        if exam_id is None:
+            return 200, self.admission_stats
+        record = self._admission.get(exam_id)
+        if record is None:
+            return 404, {"error": f"未找到考生: {exam_id}"}
+        return 200, record
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 保持连接，压测时避免每个请求重新建连
+    protocol_version = "HTTP/1.1"
+    # 响应头与正文分多次写出；关闭 Nagle 算法，避免保持连接时每个请求都等客户端的延迟确认（约 40ms）
+    disable_nagle_algorithm = True
+    server: "QueryServer"
+
+    def do_GET(self) -> None:  # noqa: N802
+        url = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        status, payload = self.server.service.handle(url.path, params)
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # 高并发下逐条打印访问日志本身就是瓶颈
+        pass
+
+
+class QueryServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: QueryService) -> None:
+        super().__init__(address, _Handler)
+        self.service = service
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="高考数据查询 HTTP 服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--data-dir", default=default_data_dir(), help="数据根目录")
+    parser.add_argument("--dataset", help="数据集（分区）键，如 2025/一模；默认取清单中的默认数据集")
+    args = parser.parse_args()
+
+    manifest = load_manifest(args.data_dir)
+    service = QueryService(manifest.path_of(manifest.get(args.dataset)))
+    server = QueryServer((args.host, args.port), service)
+    print(f"服务已启动: http://{args.host}:{args.port}（考生 {service.index.total} 人）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""志愿编码：把 (院校, 专业) 编码为整数 id，考生志愿存为稠密 int32 矩阵。
+
+矩阵形状为 (考生数, K)，第 k 列是第 k+1 个志愿的专业 id；空志愿为 PAD(-1)，
+填报了但不在招生计划中的专业为 UNKNOWN(-2)。同时支持两种 CSV 布局：
+
+- 宽表：每名考生一行，报考院校1/报考专业1 … 报考院校K/报考专业K；
+- 长表：每个志愿一行，含 准考证号、报考院校、报考专业，可选 志愿序号（从 1 开始）。
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# 浙江普通类平行志愿最多可填 80 个专业志愿
+MAX_CHOICES = 80
+PAD = -1
+UNKNOWN = -2
+
+CANDIDATE_COLS = ["位次", "准考证号", "姓名", "服从调剂"]
+_WIDE_SCHOOL_RE = re.compile(r"^报考院校(\d+)$")
+
+
+@dataclass
+class PlanIndex:
+    """招生计划中的专业编码：第 i 个专业的 id 即 i。"""
+
+    schools: np.ndarray
+    majors: np.ndarray
+    seats: np.ndarray
+    index: pd.MultiIndex
+
+    def __len__(self) -> int:
+        return len(self.seats)
+
+    def encode(self, schools: pd.Series, majors: pd.Series) -> np.ndarray:
+        """把两列 (院校, 专业) 编码为 id；任一为空记 PAD，不在计划中记 UNKNOWN。"""
+        codes = self.index.get_indexer(pd.MultiIndex.from_arrays([schools, majors]))
+        codes = np.where(codes < 0, UNKNOWN, codes)
+        empty = schools.isna().to_numpy() | majors.isna().to_numpy()
+        return np.where(empty, PAD, codes).astype(np.int32)
+
+    def pair(self, pair_id: int) -> Tuple[str, str]:
+        return self.schools[pair_id], self.majors[pair_id]
+
+
+def encode_plan(df_plan: pd.DataFrame) -> PlanIndex:
+    # 同一 (院校, 专业) 重复出现时以最后一行的招收人数为准
+    plan = df_plan.drop_duplicates(subset=["院校名称", "专业名称"], keep="last")
+    schools = plan["院校名称"].to_numpy()
+    majors = plan["专业名称"].to_numpy()
+    seats = pd.to_numeric(plan["招收人数"], errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+    return PlanIndex(
+        schools=schools,
+        majors=majors,
+        seats=seats,
+        index=pd.MultiIndex.from_arrays([schools, majors]),
+    )
+
+
+@dataclass
+class ChoiceMatrix:
+    plan: PlanIndex
+    candidates: pd.DataFrame  # 位次 / 准考证号 / 姓名（/ 服从调剂），行与 matrix 对齐
+    matrix: np.ndarray  # int32, (考生数, K)
+
+    def __post_init__(self) -> None:
+        self._id_pos: Dict[str, int] = {
+            str(k): i for i, k in enumerate(self.candidates["准考证号"].astype(str))
+        }
+
+    @property
+    def ranks(self) -> np.ndarray:
+        return pd.to_numeric(self.candidates["位次"], errors="coerce").to_numpy(dtype=float)
+
+    def row_of(self, exam_id: str) -> Optional[int]:
+        """准考证号对应的矩阵行号，不存在时为 None。"""
+        return self._id_pos.get(str(exam_id))
+
+
+def _wide_choice_numbers(df_vol: pd.DataFrame) -> list:
+    numbers = []
+    for col in df_vol.columns:
+        m = _WIDE_SCHOOL_RE.match(str(col))
+        if m and f"报考专业{m.group(1)}" in df_vol.columns:
+            numbers.append(int(m.group(1)))
+    return sorted(numbers)
+
+
+def is_long_layout(df_vol: pd.DataFrame) -> bool:
+    return "报考院校" in df_vol.columns and "报考专业" in df_vol.columns
+
+
+def _build_wide(df_vol: pd.DataFrame, plan: PlanIndex, max_choices: int) -> ChoiceMatrix:
+    numbers = [i for i in _wide_choice_numbers(df_vol) if i <= max_choices]
+    k = max(numbers) if numbers else 0
+    matrix = np.full((len(df_vol), k), PAD, dtype=np.int32)
+    for i in numbers:
+        matrix[:, i - 1] = plan.encode(df_vol[f"报考院校{i}"], df_vol[f"报考专业{i}"])
+    candidates = df_vol[[c for c in CANDIDATE_COLS if c in df_vol.columns]].reset_index(drop=True)
+    return ChoiceMatrix(plan=plan, candidates=candidates, matrix=matrix)
+
+
+def _build_long(df_vol: pd.DataFrame, plan: PlanIndex, max_choices: int) -> ChoiceMatrix:
+    ids = df_vol["准考证号"].astype(str)
+    codes, uniques = pd.factorize(ids, sort=False)
+
+    if "志愿序号" in df_vol.columns:
+        pos = pd.to_numeric(df_vol["志愿序号"], errors="coerce").fillna(0).to_numpy(dtype=np.int64) - 1
+    else:
+        # 无序号时按文件中的先后顺序
+        pos = df_vol.groupby(codes, sort=False).cumcount().to_numpy(dtype=np.int64)
+
+    keep = (pos >= 0) & (pos < max_choices)
+    k = int(pos[keep].max()) + 1 if keep.any() else 0
+    matrix = np.full((len(uniques), k), PAD, dtype=np.int32)
+    matrix[codes[keep], pos[keep]] = plan.encode(df_vol["报考院校"], df_vol["报考专业"])[keep]
+
+    first = ~ids.duplicated().to_numpy()
+    candidates = df_vol.loc[first, [c for c in CANDIDATE_COLS if c in df_vol.columns]].reset_index(drop=True)
+    return ChoiceMatrix(plan=plan, candidates=candidates, matrix=matrix)
+
+
+def build_choice_matrix(
+    df_vol: pd.DataFrame,
+    plan: PlanIndex,
+    max_choices: int = MAX_CHOICES,
+) -> ChoiceMatrix:
+    """按宽表或长表布局构建志愿矩阵。"""
+    if is_long_layout(df_vol):
+        return _build_long(df_vol, plan, max_choices)
+    return _build_wide(df_vol, plan, max_choices)
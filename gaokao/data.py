@@ -0,0 +1,102 @@
+"""数据文件加载与总成绩计算。"""
+
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+CORE_150_COLS = ["语文", "数学", "英语"]
+ELECTIVE_FUFEN_COLS = [
+    "历史赋分",
+    "地理赋分",
+    "政治赋分",
+    "物理赋分",
+    "化学赋分",
+    "生物赋分",
+    "技术赋分",
+]
+ELECTIVE_SUBJECTS = ["历史", "地理", "政治", "物理", "化学", "生物", "技术"]
+
+# 成绩文件（优先使用带三科的文件，如果存在）
+SCORE_FILES = [
+    "赋分后的高考模拟数据_with_sciences.csv",
+    "赋分后的高考模拟数据.csv",
+]
+RANK_FILE = "高考考生位次.csv"
+PLAN_FILE = "招生计划.csv"
+VOL_FILE = "志愿填报结果.csv"
+DATA_FILES = [*SCORE_FILES, RANK_FILE, PLAN_FILE, VOL_FILE]
+
+Datasets = Tuple[pd.DataFrame, Optional[pd.DataFrame], Optional[pd.DataFrame], Optional[pd.DataFrame]]
+
+
+def default_data_dir() -> str:
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def data_mtime(base_path: str) -> float:
+    """数据目录下各 CSV 的最大修改时间，用作缓存失效标记。"""
+    mtimes = []
+    for fn in DATA_FILES:
+        path = os.path.join(base_path, fn)
+        if os.path.exists(path):
+            try:
+                mtimes.append(os.path.getmtime(path))
+            except OSError:
+                pass
+    return float(max(mtimes)) if mtimes else 0.0
+
+
+def find_score_file(base_path: str) -> Optional[str]:
+    for fn in SCORE_FILES:
+        path = os.path.join(base_path, fn)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def compute_total_score(df_score: pd.DataFrame) -> pd.Series:
+    """总成绩（浙江3+3）：语数英原始分(150) + 选考等级分(100)中的最高三门。"""
+    for c in CORE_150_COLS:
+        if c not in df_score.columns:
+            raise ValueError(f"未找到成绩列: {c}")
+
+    main = df_score[CORE_150_COLS].apply(pd.to_numeric, errors="coerce")
+    elective_cols = [c for c in ELECTIVE_FUFEN_COLS if c in df_score.columns]
+
+    if elective_cols:
+        elective = df_score[elective_cols].apply(pd.to_numeric, errors="coerce")
+        vals = elective.to_numpy(dtype=float)
+        vals = np.where(np.isnan(vals), -np.inf, vals)
+        top3 = np.sort(vals, axis=1)[:, -3:]
+        top3_sum = np.where(np.isneginf(top3), 0.0, top3).sum(axis=1)
+    else:
+        top3_sum = 0.0
+
+    return main.sum(axis=1) + top3_sum
+
+
+def _read_optional(base_path: str, fn: str) -> Optional[pd.DataFrame]:
+    path = os.path.join(base_path, fn)
+    if os.path.exists(path):
+        return pd.read_csv(path)
+    return None
+
+
+def load_datasets(base_path: str) -> Datasets:
+    """读取成绩、位次、招生计划、志愿四类数据；成绩文件缺失时抛出 FileNotFoundError。"""
+    score_file = find_score_file(base_path)
+    if score_file is None:
+        raise FileNotFoundError(f"未找到成绩文件（尝试过: {SCORE_FILES}）")
+
+    df_score = pd.read_csv(score_file)
+    df_score["总成绩"] = compute_total_score(df_score)
+
+    df_rank = _read_optional(base_path, RANK_FILE)
+    df_plan = _read_optional(base_path, PLAN_FILE)
+    # 志愿填报结果 (用于录取模拟)
+    df_vol = _read_optional(base_path, VOL_FILE)
+    return df_score, df_rank, df_plan, df_vol
+
@@ -0,0 +1,231 @@
+"""按年份/考试轮次分区的数据集目录与清单。
+
+目录布局（每个分区内的文件与原 data/ 目录相同）：
+
+    data/
+        manifest.json
+        2025/一模/赋分后的高考模拟数据.csv, 高考考生位次.csv, 招生计划.csv, 志愿填报结果.csv
+        2025/二模/...
+        2024/...                 （只有年份一级也可以）
+
+manifest.json 记录各分区的键、年份、轮次、相对路径与显示名称，以及默认分区。
+没有清单时按目录扫描；data/ 根目录下直接放着成绩文件时视为一个分区（键为 "."），
+与原单数据集布局兼容。看板只读取所选分区的文件。
+
+用法：
+    python -m gaokao.datasets list
+    python -m gaokao.datasets scan                  # 按目录扫描生成/更新清单
+    python -m gaokao.datasets add --year 2025 --round 一模 --from 导出目录 [--default]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+from gaokao.data import DATA_FILES, default_data_dir, find_score_file
+
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+# data/ 根目录本身作为分区时的键
+ROOT_KEY = "."
+
+
+@dataclass(frozen=True)
+class Partition:
+    key: str
+    path: str  # 相对数据根目录
+    year: Optional[int] = None
+    round: Optional[str] = None
+    label: str = ""
+
+    @property
+    def title(self) -> str:
+        return self.label or ("默认数据" if self.key == ROOT_KEY else self.key)
+
+
+@dataclass
+class Manifest:
+    root: str
+    partitions: List[Partition] = field(default_factory=list)
+    default: Optional[str] = None
+    missing: List[str] = field(default_factory=list)  # 清单中有、但目录下找不到成绩文件的分区
+
+    @property
+    def keys(self) -> List[str]:
+        return [p.key for p in self.partitions]
+
+    def get(self, key: Optional[str]) -> Partition:
+        """按键取分区；键为空时取默认分区（未指定默认时取第一个）。"""
+        if not self.partitions:
+            raise FileNotFoundError(f"数据目录中没有可用的数据集: {self.root}")
+        key = key or self.default
+        for p in self.partitions:
+            if p.key == key:
+                return p
+        if key is None or key == self.default:
+            return self.partitions[0]
+        raise ValueError(f"未知的数据集: {key}（可选: {', '.join(self.keys)}）")
+
+    def path_of(self, partition: Partition) -> str:
+        return os.path.normpath(os.path.join(self.root, partition.path))
+
+
+def partition_key(year: int, round_name: Optional[str] = None) -> str:
+    return f"{year}/{round_name}" if round_name else str(year)
+
+
+def _partition_at(root: str, rel: str) -> Optional[Partition]:
+    if find_score_file(os.path.join(root, rel)) is None:
+        return None
+    if rel == ROOT_KEY:
+        return Partition(key=ROOT_KEY, path=ROOT_KEY)
+    parts = rel.replace(os.sep, "/").split("/")
+    year = int(parts[0]) if parts[0].isdigit() else None
+    round_name = parts[1] if len(parts) > 1 else None
+    return Partition(key="/".join(parts), path="/".join(parts), year=year, round=round_name)
+
+
+def scan_partitions(root: str) -> List[Partition]:
+    """扫描 root 及其下一、二级子目录中含成绩文件的目录；新年份在前，同年按轮次名排序。"""
+    found = []
+    if not os.path.isdir(root):
+        return found
+    root_partition = _partition_at(root, ROOT_KEY)
+    for first in sorted(os.listdir(root)):
+        if not os.path.isdir(os.path.join(root, first)):
+            continue
+        p = _partition_at(root, first)
+        if p is not None:
+            found.append(p)
+        for second in sorted(os.listdir(os.path.join(root, first))):
+            if os.path.isdir(os.path.join(root, first, second)):
+                p = _partition_at(root, f"{first}/{second}")
+                if p is not None:
+                    found.append(p)
+    found.sort(key=lambda p: (-(p.year or 0), p.key))
+    return ([root_partition] if root_partition else []) + found
+
+
+def load_manifest(root: Optional[str] = None) -> Manifest:
+    """读取数据根目录下的清单；没有清单时按目录扫描。清单格式错误时抛出 ValueError。"""
+    root = os.path.abspath(root or default_data_dir())
+    path = os.path.join(root, MANIFEST_FILE)
+    if not os.path.exists(path):
+        partitions = scan_partitions(root)
+        return Manifest(root=root, partitions=partitions, default=partitions[0].key if partitions else None)
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+        entries = [Partition(**entry) for entry in raw.get("partitions", [])]
+    except (json.JSONDecodeError, TypeError, AttributeError) as e:
+        raise ValueError(f"数据集清单格式错误: {path}（{e}）") from e
+
+    manifest = Manifest(root=root, default=raw.get("default"))
+    for p in entries:
+        if find_score_file(manifest.path_of(p)) is None:
+            manifest.missing.append(p.key)
+        else:
+            manifest.partitions.append(p)
+    return manifest
+
+
+def write_manifest(manifest: Manifest) -> str:
+    """写出清单（先写临时文件再替换），返回清单路径。"""
+    os.makedirs(manifest.root, exist_ok=True)
+    path = os.path.join(manifest.root, MANIFEST_FILE)
+    payload = {
+        "version": MANIFEST_VERSION,
+        "default": manifest.default,
+        "partitions": [asdict(p) for p in manifest.partitions],
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=manifest.root, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return path
+
+
+def add_partition(
+    root: str,
+    year: int,
+    round_name: Optional[str],
+    source: str,
+    label: str = "",
+    make_default: bool = False,
+) -> Partition:
+    """把 source 目录中的数据文件复制为新分区并登记到清单；同键分区的文件会被覆盖。"""
+    if find_score_file(source) is None:
+        raise FileNotFoundError(f"源目录中未找到成绩文件: {source}")
+    key = partition_key(year, round_name)
+    partition = Partition(key=key, path=key, year=year, round=round_name, label=label)
+
+    manifest = load_manifest(root)
+    target = manifest.path_of(partition)
+    os.makedirs(target, exist_ok=True)
+    for fn in DATA_FILES:
+        src = os.path.join(source, fn)
+        if os.path.exists(src):
+            shutil.copy2(src, os.path.join(target, fn))
+
+    manifest.partitions = [p for p in manifest.partitions if p.key != key] + [partition]
+    if make_default or manifest.default is None:
+        manifest.default = key
+    write_manifest(manifest)
+    return partition
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="分区数据集清单管理")
+    parser.add_argument("--data-dir", default=default_data_dir(), help="数据根目录")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="列出数据集")
+    scan = sub.add_parser("scan", help="按目录扫描并写出清单（保留已有的显示名称与默认分区）")
+    scan.add_argument("--default", help="默认数据集的键")
+    add = sub.add_parser("add", help="从目录导入一个分区")
+    add.add_argument("--year", type=int, required=True)
+    add.add_argument("--round", dest="round_name", help="考试轮次，如 一模")
+    add.add_argument("--from", dest="source", required=True, help="包含成绩/位次/计划/志愿文件的目录")
+    add.add_argument("--label", default="", help="显示名称")
+    add.add_argument("--default", action="store_true", help="设为默认数据集")
+    args = parser.parse_args()
+
+    if args.command == "add":
+        p = add_partition(args.data_dir, args.year, args.round_name, args.source, args.label, args.default)
+        print(f"已导入数据集 {p.key}: {os.path.join(args.data_dir, p.path)}")
+        return
+
+    manifest = load_manifest(args.data_dir)
+    if args.command == "scan":
+        labels = {p.key: p.label for p in manifest.partitions}
+        scanned = [
+            Partition(p.key, p.path, p.year, p.round, labels.get(p.key, ""))
+            for p in scan_partitions(manifest.root)
+        ]
+        default = args.default or manifest.default
+        manifest = Manifest(
+            root=manifest.root,
+            partitions=scanned,
+            default=default if default in {p.key for p in scanned} else (scanned[0].key if scanned else None),
+        )
+        print(f"已写出清单: {write_manifest(manifest)}")
+
+    for p in manifest.partitions:
+        mark = "*" if p.key == manifest.default else " "
+        print(f"{mark} {p.key:<16} {p.title:<16} {manifest.path_of(p)}")
+    for key in manifest.missing:
+        print(f"! {key:<16} 目录中未找到成绩文件")
+
+
+if __name__ == "__main__":
+    main()
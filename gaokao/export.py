@@ -0,0 +1,166 @@
+"""结果导出：分块写出 CSV / zstd 压缩 CSV / Parquet，内存占用与总行数无关。
+
+- csv：UTF-8 BOM（Excel 可直接打开），与原下载格式一致；
+- csv.zst：同样的 CSV 经 zstd 流式压缩，需要 zstandard；
+- parquet：按块写入行组，zstd 压缩，需要 pyarrow。
+"""
+
+import argparse
+import io
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+try:
+    import zstandard
+
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+
+# 每块行数：一块 CSV 文本约几 MB
+EXPORT_CHUNK_ROWS = 50_000
+UTF8_BOM = b"\xef\xbb\xbf"
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    name: str
+    label: str
+    suffix: str
+    mime: str
+
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    "csv": ExportFormat("csv", "CSV", ".csv", "text/csv"),
+    "csv.zst": ExportFormat("csv.zst", "CSV（zstd 压缩）", ".csv.zst", "application/zstd"),
+    "parquet": ExportFormat("parquet", "Parquet", ".parquet", "application/vnd.apache.parquet"),
+}
+
+
+def available_formats() -> List[ExportFormat]:
+    """当前环境可用的导出格式（缺少可选依赖的格式不列出）。"""
+    formats = [EXPORT_FORMATS["csv"]]
+    if HAS_ZSTD:
+        formats.append(EXPORT_FORMATS["csv.zst"])
+    if HAS_PARQUET:
+        formats.append(EXPORT_FORMATS["parquet"])
+    return formats
+
+
+def format_for_path(path: str) -> str:
+    """按文件后缀推断导出格式，无法识别时按 CSV 处理。"""
+    for fmt in sorted(EXPORT_FORMATS.values(), key=lambda f: -len(f.suffix)):
+        if str(path).endswith(fmt.suffix):
+            return fmt.name
+    return "csv"
+
+
+def iter_csv_chunks(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """逐块生成 UTF-8 BOM CSV 字节；拼接结果与 df.to_csv(index=False) 一致。"""
+    yield UTF8_BOM
+    if len(df) == 0:
+        yield df.to_csv(index=False).encode("utf-8")
+        return
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield chunk.to_csv(index=False, header=start == 0).encode("utf-8")
+
+
+def _check_available(fmt: str) -> None:
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"未知的导出格式: {fmt}")
+    if fmt == "csv.zst" and not HAS_ZSTD:
+        raise ValueError("导出 zstd 压缩 CSV 需要安装 zstandard")
+    if fmt == "parquet" and not HAS_PARQUET:
+        raise ValueError("导出 Parquet 需要安装 pyarrow")
+
+
+def write_export(
+    df: pd.DataFrame,
+    out: BinaryIO,
+    fmt: str = "csv",
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> None:
+    """把 df 按 fmt 分块写入二进制文件对象 out。"""
+    _check_available(fmt)
+
+    if fmt == "parquet":
+        # 按整表推断一次 schema：逐块推断时，某块全为空值的列会被推断为 null 类型，与文件 schema 不符
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        with pq.ParquetWriter(out, schema, compression="zstd") as writer:
+            for start in range(0, max(len(df), 1), chunk_rows):
+                chunk = df.iloc[start:start + chunk_rows]
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        return
+
+    if fmt == "csv.zst":
+        with zstandard.ZstdCompressor(level=10).stream_writer(out, closefd=False) as zout:
+            for block in iter_csv_chunks(df, chunk_rows):
+                zout.write(block)
+        return
+
+    for block in iter_csv_chunks(df, chunk_rows):
+        out.write(block)
+
+
+def export_file(
+    df: pd.DataFrame,
+    path: str,
+    fmt: Optional[str] = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> None:
+    """导出到 path；先写临时文件再原子替换。fmt 为空时按后缀推断。"""
+    fmt = fmt or format_for_path(path)
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write_export(df, f, fmt, chunk_rows)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def export_bytes(
+    df: pd.DataFrame,
+    fmt: str = "csv",
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> bytes:
+    """导出为字节串，供下载按钮在点击时按需生成（下载按钮本身需要完整的字节）。"""
+    with io.BytesIO() as buf:
+        write_export(df, buf, fmt, chunk_rows)
+        return buf.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="把 CSV / Parquet 结果表转换为其他导出格式")
+    parser.add_argument("input", help="输入文件（.csv 或 .parquet）")
+    parser.add_argument("output", help="输出文件，按后缀选择格式：.csv / .csv.zst / .parquet")
+    parser.add_argument("--chunk-rows", type=int, default=EXPORT_CHUNK_ROWS, help="每块行数")
+    args = parser.parse_args()
+
+    if args.input.endswith(".parquet"):
+        df = pd.read_parquet(args.input)
+    else:
+        df = pd.read_csv(args.input)
+    export_file(df, args.output, chunk_rows=args.chunk_rows)
+    print(f"已导出 {len(df)} 行: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""浙江选考“5等20级”等级赋分。
+
+同一科目的考生按原始分从高到低排名（同分按出现先后），按累计人数比例分为 20 级，
+每级内把原始分线性映射到该级的赋分区间并四舍五入。排好名次后各级只是名次序列上的
+连续区间，因此整科可以一次向量化算出；追加考生时也可据此判断等级边界是否移动。
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from gaokao.data import ELECTIVE_SUBJECTS
+
+
+# (原始分列, 赋分列)
+SUBJECT_COLS = [(f"{s}原始", f"{s}赋分") for s in ELECTIVE_SUBJECTS]
+
+# 20 级人数比例上限（累计比例）
+LEVEL_CUM_RATIOS = [
+    0.03,
+    0.06,
+    0.10,
+    0.15,
+    0.21,
+    0.28,
+    0.36,
+    0.43,
+    0.50,
+    0.57,
+    0.64,
+    0.71,
+    0.78,
+    0.84,
+    0.89,
+    0.93,
+    0.96,
+    0.98,
+    0.99,
+    1.00,
+]
+
+# 20 级等级赋分区间（低分, 高分），起点 40
+LEVEL_SCORE_RANGES = [
+    (97, 100),
+    (94, 96),
+    (91, 93),
+    (88, 90),
+    (85, 87),
+    (82, 84),
+    (79, 81),
+    (76, 78),
+    (73, 75),
+    (70, 72),
+    (67, 69),
+    (64, 66),
+    (61, 63),
+    (58, 60),
+    (55, 57),
+    (52, 54),
+    (49, 51),
+    (46, 48),
+    (43, 45),
+    (40, 42),
+]
+
+N_LEVELS = len(LEVEL_CUM_RATIOS)
+_CUTOFFS = np.array(LEVEL_CUM_RATIOS, dtype=float)
+_T_LOW = np.array([lo for lo, _ in LEVEL_SCORE_RANGES], dtype=float)
+_T_HIGH = np.array([hi for _, hi in LEVEL_SCORE_RANGES], dtype=float)
+
+
+def level_bounds(n: int) -> np.ndarray:
+    """n 名考生时各等级在名次序列中的起点，长度 21：第 L 级为 [b[L-1], b[L])。"""
+    # 名次 i（从 0 起）的等级 = 1 + 累计比例中不超过 i/n 的个数，
+    # 故第 j+1 个边界是满足 i/n >= 累计比例[j] 的最小 i；先估算再按同样的浮点比较校正
+    if n == 0:
+        return np.zeros(N_LEVELS + 1, dtype=np.int64)
+    i = np.ceil(_CUTOFFS * n).astype(np.int64)
+    i -= (i > 0) & ((i - 1) / n >= _CUTOFFS)
+    i += i / n < _CUTOFFS
+    return np.r_[0, np.minimum(i, n)]
+
+
+def level_extremes(raw_desc: np.ndarray, bounds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """各等级内的最高/最低原始分；空等级为 NaN。"""
+    starts, ends = bounds[:-1], bounds[1:]
+    filled = ends > starts
+    top = np.full(N_LEVELS, np.nan)
+    bottom = np.full(N_LEVELS, np.nan)
+    top[filled] = raw_desc[starts[filled]]
+    bottom[filled] = raw_desc[ends[filled] - 1]
+    return top, bottom
+
+
+def grade_values(raw: np.ndarray, levels: np.ndarray, top: np.ndarray, bottom: np.ndarray) -> np.ndarray:
+    """按等级（1..20）及该级最高/最低原始分计算赋分。"""
+    idx = levels - 1
+    t_low, t_high = _T_LOW[idx], _T_HIGH[idx]
+    s1, s2 = bottom[idx], top[idx]
+    same = s2 == s1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(same, (t_low + t_high) / 2.0, t_low + (raw - s1) * (t_high - t_low) / (s2 - s1))
+    # 分数均为非负，按“四舍五入”实现：0.5 进 1
+    return np.clip(np.floor(t + 0.5).astype(int), 40, 100)
+
+
+def grade_sorted(raw_desc: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """对已按名次排好（原始分降序）的整科原始分赋分，返回 (等级, 赋分)。"""
+    n = len(raw_desc)
+    bounds = level_bounds(n)
+    levels = np.repeat(np.arange(1, N_LEVELS + 1), np.diff(bounds))
+    top, bottom = level_extremes(raw_desc, bounds)
+    return levels, grade_values(raw_desc, levels, top, bottom)
+
+
+def rank_order(raw: np.ndarray) -> np.ndarray:
+    """有成绩的考生按原始分从高到低的行号，同分按出现先后。"""
+    valid = np.flatnonzero(~np.isnan(raw))
+    return valid[np.argsort(-raw[valid], kind="stable")]
+
+
+def zhejiang_grade_score(raw_scores: pd.Series) -> pd.Series:
+    """按浙江“5等20级”规则，把原始分转换为等级赋分（整数，40~100）。"""
+    raw = pd.to_numeric(raw_scores, errors="coerce").to_numpy(dtype=float)
+    order = rank_order(raw)
+    _, scores = grade_sorted(raw[order])
+    out = np.full(len(raw), np.nan)
+    out[order] = scores
+    return pd.Series(pd.array(out, dtype="Int64"), index=raw_scores.index)
@@ -0,0 +1,302 @@
+"""成绩批量追加：把迟到的成绩批次（补录学校、复核改分）并入已有数据，不做全量重算。
+
+- 每科原始分与总成绩各维护一个按 (分数降序, 行号) 排列的有序索引，批次通过二分定位后
+  删除/归并插入；
+- 位次按插入、删除位置平移更新，不重新排序；一分一段表同样归并更新；
+- 某科等级边界实际移动（已有考生跨级，或某级最高/最低原始分变化）时整科重算，否则只为
+  批次中的考生赋分；regrade=False 时已公布的赋分保持不变，边界移动的科目记入报告的 stale。
+
+构建 ScoreBook 本身就是一次全量排序与赋分；追加的开销只有在同一个 ScoreBook 常驻内存、
+连续并入多个批次时才远小于重算。
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from gaokao.data import CORE_150_COLS, compute_total_score
+from gaokao.fufen import (
+    SUBJECT_COLS,
+    grade_sorted,
+    grade_values,
+    level_bounds,
+    level_extremes,
+    rank_order,
+)
+from gaokao.query import ScoreSegments
+
+
+class _RankIndex:
+    """按 (分数降序, 行号升序) 排列的有序索引，支持按行删除与归并插入。"""
+
+    def __init__(self, by_row: np.ndarray) -> None:
+        self.by_row = np.asarray(by_row, dtype=float).copy()  # 行号 → 当前分数，NaN 表示不在索引中
+        self.order = rank_order(self.by_row)  # 名次 → 行号
+        self.keys = -self.by_row[self.order]  # 升序，便于二分
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    @property
+    def values(self) -> np.ndarray:
+        """按名次排列的分数（降序）。"""
+        return -self.keys
+
+    def grow(self, n_rows: int) -> None:
+        if n_rows > len(self.by_row):
+            self.by_row = np.r_[self.by_row, np.full(n_rows - len(self.by_row), np.nan)]
+
+    def _locate(self, rows: np.ndarray, keys: np.ndarray) -> np.ndarray:
+        """(键, 行号) 在索引中的位置：已有条目为其所在位置，新条目为插入位置。"""
+        if len(self.order) == 0:
+            return np.zeros(len(rows), dtype=np.int64)
+        lo = np.searchsorted(self.keys, keys, side="left")
+        hi = np.searchsorted(self.keys, keys, side="right")
+        # 同分块末尾的行号最大：新追加的行排在块尾，块尾条目本身即在 hi-1，其余在块内二分
+        block_max = np.where(hi > lo, self.order[np.maximum(hi - 1, 0)], -1)
+        pos = np.where(rows == block_max, hi - 1, hi)
+        inside = np.flatnonzero(rows < block_max)
+        # 同一同分块内的条目一次二分
+        for start in np.unique(lo[inside]).tolist():
+            group = inside[lo[inside] == start]
+            end = hi[group[0]]
+            pos[group] = start + np.searchsorted(self.order[start:end], rows[group], side="left")
+        return pos
+
+    def remove(self, rows: np.ndarray) -> np.ndarray:
+        """删除这些行（不在索引中的忽略），返回被删条目原来的位置（升序）。"""
+        rows = rows[~np.isnan(self.by_row[rows])]
+        if len(rows) == 0:
+            return np.zeros(0, dtype=np.int64)
+        pos = np.sort(self._locate(rows, -self.by_row[rows]))
+        self.order = np.delete(self.order, pos)
+        self.keys = np.delete(self.keys, pos)
+        self.by_row[rows] = np.nan
+        return pos
+
+    def insert(self, rows: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """插入这些行（分数为 NaN 的跳过），返回它们插入后的位置（升序）。"""
+        ok = ~np.isnan(values)
+        rows, values = rows[ok], values[ok]
+        if len(rows) == 0:
+            return np.zeros(0, dtype=np.int64)
+        # 先按 (分数降序, 行号) 排好，使插入下标单调不减
+        sort = np.lexsort((rows, -values))
+        rows, values = rows[sort], values[sort]
+        idx = self._locate(rows, -values)
+        self.order = np.insert(self.order, idx, rows)
+        self.keys = np.insert(self.keys, idx, -values)
+        self.by_row[rows] = values
+        return idx + np.arange(len(idx))
+
+
+@dataclass
+class _SubjectIndex:
+    fufen_col: str
+    index: _RankIndex
+    bounds: np.ndarray  # 各等级在名次序列中的起点
+    top: np.ndarray  # 各等级最高原始分
+    bottom: np.ndarray  # 各等级最低原始分
+
+    @classmethod
+    def build(cls, fufen_col: str, raw: np.ndarray) -> "_SubjectIndex":
+        index = _RankIndex(raw)
+        bounds = level_bounds(len(index))
+        top, bottom = level_extremes(index.values, bounds)
+        return cls(fufen_col=fufen_col, index=index, bounds=bounds, top=top, bottom=bottom)
+
+    def grade_all(self, n_rows: int) -> np.ndarray:
+        """整科赋分，返回按行号排列的赋分（无成绩为 NaN）。"""
+        _, scores = grade_sorted(self.index.values)
+        out = np.full(n_rows, np.nan)
+        out[self.index.order] = scores
+        return out
+
+
+@dataclass
+class AppendReport:
+    added: int  # 新增考生数
+    updated: int  # 改分的已有考生数
+    regraded: List[str] = field(default_factory=list)  # 等级边界移动、整科重算的科目
+    stale: List[str] = field(default_factory=list)  # 等级边界移动、但 regrade=False 未重算的科目
+    changed_rows: int = 0  # 批次以外赋分或总成绩因此变化的考生数
+    seconds: float = 0.0
+
+
+def _nan_equal(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (a == b) | (np.isnan(a) & np.isnan(b))
+
+
+class ScoreBook:
+    """可增量追加的成绩库：成绩表 + 各科/总成绩有序索引 + 位次 + 一分一段表。
+
+    regrade 为 True 时构建时按规则重算全部赋分（与 apply_zhejiang_fufen 一致），追加时等级边界
+    移动则整科重算；为 False 时沿用成绩表中已有的赋分，追加时只为批次考生赋分，
+    同一科目中新旧考生可能按不同的等级边界赋分（见 AppendReport.stale）。
+    """
+
+    def __init__(self, df_score: pd.DataFrame, regrade: bool = True) -> None:
+        self.regrade = regrade
+        df = df_score.reset_index(drop=True).copy()
+        for c in ["准考证号", *CORE_150_COLS]:
+            if c not in df.columns:
+                raise ValueError(f"未找到成绩列: {c}")
+
+        self.subjects: Dict[str, _SubjectIndex] = {}
+        for raw_col, fufen_col in SUBJECT_COLS:
+            if raw_col not in df.columns:
+                continue
+            raw = pd.to_numeric(df[raw_col], errors="coerce").to_numpy(dtype=float)
+            subject = _SubjectIndex.build(fufen_col, raw)
+            if regrade or fufen_col not in df.columns:
+                df[fufen_col] = subject.grade_all(len(df))
+            self.subjects[raw_col] = subject
+
+        df["总成绩"] = compute_total_score(df)
+        self.df = df
+        self._pos = {k: i for i, k in enumerate(df["准考证号"].astype(str))}
+
+        totals = df["总成绩"].to_numpy(dtype=float)
+        self._totals = _RankIndex(totals)
+        self.ranks = np.full(len(df), np.nan)
+        self.ranks[self._totals.order] = np.arange(1, len(self._totals) + 1)
+        self.segments = ScoreSegments(totals)
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def rank_of(self, exam_id: str):
+        pos = self._pos.get(str(exam_id))
+        if pos is None or np.isnan(self.ranks[pos]):
+            return None
+        return int(self.ranks[pos])
+
+    def rank_table(self) -> pd.DataFrame:
+        """按位次排列的成绩表（即 高考考生位次.csv 的内容）。"""
+        table = self.df.iloc[self._totals.order].reset_index(drop=True)
+        table["位次"] = np.arange(1, len(table) + 1)
+        return table
+
+    # --- 追加 ---------------------------------------------------------------
+
+    def _merge_rows(self, batch: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, int]:
+        """把批次写入成绩表，返回 (批次行号, 改分前的行号集合, 改分人数)。"""
+        ids = batch["准考证号"].astype(str)
+        batch = batch[~ids.duplicated(keep="last").to_numpy()].reset_index(drop=True)
+        ids = batch["准考证号"].astype(str)
+        existing = [self._pos.get(k) for k in ids.tolist()]
+        is_update = np.array([pos is not None for pos in existing], dtype=bool)
+
+        cols = [c for c in batch.columns if c in self.df.columns and c != "总成绩"]
+        updated_rows = np.array([pos for pos in existing if pos is not None], dtype=np.int64)
+        for c in cols:
+            if len(updated_rows):
+                self.df.loc[updated_rows, c] = batch.loc[is_update, c].to_numpy()
+
+        new = batch.loc[~is_update].reindex(columns=self.df.columns)
+        n_old = len(self.df)
+        new_rows = np.arange(n_old, n_old + len(new), dtype=np.int64)
+        if len(new):
+            new.index = new_rows
+            self.df = pd.concat([self.df, new])
+            for i, k in zip(new_rows.tolist(), ids[~is_update].tolist()):
+                self._pos[k] = i
+
+        rows = np.r_[updated_rows, new_rows]
+        return rows, updated_rows, len(updated_rows)
+
+    def _append_subject(self, raw_col: str, subject: _SubjectIndex, rows: np.ndarray) -> Tuple[np.ndarray, bool]:
+        """更新一科的索引与赋分，返回 (批次以外赋分变化的行号, 等级边界是否移动)。"""
+        n_rows = len(self.df)
+        index = subject.index
+        index.grow(n_rows)
+        raw = pd.to_numeric(self.df[raw_col].iloc[rows], errors="coerce").to_numpy(dtype=float)
+        if np.isnan(raw).all() and np.isnan(index.by_row[rows]).all():
+            return np.zeros(0, dtype=np.int64), False
+
+        del_pos = index.remove(rows)
+        ins_pos = index.insert(rows, raw)
+        bounds = level_bounds(len(index))
+        top, bottom = level_extremes(index.values, bounds)
+
+        # 批次以外的考生是否跨级：各边界之前的“未变动条目”数不变即不跨级
+        kept_before = subject.bounds - np.searchsorted(del_pos, subject.bounds, side="left")
+        kept_after = bounds - np.searchsorted(ins_pos, bounds, side="left")
+        same = (
+            np.array_equal(kept_before, kept_after)
+            and _nan_equal(top, subject.top).all()
+            and _nan_equal(bottom, subject.bottom).all()
+        )
+        subject.bounds, subject.top, subject.bottom = bounds, top, bottom
+
+        col = self.df[subject.fufen_col].to_numpy(dtype=float).copy()
+        if same or not self.regrade:
+            # 只为批次考生赋分（按新的等级边界）
+            col[rows] = np.nan
+            if len(ins_pos):
+                levels = np.searchsorted(bounds, ins_pos, side="right")
+                rows_in = index.order[ins_pos]
+                col[rows_in] = grade_values(index.values[ins_pos], levels, top, bottom)
+            self.df[subject.fufen_col] = col
+            return np.zeros(0, dtype=np.int64), not same
+
+        graded = subject.grade_all(n_rows)
+        changed = ~_nan_equal(graded, col)
+        changed[rows] = False
+        self.df[subject.fufen_col] = graded
+        return np.flatnonzero(changed), True
+
+    def append(self, batch: pd.DataFrame) -> AppendReport:
+        """并入一批成绩：准考证号已存在的视为改分，其余为新增考生。"""
+        start = time.perf_counter()
+        if "准考证号" not in batch.columns:
+            raise ValueError("成绩批次中缺少 '准考证号' 列")
+
+        rows, updated_rows, n_updated = self._merge_rows(batch)
+        report = AppendReport(added=len(rows) - n_updated, updated=n_updated)
+        if len(rows) == 0:
+            return report
+
+        changed_parts = []
+        for raw_col, subject in self.subjects.items():
+            changed, moved = self._append_subject(raw_col, subject, rows)
+            if moved:
+                (report.regraded if self.regrade else report.stale).append(subject.fufen_col.replace("赋分", ""))
+            changed_parts.append(changed)
+        changed = np.unique(np.concatenate(changed_parts)) if changed_parts else np.zeros(0, dtype=np.int64)
+
+        # 总成绩：批次考生与赋分变化的考生重新计算，只有总分变了的才需要在索引中移动
+        self._totals.grow(len(self.df))
+        self.ranks = np.r_[self.ranks, np.full(len(self.df) - len(self.ranks), np.nan)]
+        touched = np.r_[rows, changed]
+        old_totals = self._totals.by_row[touched]
+        new_totals = compute_total_score(self.df.iloc[touched]).to_numpy(dtype=float)
+        moved = ~_nan_equal(old_totals, new_totals)
+        moved[: len(rows)] = True
+        move_rows = touched[moved]
+        # 批次以外总成绩变化的考生必然赋分也变化，已包含在 changed 中
+        report.changed_rows = len(changed)
+        totals = self.df["总成绩"].to_numpy(dtype=float).copy()
+        totals[touched] = new_totals
+        self.df["总成绩"] = totals
+
+        del_pos = self._totals.remove(move_rows)
+        ins_pos = self._totals.insert(move_rows, new_totals[moved])
+
+        # 位次平移：未移动的考生位次 = 原位次 − 前面删去的人数 + 前面插入的人数
+        stay = ~np.isnan(self.ranks)
+        stay[move_rows] = False
+        n_before = len(self._totals) - len(ins_pos) + len(del_pos)
+        q = self.ranks[stay].astype(np.int64) - 1
+        q -= np.cumsum(np.bincount(del_pos, minlength=n_before))[q]
+        q += np.cumsum(np.bincount(ins_pos - np.arange(len(ins_pos)), minlength=n_before + 1))[q]
+        self.ranks[stay] = q + 1
+        self.ranks[move_rows] = np.nan
+        self.ranks[self._totals.order[ins_pos]] = ins_pos + 1
+
+        self.segments = self.segments.merged(new_totals[moved], removed=old_totals[moved])
+        report.seconds = time.perf_counter() - start
+        return report
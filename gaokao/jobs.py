@@ -0,0 +1,104 @@
+"""会话级后台任务：把耗时操作（AI 调用、模拟录取）放到线程池执行。
+
+Streamlit 每次交互都会从头重跑脚本，同步执行的长任务既会卡住页面，
+也会在用户点击其它控件时被打断。这里的 JobRunner 只负责登记任务、
+保存 Future 与进度，任务函数本身不能调用任何 ``st.*`` 接口。
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, MutableMapping, Optional
+
+
+MAX_WORKERS = 4
+SESSION_KEY = "_gaokao_job_runner"
+
+# 线程池在进程内共享；每个会话只持有自己的任务登记表，
+# 避免每个会话各开一个线程池导致空闲线程越积越多。
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="gaokao-job")
+        return _executor
+
+
+@dataclass
+class Job:
+    name: str
+    future: Future
+    started_at: float = field(default_factory=time.time)
+    progress: float = 0.0
+    message: str = ""
+
+    def report(self, fraction: float, message: str = "") -> None:
+        """供任务函数回调的进度上报，fraction 取值 0~1。"""
+        self.progress = min(max(float(fraction), 0.0), 1.0)
+        if message:
+            self.message = message
+
+    @property
+    def done(self) -> bool:
+        return self.future.done()
+
+    @property
+    def elapsed(self) -> float:
+        return time.time() - self.started_at
+
+
+class JobRunner:
+    """按名称登记后台任务；同名任务未结束前不会重复提交。"""
+
+    def __init__(self) -> None:
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        with_progress: bool = False,
+        **kwargs: Any,
+    ) -> Job:
+        """提交任务。with_progress=True 时以 ``progress=job.report`` 关键字传入进度回调。"""
+        with self._lock:
+            existing = self._jobs.get(name)
+            if existing is not None and not existing.done:
+                return existing
+
+            job = Job(name=name, future=Future())
+            if with_progress:
+                kwargs["progress"] = job.report
+            job.future = _get_executor().submit(fn, *args, **kwargs)
+            self._jobs[name] = job
+            return job
+
+    def get(self, name: str) -> Optional[Job]:
+        return self._jobs.get(name)
+
+    def pop(self, name: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.pop(name, None)
+
+    def running(self, *names: str) -> List[Job]:
+        jobs = [j for n, j in self._jobs.items() if not names or n in names]
+        return [j for j in jobs if not j.done]
+
+    def finished(self) -> List[Job]:
+        return [j for j in self._jobs.values() if j.done]
+
+
+def session_runner(state: MutableMapping[str, Any]) -> JobRunner:
+    """从会话状态（如 ``st.session_state``）中取出本会话的 JobRunner，不存在则创建。"""
+    runner = state.get(SESSION_KEY)
+    if runner is None:
+        runner = JobRunner()
+        state[SESSION_KEY] = runner
+    return runner
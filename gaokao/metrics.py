@@ -0,0 +1,144 @@
+"""重跑热路径的轻量计时与计数。
+
+Streamlit 每次交互都会整页重跑，这里按阶段（load_data、各标签页、模拟录取、AI 调用）
+记录最近若干次耗时与缓存命中计数，进程内所有会话共享。结果可在管理面板查看，
+也可导出为 Prometheus 文本格式（.prom）或 JSON 文件供外部采集。
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+MAX_SAMPLES = 1000
+METRIC_PREFIX = "gaokao"
+
+
+class MetricsRegistry:
+    def __init__(self, max_samples: int = MAX_SAMPLES) -> None:
+        self.max_samples = max_samples
+        self._timings: Dict[str, Deque[float]] = {}
+        self._totals: Dict[str, int] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._last_export = 0.0
+
+    def observe(self, name: str, ms: float) -> None:
+        with self._lock:
+            samples = self._timings.get(name)
+            if samples is None:
+                samples = self._timings[name] = deque(maxlen=self.max_samples)
+            samples.append(ms)
+            self._totals[name] = self._totals.get(name, 0) + 1
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000.0)
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def record_cache(self, name: str, hit: bool) -> None:
+        """记录一次缓存查询；命中率 = hit / (hit + miss)。"""
+        self.incr(f"{name}.{'hit' if hit else 'miss'}")
+
+    def timing_summary(self) -> List[Dict[str, float]]:
+        with self._lock:
+            snapshot = {k: (list(v), self._totals[k]) for k, v in self._timings.items()}
+        rows = []
+        for name, (samples, total) in sorted(snapshot.items()):
+            arr = np.asarray(samples, dtype=float)
+            rows.append({
+                "section": name,
+                "count": total,
+                "p50_ms": round(float(np.percentile(arr, 50)), 2),
+                "p95_ms": round(float(np.percentile(arr, 95)), 2),
+                "max_ms": round(float(arr.max()), 2),
+            })
+        return rows
+
+    def cache_summary(self) -> List[Dict[str, float]]:
+        with self._lock:
+            counters = dict(self._counters)
+        names = sorted({k.rsplit(".", 1)[0] for k in counters if k.endswith((".hit", ".miss"))})
+        rows = []
+        for name in names:
+            hit = counters.get(f"{name}.hit", 0)
+            miss = counters.get(f"{name}.miss", 0)
+            rows.append({
+                "cache": name,
+                "hit": hit,
+                "miss": miss,
+                "hit_rate": round(hit / (hit + miss), 4) if hit + miss else 0.0,
+            })
+        return rows
+
+    def counters(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def to_json(self) -> Dict[str, object]:
+        return {
+            "timestamp": time.time(),
+            "timings": self.timing_summary(),
+            "caches": self.cache_summary(),
+            "counters": self.counters(),
+        }
+
+    def to_prometheus(self) -> str:
+        lines = [
+            f"# HELP {METRIC_PREFIX}_section_duration_ms Section duration over recent reruns.",
+            f"# TYPE {METRIC_PREFIX}_section_duration_ms summary",
+        ]
+        for row in self.timing_summary():
+            label = f'section="{row["section"]}"'
+            lines.append(f'{METRIC_PREFIX}_section_duration_ms{{{label},quantile="0.5"}} {row["p50_ms"]}')
+            lines.append(f'{METRIC_PREFIX}_section_duration_ms{{{label},quantile="0.95"}} {row["p95_ms"]}')
+            lines.append(f'{METRIC_PREFIX}_section_duration_ms_count{{{label}}} {row["count"]}')
+
+        lines.append(f"# TYPE {METRIC_PREFIX}_events_total counter")
+        for name, value in sorted(self.counters().items()):
+            lines.append(f'{METRIC_PREFIX}_events_total{{name="{name}"}} {value}')
+
+        lines.append(f"# TYPE {METRIC_PREFIX}_cache_hit_ratio gauge")
+        for row in self.cache_summary():
+            lines.append(f'{METRIC_PREFIX}_cache_hit_ratio{{cache="{row["cache"]}"}} {row["hit_rate"]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str) -> None:
+        """按扩展名写出：.json 为 JSON，其它为 Prometheus 文本格式。原子替换，避免采集到半个文件。"""
+        if path.endswith(".json"):
+            content = json.dumps(self.to_json(), ensure_ascii=False, indent=2)
+        else:
+            content = self.to_prometheus()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def maybe_export(self, path: Optional[str], min_interval: float = 5.0) -> bool:
+        """距上次导出超过 min_interval 秒才写文件，避免每次重跑都落盘。"""
+        if not path:
+            return False
+        now = time.time()
+        with self._lock:
+            if now - self._last_export < min_interval:
+                return False
+            self._last_export = now
+        self.export(path)
+        return True
+
+
+# 进程级共享的指标注册表
+registry = MetricsRegistry()
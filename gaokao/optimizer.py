@@ -0,0 +1,144 @@
+"""志愿表优化：在平行志愿规则下为单个考生选择并排序至多 K 个志愿，使期望效用最大。
+
+平行志愿按顺序检索，录取到第一个能录取的志愿，因此志愿表 c_1..c_K 的期望效用为
+    EU = Σ_i u_i · p_i · Π_{j<i} (1 − p_j)
+（各志愿录取与否视为相互独立）。给定集合时按效用从高到低排列最优，于是按效用排序后
+对“剩余候选 × 剩余志愿数”做动态规划：
+    best[i][k] = max(best[i+1][k], u_i · p_i + (1 − p_i) · best[i+1][k−1])
+复杂度 O(候选数 × K)。候选先按录取概率剪枝（位次窗口），同一效用等级内只保留概率最高的 K 个。
+"""
+
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from gaokao.choices import PlanIndex
+
+
+DEFAULT_K = 6
+# 位次的相对波动：录取位次线为 c 时，位次 r 的录取概率为 1 / (1 + exp((r − c) / (RANK_NOISE · c)))
+RANK_NOISE = 0.08
+# 录取概率低于此值的专业不参与搜索
+MIN_PROB = 0.01
+
+
+@dataclass
+class OptimizedList:
+    table: pd.DataFrame  # 志愿、院校、专业、录取位次线、录取概率、效用、在此志愿录取的概率
+    expected_utility: float
+    admit_probability: float  # 至少被一个志愿录取的概率
+    candidates: int  # 剪枝后参与搜索的专业数
+
+
+def admission_probability(rank: float, cutoff_ranks: np.ndarray, noise: float = RANK_NOISE) -> np.ndarray:
+    """按录取位次线估计录取概率；位次线为 NaN（未录满）的专业视为必定录取。"""
+    cut = np.asarray(cutoff_ranks, dtype=float)
+    scale = np.maximum(noise * np.nan_to_num(cut, nan=1.0), 1.0)
+    with np.errstate(over="ignore", invalid="ignore"):
+        p = 1.0 / (1.0 + np.exp((rank - cut) / scale))
+    return np.where(np.isnan(cut), 1.0, p)
+
+
+def major_utilities(
+    plan: PlanIndex,
+    major_weights: Optional[Mapping[str, float]] = None,
+    school_weights: Optional[Mapping[str, float]] = None,
+    default: float = 1.0,
+) -> np.ndarray:
+    """各专业的效用 = 专业权重 × 院校权重，未指定的取 default；权重为 0 表示不考虑。"""
+    u = np.full(len(plan), default, dtype=float)
+    if major_weights:
+        u *= pd.Series(plan.majors).map(major_weights).fillna(1.0).to_numpy(dtype=float)
+    if school_weights:
+        u *= pd.Series(plan.schools).map(school_weights).fillna(1.0).to_numpy(dtype=float)
+    return u
+
+
+def _prune(u: np.ndarray, p: np.ndarray, k: int, min_prob: float) -> np.ndarray:
+    """返回参与搜索的专业 id，按效用从高到低、同效用内按录取概率从低到高（先冲后保）排列。"""
+    ids = np.flatnonzero((u > 0) & (p >= min_prob))
+    ids = ids[np.lexsort((p[ids], -u[ids]))]
+    if len(ids) == 0:
+        return ids
+    # 同一效用等级内至多选 k 个，概率最高的 k 个足够
+    uu = u[ids]
+    starts = np.r_[0, np.flatnonzero(uu[1:] != uu[:-1]) + 1]
+    ends = np.r_[starts[1:], len(ids)]
+    from_end = np.repeat(ends, ends - starts) - np.arange(len(ids))
+    return ids[from_end <= k]
+
+
+def optimize_choices(
+    plan: PlanIndex,
+    rank: float,
+    cutoff_ranks: np.ndarray,
+    utilities: np.ndarray,
+    k: int = DEFAULT_K,
+    noise: float = RANK_NOISE,
+    min_prob: float = MIN_PROB,
+) -> OptimizedList:
+    """从招生计划中选出至多 k 个志愿并排序，使期望效用最大。"""
+    if k < 1:
+        raise ValueError("志愿个数至少为 1")
+    utilities = np.asarray(utilities, dtype=float)
+    p_all = admission_probability(rank, cutoff_ranks, noise)
+    ids = _prune(utilities, p_all, k, min_prob)
+    u = utilities[ids]
+    p = p_all[ids]
+    n = len(ids)
+
+    # best[j]：用当前及之后的候选、至多 j 个志愿能达到的期望效用
+    best = np.zeros(k + 1)
+    take = np.zeros((n, k + 1), dtype=bool)
+    gain = u * p
+    miss = 1.0 - p
+    for i in range(n - 1, -1, -1):
+        cand = gain[i] + miss[i] * best[:-1]
+        chosen = cand > best[1:]
+        take[i, 1:] = chosen
+        best[1:] = np.where(chosen, cand, best[1:])
+
+    picked = []
+    slots = k
+    for i in range(n):
+        if slots == 0:
+            break
+        if take[i, slots]:
+            picked.append(i)
+            slots -= 1
+
+    picked = np.asarray(picked, dtype=np.int64)
+    p_sel = p[picked]
+    reach = np.cumprod(np.r_[1.0, 1.0 - p_sel[:-1]]) if len(picked) else np.empty(0)
+    pair_ids = ids[picked]
+    cut = np.asarray(cutoff_ranks, dtype=float)[pair_ids]
+    table = pd.DataFrame({
+        "志愿": np.arange(1, len(picked) + 1),
+        "院校": plan.schools[pair_ids],
+        "专业": plan.majors[pair_ids],
+        "录取位次线": pd.array(np.where(np.isnan(cut), np.nan, np.round(cut)), dtype="Int64"),
+        "录取概率": p_sel,
+        "效用": u[picked],
+        "在此志愿录取": p_sel * reach,
+    })
+    return OptimizedList(
+        table=table,
+        expected_utility=float(best[k]),
+        admit_probability=float(1.0 - np.prod(1.0 - p_sel)) if len(picked) else 0.0,
+        candidates=n,
+    )
+
+
+def cutoffs_from_plan(plan: PlanIndex, df_plan: pd.DataFrame, score_col: str, segments) -> np.ndarray:
+    """没有录取模拟结果时，用招生计划中的分数线换算录取位次线（不低于该分数的人数）。"""
+    lines = pd.to_numeric(df_plan[score_col], errors="coerce")
+    codes = plan.encode(df_plan["院校名称"], df_plan["专业名称"])
+    ok = (codes >= 0) & lines.notna().to_numpy()
+    # 与 encode_plan 一致：重复的 (院校, 专业) 以最后一行为准
+    last = pd.Series(lines.to_numpy()[ok], index=codes[ok]).groupby(level=0).last()
+    # 无分数线的专业位次线记为 0，即录取概率约为 0，不参与推荐
+    cutoff = np.zeros(len(plan))
+    cutoff[last.index.to_numpy()] = segments.count_at_least(last.to_numpy())
+    return cutoff
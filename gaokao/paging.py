@@ -0,0 +1,133 @@
+"""服务端分页表格：数据留在服务端，筛选/排序基于预先计算的索引，每次只取出一页。
+
+分类列在构建时 factorize 为整数编码（按值排序），排序顺序按列惰性计算一次后复用；
+一次查询只做若干 O(n) 的向量化布尔运算，再按页切片，送往浏览器的数据量与总行数无关。
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_PAGE_SIZE = 50
+
+
+@dataclass
+class Page:
+    frame: pd.DataFrame  # 当前页的行
+    total: int  # 筛选后的总行数
+    page: int  # 当前页码，从 1 开始
+    pages: int  # 总页数（至少为 1）
+
+
+def _factorize(series: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """按值排序的整数编码（空值为 -1）与对应的取值。"""
+    try:
+        codes, uniques = pd.factorize(series, sort=True)
+    except TypeError:
+        # 混合类型无法直接比较时按字符串排序，取值也随之为字符串
+        codes, uniques = pd.factorize(series.astype(str).where(series.notna()), sort=True)
+    return codes, pd.Index(uniques)
+
+
+class PagedTable:
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        category_cols: Sequence[str] = (),
+        range_col: Optional[str] = None,
+    ):
+        self.df = df.reset_index(drop=True)
+        self.category_cols = [c for c in category_cols if c in self.df.columns]
+        self.range_col = range_col if range_col in self.df.columns else None
+
+        self._codes: Dict[str, np.ndarray] = {}
+        self._uniques: Dict[str, pd.Index] = {}
+        for col in self.category_cols:
+            self._codes[col], self._uniques[col] = _factorize(self.df[col])
+
+        self._values = None
+        if self.range_col:
+            self._values = pd.to_numeric(self.df[self.range_col], errors="coerce").to_numpy(dtype=float)
+
+        self._orders: Dict[Tuple[str, bool], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def options(self, col: str) -> List:
+        """分类列的可选值（已排序，不含空值）。"""
+        return self._uniques[col].tolist()
+
+    def range_bounds(self) -> Optional[Tuple[float, float]]:
+        """数值范围列的最小/最大值；整数值返回 int，无数据时为 None。"""
+        if self._values is None or np.isnan(self._values).all():
+            return None
+        lo, hi = float(np.nanmin(self._values)), float(np.nanmax(self._values))
+        if lo.is_integer() and hi.is_integer():
+            return int(lo), int(hi)
+        return lo, hi
+
+    def _order(self, col: str, ascending: bool) -> np.ndarray:
+        """按某列排序后的行号，空值始终排在最后；结果缓存复用。"""
+        cached = self._orders.get((col, ascending))
+        if cached is not None:
+            return cached
+        codes = self._codes.get(col)
+        if codes is None:
+            codes, _ = _factorize(self.df[col])
+        key = codes.astype(np.int64)
+        if not ascending:
+            key = key.max(initial=0) - key
+        key[codes < 0] = np.iinfo(np.int64).max
+        order = np.argsort(key, kind="stable")
+        self._orders[(col, ascending)] = order
+        return order
+
+    def mask(
+        self,
+        filters: Optional[Mapping[str, object]] = None,
+        value_range: Optional[Tuple[float, float]] = None,
+    ) -> Optional[np.ndarray]:
+        """筛选条件对应的布尔掩码；没有任何条件时返回 None。"""
+        mask = None
+        for col, value in (filters or {}).items():
+            if col not in self._codes:
+                raise ValueError(f"列 '{col}' 不支持筛选")
+            idx = self._uniques[col].get_indexer([value])[0]
+            hit = self._codes[col] == idx if idx >= 0 else np.zeros(len(self), dtype=bool)
+            mask = hit if mask is None else mask & hit
+        if value_range is not None and self._values is not None:
+            lo, hi = value_range
+            hit = (self._values >= lo) & (self._values <= hi)
+            mask = hit if mask is None else mask & hit
+        return mask
+
+    def page(
+        self,
+        filters: Optional[Mapping[str, object]] = None,
+        value_range: Optional[Tuple[float, float]] = None,
+        sort_by: Optional[str] = None,
+        ascending: bool = True,
+        page: int = 1,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Page:
+        """筛选、排序后取出第 page 页；页码越界时取最近的一页。"""
+        if page_size <= 0:
+            raise ValueError("每页行数必须为正数")
+        mask = self.mask(filters, value_range)
+
+        if sort_by:
+            order = self._order(sort_by, ascending)
+            rows = order if mask is None else order[mask[order]]
+        else:
+            rows = np.arange(len(self)) if mask is None else np.flatnonzero(mask)
+
+        total = len(rows)
+        pages = max(1, -(-total // page_size))
+        page = min(max(int(page), 1), pages)
+        start = (page - 1) * page_size
+        frame = self.df.iloc[rows[start:start + page_size]]
+        return Page(frame=frame, total=total, page=page, pages=pages)
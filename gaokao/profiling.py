@@ -0,0 +1,58 @@
+"""冷启动耗时记录：设置 GAOKAO_PROFILE_STARTUP=1 后记录导入与各阶段耗时。
+
+每个新会话都会从头执行 app.py，这里记录从脚本开始到各标记点的耗时（毫秒），
+未开启时所有方法均为空操作，几乎没有额外开销。
+设置 GAOKAO_PROFILE_OUTPUT=<路径> 时，脚本结束后把结果写为 JSON，
+供 scripts/bench_startup.py 读取。
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+class StartupProfile:
+    def __init__(self, enabled: bool, t0: Optional[float] = None) -> None:
+        self.enabled = enabled
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.marks: Dict[str, float] = {}
+        self.sections: List[Dict[str, float]] = []
+
+    @classmethod
+    def from_env(cls, t0: Optional[float] = None) -> "StartupProfile":
+        return cls(os.environ.get("GAOKAO_PROFILE_STARTUP", "0") == "1", t0=t0)
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.t0) * 1000.0
+
+    def mark(self, name: str) -> None:
+        """记录从脚本开始到此刻的耗时。"""
+        if self.enabled:
+            self.marks[name] = round(self._elapsed_ms(), 2)
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """记录一段代码（如一次 import）的耗时。"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections.append({
+                "name": name,
+                "ms": round((time.perf_counter() - start) * 1000.0, 2),
+            })
+
+    def as_dict(self) -> Dict[str, object]:
+        return {"marks": dict(self.marks), "sections": list(self.sections)}
+
+    def dump(self, path: Optional[str] = None) -> None:
+        path = path or os.environ.get("GAOKAO_PROFILE_OUTPUT")
+        if not self.enabled or not path:
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, ensure_ascii=False, indent=2)
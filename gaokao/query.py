@@ -0,0 +1,190 @@
+"""个人成绩查询、分数→位次换算与志愿推荐。"""
+
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# 推荐区间：[我的分数-40, 我的分数+10] (可以冲一点，也可以保底)
+RECOMMEND_BELOW = 40
+RECOMMEND_ABOVE = 10
+
+
+def find_students(df_score: pd.DataFrame, text: str) -> pd.DataFrame:
+    """按姓名或准考证号模糊匹配。"""
+    mask = (df_score["姓名"].astype(str).str.contains(text, regex=False)) | \
+           (df_score["准考证号"].astype(str).str.contains(text, regex=False))
+    return df_score[mask]
+
+
+def plan_score_column(df_plan: pd.DataFrame) -> Optional[str]:
+    """招生计划中的分数线列（第一个列名含“分”的列）。"""
+    return score_column_of(df_plan.columns)
+
+
+def score_column_of(columns: Iterable[str]) -> Optional[str]:
+    """plan_score_column 的列名版本，供只知道表结构的后端（如 SQLite）使用。"""
+    for col in columns:
+        if "分" in col:
+            return col
+    return None
+
+
+def clean_plan(df_plan: pd.DataFrame, score_col: str) -> pd.DataFrame:
+    """分数线列转为数值，并丢弃无法解析的行。"""
+    df_plan_clean = df_plan.copy()
+    df_plan_clean[score_col] = pd.to_numeric(df_plan_clean[score_col], errors="coerce")
+    return df_plan_clean.dropna(subset=[score_col])
+
+
+def recommend(
+    df_plan: pd.DataFrame,
+    score: float,
+    below: float = RECOMMEND_BELOW,
+    above: float = RECOMMEND_ABOVE,
+) -> pd.DataFrame:
+    """推荐分数线落在 [score-below, score+above] 内的专业，按分数线从高到低排列。"""
+    score_col = plan_score_column(df_plan)
+    if score_col is None:
+        raise ValueError("在招生计划表中未找到分数线相关列，无法自动推荐。")
+
+    df_plan_clean = clean_plan(df_plan, score_col)
+    return df_plan_clean[
+        (df_plan_clean[score_col] <= score + above) &
+        (df_plan_clean[score_col] >= score - below)
+    ].sort_values(by=score_col, ascending=False)
+
+
+def to_python(value: Any) -> Any:
+    """numpy/pandas 标量转为可 JSON 序列化的 Python 值，缺失值为 None。"""
+    if value is None or value is pd.NA:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def _dup_offsets(sorted_values: np.ndarray) -> np.ndarray:
+    """有序数组中每个值是同值中的第几个（从 0 起）。"""
+    if len(sorted_values) == 0:
+        return np.zeros(0, dtype=np.int64)
+    starts = np.r_[True, sorted_values[1:] != sorted_values[:-1]]
+    first = np.maximum.accumulate(np.where(starts, np.arange(len(sorted_values)), 0))
+    return np.arange(len(sorted_values)) - first
+
+
+class ScoreSegments:
+    """一分一段表：有序总成绩上的二分查找，把分数换算为位次。"""
+
+    def __init__(self, totals: np.ndarray) -> None:
+        totals = np.asarray(totals, dtype=float)
+        self._sorted = np.sort(totals[~np.isnan(totals)])
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def merged(self, added: np.ndarray, removed: np.ndarray = ()) -> "ScoreSegments":
+        """删去 removed、并入 added 后的新表；归并插入，不重新排序全部数据。"""
+        kept = self._sorted
+        removed = np.asarray(removed, dtype=float)
+        removed = removed[~np.isnan(removed)]
+        if len(removed):
+            # 同分的任一条记录都可删去
+            kept = np.delete(kept, np.searchsorted(kept, np.sort(removed), side="left") + _dup_offsets(np.sort(removed)))
+        added = np.asarray(added, dtype=float)
+        added = np.sort(added[~np.isnan(added)])
+        result = ScoreSegments(np.empty(0))
+        result._sorted = np.insert(kept, np.searchsorted(kept, added, side="left"), added)
+        return result
+
+    def rank_for_score(self, score: float) -> int:
+        """位次 = 总成绩严格高于该分数的人数 + 1。"""
+        higher = len(self._sorted) - np.searchsorted(self._sorted, score, side="right")
+        return int(higher) + 1
+
+    def ranks_for_scores(self, scores: np.ndarray) -> np.ndarray:
+        """rank_for_score 的向量化版本。"""
+        scores = np.asarray(scores, dtype=float)
+        return len(self._sorted) - np.searchsorted(self._sorted, scores, side="right") + 1
+
+    def count_at_least(self, scores: np.ndarray) -> np.ndarray:
+        """总成绩不低于各分数的人数（向量化），即该分数线上最后一名的大致位次。"""
+        return len(self._sorted) - np.searchsorted(self._sorted, np.asarray(scores, dtype=float), side="left")
+
+    def table(self) -> pd.DataFrame:
+        """按分数从高到低列出每个分数的人数与累计人数。"""
+        scores, counts = np.unique(self._sorted, return_counts=True)
+        scores, counts = scores[::-1], counts[::-1]
+        return pd.DataFrame({"分数": scores, "人数": counts, "累计人数": np.cumsum(counts)})
+
+
+class ScoreIndex:
+    """预先建好的查询索引：准考证号→行号、有序总成绩、按分数线排序的招生计划。
+
+    只读共享，可在多线程服务中并发使用。
+    """
+
+    def __init__(self, df_score: pd.DataFrame, df_plan: Optional[pd.DataFrame] = None) -> None:
+        self.df_score = df_score
+        self._pos = {str(k): i for i, k in enumerate(df_score["准考证号"].astype(str))}
+
+        totals = pd.to_numeric(df_score["总成绩"], errors="coerce").to_numpy(dtype=float)
+        self._totals = totals
+        self.segments = ScoreSegments(totals)
+
+        self.plan_score_col = None
+        self._plan = None
+        self._plan_scores = np.empty(0)
+        if df_plan is not None:
+            self.plan_score_col = plan_score_column(df_plan)
+            if self.plan_score_col is not None:
+                plan = clean_plan(df_plan, self.plan_score_col)
+                self._plan = plan.sort_values(by=self.plan_score_col, kind="stable").reset_index(drop=True)
+                self._plan_scores = self._plan[self.plan_score_col].to_numpy(dtype=float)
+
+    @property
+    def total(self) -> int:
+        return len(self.segments)
+
+    def rank_for_score(self, score: float) -> int:
+        return self.segments.rank_for_score(score)
+
+    def student(self, exam_id: str) -> Optional[Dict[str, Any]]:
+        pos = self._pos.get(str(exam_id))
+        if pos is None:
+            return None
+        row = self.df_score.iloc[pos]
+        record = {k: to_python(v) for k, v in row.items() if not str(k).startswith("Unnamed")}
+        total = self._totals[pos]
+        record["位次"] = None if np.isnan(total) else self.rank_for_score(total)
+        return record
+
+    def recommend(
+        self,
+        score: float,
+        below: float = RECOMMEND_BELOW,
+        above: float = RECOMMEND_ABOVE,
+    ) -> pd.DataFrame:
+        """与 recommend() 结果一致，但用二分查找在预排序的招生计划上取区间。"""
+        lo, hi = self.recommend_range(score, below=below, above=above)
+        return self._plan.iloc[lo:hi].iloc[::-1]
+
+    @property
+    def sorted_plan(self) -> Optional[pd.DataFrame]:
+        """按分数线从低到高排序的招生计划，recommend_range() 的下标即指向它。"""
+        return self._plan
+
+    def recommend_range(
+        self,
+        score: float,
+        below: float = RECOMMEND_BELOW,
+        above: float = RECOMMEND_ABOVE,
+    ) -> Tuple[int, int]:
+        if self._plan is None:
+            raise ValueError("在招生计划表中未找到分数线相关列，无法自动推荐。")
+        lo = np.searchsorted(self._plan_scores, score - below, side="left")
+        hi = np.searchsorted(self._plan_scores, score + above, side="right")
+        return int(lo), int(hi)
@@ -0,0 +1,570 @@
+"""批量生成考生成绩报告：每人一份 HTML（成绩卡 + 雷达图 + 位次 + 推荐志愿）或 SVG 图片，打包为 zip。
+
+考生按块分发到进程池。成绩、位次与招生计划整理成只读的 ReportContext，只在每个工作进程
+启动时传入一次（fork 启动时直接继承父进程内存，不再序列化），之后各块只传行号区间。
+报告在工作进程中渲染并压缩，主进程只按块顺序把压缩好的条目追加到 zip 流（ZipStream，
+只顺序写、不回退，可直接写入不可 seek 的输出）；在途块数有上限，内存占用与人数无关。
+
+用法：
+    python -m gaokao.reports --out 成绩报告.zip
+    python -m gaokao.reports --out 成绩报告.zip --format svg --class 高三1班 --min-score 550 --workers 8
+"""
+
+import argparse
+import html
+import math
+import os
+import re
+import struct
+import tempfile
+import time
+import weakref
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Deque, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from gaokao.data import CORE_150_COLS, ELECTIVE_FUFEN_COLS, default_data_dir, load_datasets
+from gaokao.query import RECOMMEND_ABOVE, RECOMMEND_BELOW, ScoreSegments, clean_plan, plan_score_column
+
+
+REPORT_FORMATS = {"html": "HTML 网页", "svg": "SVG 图片"}
+DEFAULT_TITLE = "高考模拟成绩报告"
+# 每人报告中列出的推荐志愿数
+RECOMMEND_LIMIT = 10
+# 每块考生数；块太小时进程间通信占比高，太大时进度更新不及时
+REPORT_CHUNK = 100
+# 每个工作进程最多同时排队的块数
+PENDING_PER_WORKER = 2
+INDEX_FILE = "名单.csv"
+ZIP_LEVEL = 6
+
+ProgressFn = Callable[[float, str], None]
+
+_UNSAFE_NAME = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+@dataclass
+class ReportContext:
+    """生成报告所需的只读数据，各数组按考生（或按招生计划分数线升序）对齐。"""
+
+    ids: np.ndarray
+    names: np.ndarray
+    totals: np.ndarray
+    ranks: np.ndarray  # 0 表示没有总成绩
+    cohort_size: int  # 参与排位的总人数
+    subjects: List[str]
+    full_marks: np.ndarray
+    scores: np.ndarray  # (考生数, 科目数)，缺考为 NaN
+    plan_schools: np.ndarray
+    plan_majors: np.ndarray
+    plan_seats: Optional[np.ndarray]
+    plan_lines: np.ndarray
+    title: str = DEFAULT_TITLE
+    recommend_limit: int = RECOMMEND_LIMIT
+    below: float = RECOMMEND_BELOW
+    above: float = RECOMMEND_ABOVE
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+@dataclass
+class ReportSummary:
+    count: int
+    workers: int
+    seconds: float
+
+
+def build_context(
+    df_score: pd.DataFrame,
+    df_plan: Optional[pd.DataFrame] = None,
+    segments: Optional[ScoreSegments] = None,
+    title: str = DEFAULT_TITLE,
+    recommend_limit: int = RECOMMEND_LIMIT,
+) -> ReportContext:
+    """df_score 为要生成报告的考生（可已筛选）；segments 为全体考生的一分一段表，缺省时用 df_score 自身。"""
+    totals = pd.to_numeric(df_score["总成绩"], errors="coerce").to_numpy(dtype=float)
+    if segments is None:
+        segments = ScoreSegments(totals)
+    ranks = np.where(np.isnan(totals), 0, segments.ranks_for_scores(totals)).astype(np.int64)
+
+    subjects = [c for c in CORE_150_COLS + ELECTIVE_FUFEN_COLS if c in df_score.columns]
+    full_marks = np.array([150.0 if c in CORE_150_COLS else 100.0 for c in subjects])
+    scores = df_score[subjects].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+    schools = majors = lines = np.empty(0)
+    seats = None
+    score_col = plan_score_column(df_plan) if df_plan is not None else None
+    if score_col is not None:
+        plan = clean_plan(df_plan, score_col).sort_values(by=score_col, kind="stable")
+        schools = plan["院校名称"].astype(str).to_numpy()
+        majors = plan["专业名称"].astype(str).to_numpy()
+        lines = plan[score_col].to_numpy(dtype=float)
+        if "招收人数" in plan.columns:
+            seats = pd.to_numeric(plan["招收人数"], errors="coerce").to_numpy(dtype=float)
+
+    return ReportContext(
+        ids=df_score["准考证号"].astype(str).to_numpy(),
+        names=df_score["姓名"].astype(str).to_numpy(),
+        totals=totals,
+        ranks=ranks,
+        cohort_size=len(segments),
+        subjects=subjects,
+        full_marks=full_marks,
+        scores=scores,
+        plan_schools=schools,
+        plan_majors=majors,
+        plan_seats=seats,
+        plan_lines=lines,
+        title=title,
+        recommend_limit=recommend_limit,
+    )
+
+
+# --- 单份报告 ---------------------------------------------------------------
+
+def _fmt(value: float) -> str:
+    return "-" if np.isnan(value) else f"{value:g}"
+
+
+def recommendations(ctx: ReportContext, i: int) -> np.ndarray:
+    """分数线在 [总分-below, 总分+above] 内、最接近本人总分的专业，按分数线从高到低。"""
+    total = ctx.totals[i]
+    if np.isnan(total) or len(ctx.plan_lines) == 0:
+        return np.zeros(0, dtype=np.int64)
+    lo = np.searchsorted(ctx.plan_lines, total - ctx.below, side="left")
+    hi = np.searchsorted(ctx.plan_lines, total + ctx.above, side="right")
+    window = np.arange(lo, hi)
+    nearest = window[np.argsort(np.abs(ctx.plan_lines[window] - total), kind="stable")[:ctx.recommend_limit]]
+    return np.sort(nearest)[::-1]
+
+
+def radar_svg(labels: Sequence[str], values: Sequence[float], full: Sequence[float], size: int = 320) -> str:
+    """学科雷达图（按各科满分归一化），返回内联 SVG 片段。"""
+    n = len(labels)
+    cx = cy = size / 2
+    radius = size / 2 - 48
+    angles = [-math.pi / 2 + 2 * math.pi * k / n for k in range(n)]
+
+    def point(frac: float, angle: float) -> Tuple[float, float]:
+        return cx + radius * frac * math.cos(angle), cy + radius * frac * math.sin(angle)
+
+    def polygon(fracs: Sequence[float]) -> str:
+        return " ".join("%.1f,%.1f" % point(f, a) for f, a in zip(fracs, angles))
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 {size} {size}">']
+    for ring in (0.25, 0.5, 0.75, 1.0):
+        parts.append(f'<polygon points="{polygon([ring] * n)}" fill="none" stroke="#E0E0E0"/>')
+    for a in angles:
+        x, y = point(1.0, a)
+        parts.append(f'<line x1="{cx}" y1="{cy}" x2="{x:.1f}" y2="{y:.1f}" stroke="#E0E0E0"/>')
+    fracs = [min(max(v / f, 0.0), 1.0) for v, f in zip(values, full)]
+    parts.append(f'<polygon points="{polygon(fracs)}" fill="#1E88E5" fill-opacity="0.35" stroke="#1E88E5" stroke-width="2"/>')
+    for label, value, a in zip(labels, values, angles):
+        x, y = point(1.18, a)
+        parts.append(
+            f'<text x="{x:.1f}" y="{y:.1f}" font-size="12" text-anchor="middle" dominant-baseline="middle">'
+            f"{html.escape(label)} {value:g}</text>"
+        )
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def _radar_for(ctx: ReportContext, i: int, size: int = 320) -> str:
+    row = ctx.scores[i]
+    have = ~np.isnan(row)
+    labels = [s.replace("赋分", "") for s, ok in zip(ctx.subjects, have) if ok]
+    if len(labels) < 3:
+        return ""
+    return radar_svg(labels, row[have].tolist(), ctx.full_marks[have].tolist(), size)
+
+
+def render_html(ctx: ReportContext, i: int) -> str:
+    """第 i 名考生的 HTML 报告：与个人成绩查询页相同的成绩卡与雷达图，外加位次和推荐志愿。"""
+    name, exam_id = html.escape(ctx.names[i]), html.escape(ctx.ids[i])
+    rank = f"{ctx.ranks[i]} / {ctx.cohort_size}" if ctx.ranks[i] else "-"
+    score_rows = "".join(
+        f"<tr><td>{html.escape(s.replace('赋分', ''))}</td><td>{_fmt(v)}</td></tr>"
+        for s, v in zip(ctx.subjects, ctx.scores[i])
+        if not np.isnan(v)
+    )
+    radar = _radar_for(ctx, i) or "<p>未检测到该考生完整的主课/选考数据。</p>"
+
+    rec = recommendations(ctx, i)
+    if len(rec):
+        seats_head = "<th>招收人数</th>" if ctx.plan_seats is not None else ""
+        rec_rows = "".join(
+            f"<tr><td>{html.escape(ctx.plan_schools[j])}</td><td>{html.escape(ctx.plan_majors[j])}</td>"
+            + (f"<td>{_fmt(ctx.plan_seats[j])}</td>" if ctx.plan_seats is not None else "")
+            + f"<td>{_fmt(ctx.plan_lines[j])}</td></tr>"
+            for j in rec
+        )
+        rec_html = (
+            f"<table><tr><th>院校名称</th><th>专业名称</th>{seats_head}<th>最低投档分</th></tr>{rec_rows}</table>"
+        )
+    else:
+        rec_html = "<p>没有分数线落在推荐区间内的专业。</p>"
+
+    return f"""<!DOCTYPE html>
+<html lang="zh-CN"><head><meta charset="utf-8"><title>{name} - {html.escape(ctx.title)}</title>
+<style>
+body {{ font-family: 'Microsoft YaHei', 'Helvetica Neue', Arial, sans-serif; margin: 32px; color: #333; }}
+h1 {{ color: #1E88E5; }}
+.row {{ display: flex; gap: 32px; align-items: flex-start; }}
+.card {{ background-color: #E3F2FD; padding: 20px; border-radius: 10px; min-width: 240px; }}
+.card h2 {{ color: #1565C0; margin: 0 0 12px; }}
+table {{ border-collapse: collapse; margin-top: 8px; }}
+td, th {{ border: 1px solid #DDD; padding: 4px 10px; text-align: left; }}
+th {{ background-color: #F5F5F5; }}
+@media print {{ body {{ margin: 12mm; }} }}
+</style></head><body>
+<h1>{html.escape(ctx.title)}</h1>
+<div class="row">
+<div class="card">
+<h2>{_fmt(ctx.totals[i])} <span style="font-size: 16px; color: #555;">分</span></h2>
+<p><strong>姓名:</strong> {name}</p>
+<p><strong>准考证号:</strong> {exam_id}</p>
+<p><strong>位次:</strong> {rank}</p>
+<table><tr><th>科目</th><th>分数</th></tr>{score_rows}</table>
+</div>
+<div>{radar}</div>
+</div>
+<h3>推荐志愿（分数线 {_fmt(ctx.totals[i] - ctx.below)} - {_fmt(ctx.totals[i] + ctx.above)} 分，模拟数据，仅供参考）</h3>
+{rec_html}
+</body></html>
+"""
+
+
+def render_svg(ctx: ReportContext, i: int) -> str:
+    """第 i 名考生的单页 SVG 图片报告，内容与 HTML 报告相同。"""
+    width = 720
+    rec = recommendations(ctx, i)
+    height = 440 + 24 * max(len(rec), 1)
+    font = "font-family=\"'Microsoft YaHei', Arial, sans-serif\""
+    text = []
+
+    def line(x: float, y: float, content: str, size: int = 14, color: str = "#333", weight: str = "normal") -> None:
+        text.append(
+            f'<text x="{x}" y="{y}" font-size="{size}" fill="{color}" font-weight="{weight}">{html.escape(content)}</text>'
+        )
+
+    line(32, 48, ctx.title, 24, "#1E88E5", "bold")
+    text.append('<rect x="32" y="72" width="280" height="300" rx="10" fill="#E3F2FD"/>')
+    line(52, 116, f"{_fmt(ctx.totals[i])} 分", 28, "#1565C0", "bold")
+    line(52, 150, f"姓名: {ctx.names[i]}")
+    line(52, 174, f"准考证号: {ctx.ids[i]}")
+    line(52, 198, f"位次: {ctx.ranks[i]} / {ctx.cohort_size}" if ctx.ranks[i] else "位次: -")
+    y = 230
+    for s, v in zip(ctx.subjects, ctx.scores[i]):
+        if not np.isnan(v):
+            line(52, y, f"{s.replace('赋分', '')}: {v:g}", 13)
+            y += 20
+
+    radar = _radar_for(ctx, i, size=340)
+    if radar:
+        text.append(f'<g transform="translate(350, 52)">{radar}</g>')
+
+    line(32, 416, f"推荐志愿（分数线 {_fmt(ctx.totals[i] - ctx.below)} - {_fmt(ctx.totals[i] + ctx.above)} 分）", 16, "#424242", "bold")
+    y = 444
+    for j in rec:
+        line(32, y, f"{ctx.plan_schools[j]}  {ctx.plan_majors[j]}  {_fmt(ctx.plan_lines[j])} 分", 13)
+        y += 24
+    if not len(rec):
+        line(32, y, "没有分数线落在推荐区间内的专业。", 13)
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" {font}>'
+        f'<rect width="100%" height="100%" fill="white"/>{"".join(text)}</svg>\n'
+    )
+
+
+def file_name(ctx: ReportContext, i: int, fmt: str) -> str:
+    return _UNSAFE_NAME.sub("_", f"{ctx.ids[i]}_{ctx.names[i]}") + f".{fmt}"
+
+
+def render_rows(ctx: ReportContext, start: int, stop: int, fmt: str) -> List["ZipEntry"]:
+    """渲染并压缩第 start..stop-1 名考生的报告。"""
+    render = render_svg if fmt == "svg" else render_html
+    return [deflate_entry(file_name(ctx, i, fmt), render(ctx, i).encode("utf-8")) for i in range(start, stop)]
+
+
+# --- 流式 zip ---------------------------------------------------------------
+
+@dataclass
+class ZipEntry:
+    """已压缩（raw deflate）的 zip 条目，可在工作进程中生成后交给 ZipStream 写出。"""
+
+    name: str
+    data: bytes
+    crc: int
+    size: int
+
+
+def deflate_entry(name: str, raw: bytes, level: int = ZIP_LEVEL) -> ZipEntry:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return ZipEntry(name, compressor.compress(raw) + compressor.flush(), zlib.crc32(raw), len(raw))
+
+
+_U16 = 0xFFFF
+_U32 = 0xFFFFFFFF
+
+
+class ZipStream:
+    """只顺序写的 zip 写出器：条目由调用方预先压缩，本身只拼接文件头与数据。
+
+    不需要 seek，可写入管道或 HTTP 响应；条目数或偏移超出 zip 格式上限时自动写 zip64 记录。
+    """
+
+    def __init__(self, out: BinaryIO) -> None:
+        self._out = out
+        self._offset = 0
+        self._central: List[bytes] = []
+        t = time.localtime()
+        self._dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+        self._dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+    def _write(self, data: bytes) -> None:
+        self._out.write(data)
+        self._offset += len(data)
+
+    def write(self, entry: ZipEntry) -> None:
+        name = entry.name.encode("utf-8")
+        # 通用标志位 0x0800：文件名为 UTF-8；压缩方式 8：deflate
+        common = struct.pack(
+            "<HHHHIII", 0x0800, 8, self._dos_time, self._dos_date, entry.crc, len(entry.data), entry.size,
+        )
+        header_offset = self._offset
+        self._write(struct.pack("<IH", 0x04034B50, 20) + common + struct.pack("<HH", len(name), 0) + name)
+        self._write(entry.data)
+
+        extra = b""
+        if header_offset >= _U32:
+            extra = struct.pack("<HHQ", 0x0001, 8, header_offset)
+        self._central.append(
+            struct.pack("<IHH", 0x02014B50, 45 if extra else 20, 45 if extra else 20)
+            + common
+            + struct.pack("<HHHHHII", len(name), len(extra), 0, 0, 0, 0, min(header_offset, _U32))
+            + name
+            + extra
+        )
+
+    def writestr(self, name: str, raw: bytes) -> None:
+        self.write(deflate_entry(name, raw))
+
+    def close(self) -> None:
+        """写出中央目录；不关闭输出文件。"""
+        cd_offset = self._offset
+        for record in self._central:
+            self._write(record)
+        cd_size = self._offset - cd_offset
+        count = len(self._central)
+        if count >= _U16 or cd_offset >= _U32 or cd_size >= _U32:
+            zip64_offset = self._offset
+            self._write(struct.pack("<IQHHIIQQQQ", 0x06064B50, 44, 45, 45, 0, 0, count, count, cd_size, cd_offset))
+            self._write(struct.pack("<IIQI", 0x07064B50, 0, zip64_offset, 1))
+        self._write(struct.pack(
+            "<IHHHHIIH", 0x06054B50, 0, 0, min(count, _U16), min(count, _U16),
+            min(cd_size, _U32), min(cd_offset, _U32), 0,
+        ))
+
+
+# --- 进程池 -----------------------------------------------------------------
+
+# 工作进程中的只读数据，由 _init_worker 设置
+_CONTEXT: Optional[ReportContext] = None
+
+
+def _init_worker(ctx: ReportContext) -> None:
+    global _CONTEXT
+    _CONTEXT = ctx
+
+
+def _render_chunk(start: int, stop: int, fmt: str) -> List[ZipEntry]:
+    return render_rows(_CONTEXT, start, stop, fmt)
+
+
+def default_workers(n: int, chunk_size: int = REPORT_CHUNK) -> int:
+    return max(1, min(os.cpu_count() or 1, math.ceil(n / chunk_size)))
+
+
+def _index_csv(ctx: ReportContext, fmt: str) -> bytes:
+    df = pd.DataFrame({
+        "准考证号": ctx.ids,
+        "姓名": ctx.names,
+        "总成绩": ctx.totals,
+        "位次": pd.array(np.where(ctx.ranks > 0, ctx.ranks, np.nan), dtype="Int64"),
+        "文件": [file_name(ctx, i, fmt) for i in range(len(ctx))],
+    })
+    return b"\xef\xbb\xbf" + df.to_csv(index=False).encode("utf-8")
+
+
+def generate_reports(
+    ctx: ReportContext,
+    out: Union[str, BinaryIO],
+    fmt: str = "html",
+    workers: Optional[int] = None,
+    chunk_size: int = REPORT_CHUNK,
+    progress: Optional[ProgressFn] = None,
+    start_method: Optional[str] = None,
+) -> ReportSummary:
+    """为 ctx 中的全部考生生成报告，写入 zip（路径或可写二进制文件对象）。
+
+    workers=1 时在当前进程内生成；start_method 为多进程启动方式（None 为平台默认）。
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"未知的报告格式: {fmt}")
+    if chunk_size < 1:
+        raise ValueError("每块考生数至少为 1")
+    if isinstance(out, str):
+        with open(out, "wb") as f:
+            return generate_reports(ctx, f, fmt, workers, chunk_size, progress, start_method)
+
+    start_time = time.perf_counter()
+    n = len(ctx)
+    chunks = [(s, min(s + chunk_size, n)) for s in range(0, n, chunk_size)]
+    workers = default_workers(n, chunk_size) if workers is None else max(1, min(workers, len(chunks) or 1))
+
+    zf = ZipStream(out)
+    done = 0
+
+    def write(entries: List[ZipEntry]) -> None:
+        nonlocal done
+        for entry in entries:
+            zf.write(entry)
+        done += len(entries)
+        if progress is not None:
+            progress(done / n, f"已生成 {done}/{n} 份报告")
+
+    if workers == 1:
+        for s, e in chunks:
+            write(render_rows(ctx, s, e, fmt))
+    else:
+        mp_context = get_context(start_method) if start_method else None
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=mp_context, initializer=_init_worker, initargs=(ctx,),
+        ) as pool:
+            # 按块顺序写入；在途块数有上限，已生成未写入的报告不会无限堆积
+            pending: Deque[Future] = deque()
+            for s, e in chunks:
+                pending.append(pool.submit(_render_chunk, s, e, fmt))
+                if len(pending) >= workers * PENDING_PER_WORKER:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+
+    zf.writestr(INDEX_FILE, _index_csv(ctx, fmt))
+    zf.close()
+    return ReportSummary(count=n, workers=workers, seconds=time.perf_counter() - start_time)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class ReportArchive:
+    """临时文件中的报告压缩包。close() 或对象被回收（如会话结束、进程退出）时删除文件。"""
+
+    def __init__(self, path: str, summary: ReportSummary) -> None:
+        self.path = path
+        self.summary = summary
+        self._finalizer = weakref.finalize(self, _remove_quietly, path)
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def read_bytes(self) -> bytes:
+        return Path(self.path).read_bytes()
+
+    def close(self) -> None:
+        self._finalizer()
+
+
+def generate_archive(ctx: ReportContext, fmt: str = "html", **kwargs: Any) -> ReportArchive:
+    """生成报告到临时 zip 文件；参数同 generate_reports。"""
+    fd, path = tempfile.mkstemp(prefix="gaokao_reports_", suffix=".zip")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            summary = generate_reports(ctx, f, fmt=fmt, **kwargs)
+    except BaseException:
+        _remove_quietly(path)
+        raise
+    return ReportArchive(path, summary)
+
+
+def select_cohort(
+    df_score: pd.DataFrame,
+    classes: Optional[Sequence[str]] = None,
+    ids: Optional[Sequence[str]] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+) -> pd.DataFrame:
+    """按班级、准考证号名单与总分区间筛选考生；条件为空时不筛选。"""
+    mask = pd.Series(True, index=df_score.index)
+    if classes:
+        if "班级" not in df_score.columns:
+            raise ValueError("成绩数据中没有 '班级' 列，无法按班级筛选")
+        mask &= df_score["班级"].astype(str).isin([str(c) for c in classes])
+    if ids:
+        mask &= df_score["准考证号"].astype(str).isin([str(i) for i in ids])
+    totals = pd.to_numeric(df_score["总成绩"], errors="coerce")
+    if min_score is not None:
+        mask &= totals >= min_score
+    if max_score is not None:
+        mask &= totals <= max_score
+    return df_score[mask]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="批量生成考生成绩报告（zip）")
+    parser.add_argument("--out", required=True, help="输出 zip 文件")
+    parser.add_argument("--data-dir", default=default_data_dir(), help="数据目录")
+    parser.add_argument("--format", choices=list(REPORT_FORMATS), default="html", help="报告格式")
+    parser.add_argument("--class", dest="classes", action="append", help="只生成该班级（可重复）")
+    parser.add_argument("--ids", help="准考证号名单文件，每行一个")
+    parser.add_argument("--min-score", type=float, help="总分下限")
+    parser.add_argument("--max-score", type=float, help="总分上限")
+    parser.add_argument("--workers", type=int, help="工作进程数，默认按 CPU 核数")
+    parser.add_argument("--chunk-size", type=int, default=REPORT_CHUNK, help="每块考生数")
+    parser.add_argument("--title", default=DEFAULT_TITLE, help="报告标题")
+    args = parser.parse_args()
+
+    df_score, df_rank, df_plan, _ = load_datasets(args.data_dir)
+    ids = None
+    if args.ids:
+        with open(args.ids, encoding="utf-8-sig") as f:
+            ids = [line.strip() for line in f if line.strip()]
+    cohort = select_cohort(df_score, args.classes, ids, args.min_score, args.max_score)
+    if cohort.empty:
+        raise ValueError("没有符合条件的考生")
+
+    # 位次与看板一致：优先按位次表中的总成绩排位
+    source = df_rank if df_rank is not None and "总成绩" in df_rank.columns else df_score
+    segments = ScoreSegments(pd.to_numeric(source["总成绩"], errors="coerce").to_numpy(dtype=float))
+    ctx = build_context(cohort, df_plan, segments, title=args.title)
+
+    def report(fraction: float, message: str) -> None:
+        print(f"\r{message}", end="", flush=True)
+
+    summary = generate_reports(
+        ctx, args.out, fmt=args.format, workers=args.workers, chunk_size=args.chunk_size, progress=report,
+    )
+    print(
+        f"\n已生成 {summary.count} 份报告（{summary.workers} 个进程，{summary.seconds:.2f}s，"
+        f"{summary.count / max(summary.seconds, 1e-9):.0f} 份/秒）: {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""录取模拟结果缓存：以招生计划/志愿文件内容哈希 + 引擎版本为键。
+
+内存中保留最近的若干组结果（含统计指标），
+磁盘上以 Parquet 保存，跨会话、跨进程复用；磁盘总大小超过上限时
+按最近访问时间淘汰最旧的结果。未安装 pyarrow 时仅使用内存缓存。
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from gaokao.admission import ENGINE_VERSION
+
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+
+DEFAULT_MEMORY_ENTRIES = 4
+DEFAULT_DISK_BYTES = 256 * 1024 * 1024
+
+_digest_memo: Dict[Tuple[str, int, int], str] = {}
+_digest_lock = threading.Lock()
+
+
+def file_digest(path: str) -> str:
+    """文件内容的 sha256；按 (路径, mtime, 大小) 记忆，避免每次重跑都重新读文件。"""
+    st = os.stat(path)
+    memo_key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    with _digest_lock:
+        cached = _digest_memo.get(memo_key)
+    if cached is not None:
+        return cached
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    digest = h.hexdigest()
+    with _digest_lock:
+        _digest_memo[memo_key] = digest
+    return digest
+
+
+def result_key(plan_path: str, vol_path: str, variant: str = "") -> str:
+    """variant 区分同一份数据在不同录取规则/参数下的结果。"""
+    parts = [f"engine={ENGINE_VERSION}", file_digest(plan_path), file_digest(vol_path)]
+    if variant:
+        parts.append(variant)
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+
+
+@dataclass
+class AdmissionResult:
+    df_result: pd.DataFrame
+    stats: Dict[str, int]
+
+    @classmethod
+    def from_frame(cls, df_result: pd.DataFrame) -> "AdmissionResult":
+        total = len(df_result)
+        admitted = int((df_result["录取状态"] == "录取").sum())
+        rejected = int((df_result["录取状态"] == "退档").sum())
+        stats = {"total": total, "admitted": admitted, "failed": total - admitted, "rejected": rejected}
+        return cls(df_result=df_result, stats=stats)
+
+
+class ResultCache:
+    def __init__(
+        self,
+        cache_dir: Optional[str],
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        disk_bytes: int = DEFAULT_DISK_BYTES,
+    ) -> None:
+        self.cache_dir = cache_dir if HAS_PARQUET else None
+        self.memory_entries = memory_entries
+        self.disk_bytes = disk_bytes
+        self._memory: "OrderedDict[str, AdmissionResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def get(self, key: str) -> Optional[AdmissionResult]:
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                return result
+
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            df_result = pd.read_parquet(path)
+            os.utime(path)  # 记录最近访问，供淘汰时参考
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+
+        result = AdmissionResult.from_frame(df_result)
+        self._remember(key, result)
+        return result
+
+    def put(self, key: str, df_result: pd.DataFrame) -> AdmissionResult:
+        result = AdmissionResult.from_frame(df_result)
+        self._remember(key, result)
+        if self.cache_dir:
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            df_result.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+            self._evict_disk()
+        return result
+
+    def _remember(self, key: str, result: AdmissionResult) -> None:
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        entries = []
+        for fn in os.listdir(self.cache_dir):
+            if not fn.endswith(".parquet"):
+                continue
+            path = os.path.join(self.cache_dir, fn)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
@@ -0,0 +1,188 @@
+"""数据访问层：内存 DataFrame 与 SQLite 两种后端，提供相同的查询接口。
+
+SQLite 后端（仅依赖标准库 sqlite3）把成绩、招生计划、志愿三张表导入单个数据库文件，
+并在 准考证号 / 总成绩 / 位次 / (院校名称, 专业名称) / 最低投档分 上建索引，
+点查与区间查询无需把全部数据读进每个进程。
+
+导入：python -m gaokao.storage import [--data-dir data] [--db data/gaokao.sqlite3]
+"""
+
+import argparse
+import os
+import sqlite3
+from contextlib import closing
+from typing import List, Optional
+
+import pandas as pd
+
+from gaokao.data import Datasets, default_data_dir, load_datasets
+from gaokao.query import RECOMMEND_ABOVE, RECOMMEND_BELOW, ScoreIndex, find_students, score_column_of
+
+
+DB_FILENAME = "gaokao.sqlite3"
+IMPORT_CHUNKSIZE = 50_000
+
+SCORES_TABLE = "scores"
+PLAN_TABLE = "plan"
+VOL_TABLE = "volunteers"
+
+INDEXES = [
+    ("idx_scores_id", SCORES_TABLE, ["准考证号"]),
+    ("idx_scores_total", SCORES_TABLE, ["总成绩"]),
+    ("idx_scores_rank", SCORES_TABLE, ["位次"]),
+    ("idx_plan_major", PLAN_TABLE, ["院校名称", "专业名称"]),
+    ("idx_plan_score", PLAN_TABLE, ["最低投档分"]),
+    ("idx_vol_id", VOL_TABLE, ["准考证号"]),
+    ("idx_vol_rank", VOL_TABLE, ["位次"]),
+]
+
+# SQLite 模式下看板首页图表所需的成绩列，其余列按需点查
+CHART_COLUMN_HINTS = ("班级", "语文", "数学", "英语", "赋分", "总成绩")
+
+
+def default_db_path() -> str:
+    return os.path.join(default_data_dir(), DB_FILENAME)
+
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class FrameStore:
+    """基于已加载 DataFrame 的查询（默认 CSV 后端）。"""
+
+    def __init__(self, df_score: pd.DataFrame, df_plan: Optional[pd.DataFrame]) -> None:
+        self.df_score = df_score
+        self.index = ScoreIndex(df_score, df_plan)
+
+    def find_students(self, text: str) -> pd.DataFrame:
+        return find_students(self.df_score, text)
+
+    def rank_for_score(self, score: float) -> int:
+        return self.index.rank_for_score(score)
+
+    def recommend(
+        self,
+        score: float,
+        below: float = RECOMMEND_BELOW,
+        above: float = RECOMMEND_ABOVE,
+    ) -> pd.DataFrame:
+        return self.index.recommend(score, below=below, above=above)
+
+
+class SqliteStore:
+    """基于 SQLite 的查询。每次查询新建只读连接，可在多线程中直接使用。"""
+
+    def __init__(self, db_path: str) -> None:
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"未找到 SQLite 数据库: {db_path}（请先执行 python -m gaokao.storage import）")
+        self.db_path = db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+
+    def _query(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def _columns(self, table: str) -> List[str]:
+        with closing(self._connect()) as conn:
+            return [r[1] for r in conn.execute(f"PRAGMA table_info({_quote(table)})")]
+
+    def has_table(self, table: str) -> bool:
+        return bool(self._columns(table))
+
+    def find_students(self, text: str) -> pd.DataFrame:
+        # 完整准考证号直接走索引；否则退回到与 CSV 后端一致的模糊匹配
+        exact = self._query(f"SELECT * FROM {SCORES_TABLE} WHERE 准考证号 = ?", (text,))
+        if not exact.empty:
+            return exact
+        return self._query(
+            f"SELECT * FROM {SCORES_TABLE} WHERE instr(姓名, ?) > 0 OR instr(准考证号, ?) > 0",
+            (text, text),
+        )
+
+    def rank_for_score(self, score: float) -> int:
+        with closing(self._connect()) as conn:
+            (higher,) = conn.execute(
+                f"SELECT COUNT(*) FROM {SCORES_TABLE} WHERE 总成绩 > ?", (score,)
+            ).fetchone()
+        return int(higher) + 1
+
+    def recommend(
+        self,
+        score: float,
+        below: float = RECOMMEND_BELOW,
+        above: float = RECOMMEND_ABOVE,
+    ) -> pd.DataFrame:
+        # 与 FrameStore 一致：分数线列按 plan_score_column 的规则从招生计划表的实际列中确定
+        score_col = score_column_of(self._columns(PLAN_TABLE))
+        if score_col is None:
+            raise ValueError("在招生计划表中未找到分数线相关列，无法自动推荐。")
+        col = _quote(score_col)
+        # 同分按原表顺序倒序，与 FrameStore（稳定升序后整体反转）一致
+        return self._query(
+            f"SELECT * FROM {PLAN_TABLE} WHERE {col} BETWEEN ? AND ? ORDER BY {col} DESC, rowid DESC",
+            (score - below, score + above),
+        )
+
+    def load_datasets(self) -> Datasets:
+        """看板所需数据：成绩只取图表用到的列，招生计划与志愿整表读取。"""
+        score_cols = [c for c in self._columns(SCORES_TABLE) if any(h in c for h in CHART_COLUMN_HINTS)]
+        df_score = self._query(f"SELECT {', '.join(map(_quote, score_cols))} FROM {SCORES_TABLE}")
+        df_plan = self._query(f"SELECT * FROM {PLAN_TABLE}") if self.has_table(PLAN_TABLE) else None
+        df_vol = self._query(f"SELECT * FROM {VOL_TABLE}") if self.has_table(VOL_TABLE) else None
+        return df_score, None, df_plan, df_vol
+
+
+def import_csvs(base_path: str, db_path: str) -> None:
+    """把 data/ 下的 CSV 导入 SQLite（整库重建），并补充 位次 列与索引。"""
+    df_score, _, df_plan, df_vol = load_datasets(base_path)
+    df_score = df_score.loc[:, [c for c in df_score.columns if not str(c).startswith("Unnamed")]]
+    df_score["位次"] = df_score["总成绩"].rank(method="min", ascending=False).astype("Int64")
+
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        df_score.to_sql(SCORES_TABLE, conn, index=False, chunksize=IMPORT_CHUNKSIZE)
+        if df_plan is not None:
+            df_plan.to_sql(PLAN_TABLE, conn, index=False, chunksize=IMPORT_CHUNKSIZE)
+        if df_vol is not None:
+            df_vol.to_sql(VOL_TABLE, conn, index=False, chunksize=IMPORT_CHUNKSIZE)
+
+        tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        plan_score_col = score_column_of(df_plan.columns) if df_plan is not None else None
+        for name, table, cols in INDEXES:
+            if table not in tables:
+                continue
+            if name == "idx_plan_score" and plan_score_col is not None:
+                cols = [plan_score_col]
+            existing = {r[1] for r in conn.execute(f"PRAGMA table_info({_quote(table)})")}
+            if not set(cols) <= existing:
+                continue
+            conn.execute(f"CREATE INDEX {name} ON {table} ({', '.join(map(_quote, cols))})")
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite 数据后端")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_import = sub.add_parser("import", help="把 CSV 导入 SQLite 并建立索引")
+    p_import.add_argument("--data-dir", default=default_data_dir(), help="CSV 数据目录")
+    p_import.add_argument("--db", default=default_db_path(), help="SQLite 数据库路径")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        import_csvs(args.data_dir, args.db)
+        print(f"已导入: {args.db}")
+
+
+if __name__ == "__main__":
+    main()
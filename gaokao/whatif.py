@@ -0,0 +1,121 @@
+"""“如果多考几分”推演：用上一次模拟录取的各专业录取位次，判断新位次能否被录取。
+
+不重新模拟：每个专业录取考生的位次按 (专业 id, 位次) 排好序，
+新位次在该专业中排第几通过二分查找得到，排名在招收人数以内即可录取。
+这里忽略该考生位次变化对其他考生去向的连锁影响。
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from gaokao.choices import PAD, UNKNOWN, ChoiceMatrix
+
+
+@dataclass
+class CutoffTable:
+    keys: np.ndarray  # 按 (专业 id, 位次) 排序后的 专业 id * scale + 位次
+    seats: np.ndarray  # 各专业招收人数
+    scale: float
+    admitted_pair: dict  # 准考证号 → 模拟中录取的专业 id
+    admitted_rank: dict  # 准考证号 → 模拟时使用的位次
+
+    @classmethod
+    def from_result(cls, choices: ChoiceMatrix, df_result: pd.DataFrame) -> "CutoffTable":
+        """由录取结果表（simulate_admission 的输出）构建。"""
+        plan = choices.plan
+        admitted = df_result[df_result["录取状态"] == "录取"]
+        pair_ids = plan.encode(admitted["录取院校"], admitted["录取专业"]).astype(np.int64)
+        ranks = pd.to_numeric(admitted["位次"], errors="coerce").to_numpy(dtype=float)
+        ok = (pair_ids >= 0) & ~np.isnan(ranks)
+
+        scale = float(np.nanmax(ranks[ok])) + 2 if ok.any() else 2.0
+        keys = np.sort(pair_ids[ok] * scale + ranks[ok])
+        ids = admitted["准考证号"].astype(str).to_numpy()[ok]
+        return cls(
+            keys=keys,
+            seats=plan.seats,
+            scale=scale,
+            admitted_pair=dict(zip(ids, pair_ids[ok].tolist())),
+            admitted_rank=dict(zip(ids, ranks[ok].tolist())),
+        )
+
+    def better_count(self, pair_ids: np.ndarray, rank: float) -> np.ndarray:
+        """各专业中录取位次严格优于 rank 的人数。"""
+        pair_ids = np.asarray(pair_ids, dtype=np.int64)
+        rank = min(float(rank), self.scale - 1)
+        lo = np.searchsorted(self.keys, pair_ids * self.scale, side="left")
+        hi = np.searchsorted(self.keys, pair_ids * self.scale + rank, side="left")
+        return hi - lo
+
+    def cutoff_ranks(self, pair_ids: np.ndarray) -> np.ndarray:
+        """各专业的录取位次线（录取的最后一名）；未录满的专业为 NaN。"""
+        pair_ids = np.asarray(pair_ids, dtype=np.int64)
+        lo = np.searchsorted(self.keys, pair_ids * self.scale, side="left")
+        hi = np.searchsorted(self.keys, (pair_ids + 1) * self.scale, side="left")
+        filled = hi - lo
+        full = (filled > 0) & (filled >= self.seats[pair_ids])
+        last = self.keys[np.maximum(hi - 1, 0)] - pair_ids * self.scale if len(self.keys) else np.zeros(len(pair_ids))
+        return np.where(full, last, np.nan)
+
+
+def what_if(
+    choices: ChoiceMatrix,
+    cutoffs: CutoffTable,
+    exam_id: str,
+    new_rank: float,
+) -> Optional[pd.DataFrame]:
+    """逐个志愿判断新位次能否录取；返回 None 表示该考生不在志愿数据中。"""
+    row = choices.row_of(exam_id)
+    if row is None:
+        return None
+
+    prefs = choices.matrix[row]
+    plan = choices.plan
+    exam_id = str(exam_id)
+    own_pair = cutoffs.admitted_pair.get(exam_id)
+    own_rank = cutoffs.admitted_rank.get(exam_id)
+
+    records: List[dict] = []
+    valid = prefs >= 0
+    counts = np.zeros(len(prefs), dtype=np.int64)
+    cut_ranks = np.full(len(prefs), np.nan)
+    if valid.any():
+        counts[valid] = cutoffs.better_count(prefs[valid], new_rank)
+        cut_ranks[valid] = cutoffs.cutoff_ranks(prefs[valid])
+
+    predicted = None
+    for k, pid in enumerate(prefs.tolist()):
+        if pid == PAD:
+            continue
+        if pid == UNKNOWN:
+            records.append({"志愿": k + 1, "院校": None, "专业": None, "录取位次线": None, "结果": "不在招生计划"})
+            continue
+
+        better = int(counts[k])
+        # 本人在模拟中已被该专业录取时，不把自己算作竞争者
+        if pid == own_pair and own_rank is not None and own_rank < new_rank:
+            better -= 1
+        seats = int(cutoffs.seats[pid])
+        can_admit = better < seats
+
+        cutoff_rank = None if np.isnan(cut_ranks[k]) else int(cut_ranks[k])
+
+        if can_admit and predicted is None:
+            predicted = k
+        school, major = plan.pair(pid)
+        records.append({
+            "志愿": k + 1,
+            "院校": school,
+            "专业": major,
+            "录取位次线": cutoff_rank,
+            "结果": "可录取" if can_admit else "不可录取",
+        })
+
+    df = pd.DataFrame(records, columns=["志愿", "院校", "专业", "录取位次线", "结果"])
+    if predicted is not None:
+        # 平行志愿：按顺序检索，第一个可录取的志愿即为投档结果
+        df.loc[df["志愿"] == predicted + 1, "结果"] = "✅ 投档"
+    return df
@@ -0,0 +1,108 @@
+"""把一批迟到/改分的成绩并入数据目录，增量更新赋分、总成绩与位次。
+
+批次中准考证号已存在的行视为改分，其余为新增考生。默认按规则重算赋分，等级边界移动的
+科目整科重算，写入前打印批次以外赋分变化的人数；--keep-published 时已公布的赋分不变，
+只为批次考生赋分，等级边界移动的科目会给出警告。已有考生都不受影响时，成绩文件直接在
+末尾追加新行。
+
+注意：本脚本每次运行都要读入整个成绩文件、重新构建 ScoreBook（全量排序与赋分）并重写
+位次文件，耗时与全量重算相当，并不比重算更快；“追加只需重算的百分之几”只对常驻内存、
+连续追加多个批次的 ScoreBook 成立。脚本的作用是正确地并入批次（改分、位次、一分一段表）。
+
+用法：
+    python scripts/append_scores.py --batch 新批次.csv
+    python scripts/append_scores.py --batch 新批次.csv --data-dir data --no-rank-file
+    python scripts/append_scores.py --batch 新批次.csv --keep-published
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gaokao.data import RANK_FILE, default_data_dir, find_score_file  # noqa: E402
+from gaokao.export import export_file  # noqa: E402
+from gaokao.incremental import ScoreBook  # noqa: E402
+
+
+def _read_table(path: str) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def _changed_mask(a: pd.DataFrame, b: pd.DataFrame, cols) -> np.ndarray:
+    """两表（行对齐）中任一列取值不同的行。"""
+    changed = np.zeros(len(b), dtype=bool)
+    for c in cols:
+        x = pd.to_numeric(a[c], errors="coerce").to_numpy(dtype=float)
+        y = pd.to_numeric(b[c], errors="coerce").to_numpy(dtype=float)
+        changed |= ~((x == y) | (np.isnan(x) & np.isnan(y)))
+    return changed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="增量追加成绩批次")
+    parser.add_argument("--batch", required=True, help="成绩批次（.csv 或 .parquet），列与成绩文件一致")
+    parser.add_argument("--data-dir", default=default_data_dir(), help="数据目录")
+    parser.add_argument(
+        "--keep-published", action="store_true", help="不改写已有考生的赋分，只为批次考生赋分",
+    )
+    parser.add_argument("--no-rank-file", action="store_true", help=f"不重新生成 {RANK_FILE}")
+    args = parser.parse_args()
+
+    score_path = find_score_file(args.data_dir)
+    if score_path is None:
+        raise FileNotFoundError(f"数据目录中未找到成绩文件: {args.data_dir}")
+
+    start = time.perf_counter()
+    df_score = pd.read_csv(score_path)
+    book = ScoreBook(df_score.drop(columns=["总成绩"], errors="ignore"), regrade=not args.keep_published)
+    fufen_cols = [s.fufen_col for s in book.subjects.values() if s.fufen_col in df_score.columns]
+    loaded = time.perf_counter()
+
+    batch = _read_table(args.batch)
+    report = book.append(batch)
+    print(
+        f"新增 {report.added} 人，改分 {report.updated} 人；"
+        f"整科重算: {'、'.join(report.regraded) or '无'}；"
+        f"批次以外受影响 {report.changed_rows} 人；追加耗时 {report.seconds:.3f}s"
+    )
+    if report.stale:
+        print(
+            f"警告：{'、'.join(report.stale)} 的等级边界已移动但未重算，"
+            "批次考生与已有考生按不同的等级边界赋分；去掉 --keep-published 可整科重算"
+        )
+
+    # 与原文件比较（含构建时按规则重算带来的变化），改分考生本身不计
+    existing = book.df.iloc[:len(df_score)]
+    in_batch = existing["准考证号"].astype(str).isin(batch["准考证号"].astype(str)).to_numpy()
+    changed = _changed_mask(existing, df_score, fufen_cols) & ~in_batch
+    print(f"批次以外已有考生赋分变化 {int(changed.sum())} 人")
+
+    out = book.df.drop(columns=["总成绩"])
+    if report.updated == 0 and not changed.any() and list(out.columns) == list(df_score.columns):
+        # 已有行不变且列与文件表头一致：只在文件末尾追加新行
+        new_rows = out.iloc[len(df_score):]
+        new_rows.to_csv(score_path, mode="a", header=False, index=False, encoding="utf-8")
+        print(f"已追加 {len(new_rows)} 行: {score_path}")
+    else:
+        export_file(out, score_path)
+        print(f"已重写成绩文件: {score_path}")
+
+    if not args.no_rank_file:
+        rank_path = str(Path(args.data_dir) / RANK_FILE)
+        export_file(book.rank_table(), rank_path)
+        print(f"已更新位次文件: {rank_path}")
+
+    # 建索引即一次全量重算，单次运行的总耗时不低于重算
+    print(f"读取与建索引 {loaded - start:.3f}s，总耗时 {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""分阶段性能基准：在固定随机种子生成的合成数据上计时各核心入口，并与基线比较。
+
+阶段：
+    load_data       gaokao.data.load_datasets（读 CSV + 计算总成绩）
+    grade_score     scripts/apply_zhejiang_fufen.py 的 zhejiang_grade_score
+    enforce_rules   scripts/enforce_exam_rules.py 的 enforce_rules
+    tab3_filter     gaokao.query.recommend（志愿推荐筛选）
+    admission       gaokao.admission.simulate_admission（录取模拟）
+    admission_rounds  同上，多轮规则（退档/调剂，一半考生服从调剂）
+    batch_reports   gaokao.reports.generate_reports（从全体考生中取 2000 人生成 HTML 报告 zip，默认进程数）
+
+每个 (阶段, 规模) 在独立子进程中运行，记录多次运行中的最短耗时、进程峰值内存（RSS），
+以及阶段本身带来的峰值内存增量（不含生成合成数据与导入模块）；内存按后者与基线比较。
+完全离线，只依赖 numpy/pandas 与标准库。
+
+用法：
+    python scripts/bench_stages.py                        # 10k/100k/1m，与基线比较
+    python scripts/bench_stages.py --sizes 10k,100k --tolerance 0.3
+    python scripts/bench_stages.py --update-baseline      # 以本次结果覆盖基线
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+BASE = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE))
+
+from gaokao.admission import MODE_ROUNDS, simulate_admission  # noqa: E402
+from gaokao.data import PLAN_FILE, SCORE_FILES, VOL_FILE, compute_total_score, load_datasets  # noqa: E402
+from gaokao.query import ScoreSegments, recommend  # noqa: E402
+from gaokao.reports import build_context, generate_reports  # noqa: E402
+
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "bench_baseline.json"
+DEFAULT_SIZES = "10k,100k,1m"
+STAGES = ["load_data", "grade_score", "enforce_rules", "tab3_filter", "admission", "admission_rounds", "batch_reports"]
+SEED = 20250607
+# batch_reports 阶段的报告人数（一所学校的规模）
+REPORT_COHORT = 2000
+# 阶段内存比较的绝对余量（MB）
+RSS_SLACK_MB = 16
+
+SUBJECTS = ["历史", "地理", "政治", "物理", "化学", "生物", "技术"]
+N_SCHOOLS = 40
+MAJORS_PER_SCHOOL = 12
+
+
+def _load_script(name: str):
+    spec = importlib.util.spec_from_file_location(name, BASE / "scripts" / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+# --- 合成数据 ---------------------------------------------------------------
+
+def synth_scores(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    ability = rng.normal(0, 1, n)
+    df = pd.DataFrame({
+        "准考证号": [f"KS{i:07d}" for i in range(1, n + 1)],
+        "姓名": [f"考生{i}" for i in range(1, n + 1)],
+    })
+    for c in ["语文", "数学", "英语"]:
+        df[c] = np.clip(np.round(100 + 18 * ability + rng.normal(0, 12, n)), 0, 150).astype(int)
+
+    # 每人随机选 3 门选考
+    chosen = np.argsort(rng.random((n, len(SUBJECTS))), axis=1)[:, :3]
+    picked = np.zeros((n, len(SUBJECTS)), dtype=bool)
+    picked[np.arange(n)[:, None], chosen] = True
+    for j, subj in enumerate(SUBJECTS):
+        raw = np.clip(np.round(65 + 12 * ability + rng.normal(0, 10, n)), 0, 100)
+        raw = np.where(picked[:, j], raw, np.nan)
+        df[f"{subj}原始"] = raw
+        df[f"{subj}赋分"] = np.where(picked[:, j], np.clip(np.round(raw * 0.6 + 40), 40, 100), np.nan)
+    return df
+
+
+def synth_plan(n_students: int, rng: np.random.Generator) -> pd.DataFrame:
+    rows = []
+    n_majors = N_SCHOOLS * MAJORS_PER_SCHOOL
+    seats = np.maximum(1, rng.poisson(max(n_students * 0.7 / n_majors, 1), n_majors))
+    k = 0
+    for s in range(N_SCHOOLS):
+        for m in range(MAJORS_PER_SCHOOL):
+            rows.append({
+                "院校代码": 100001 + s,
+                "院校名称": f"院校{s:03d}",
+                "专业代码": 200001 + k,
+                "专业名称": f"专业{m:02d}",
+                "招收人数": int(seats[k]),
+                "最低投档分": float(rng.integers(450, 700)),
+            })
+            k += 1
+    return pd.DataFrame(rows)
+
+
+def synth_volunteers(n: int, df_plan: pd.DataFrame, rng: np.random.Generator) -> pd.DataFrame:
+    df = pd.DataFrame({
+        "位次": np.arange(1, n + 1),
+        "准考证号": [f"KS{i:07d}" for i in range(1, n + 1)],
+        "姓名": [f"考生{i}" for i in range(1, n + 1)],
+    })
+    schools = df_plan["院校名称"].to_numpy()
+    majors = df_plan["专业名称"].to_numpy()
+    for i in range(1, 7):
+        pick = rng.integers(0, len(df_plan), n)
+        df[f"报考院校{i}"] = schools[pick]
+        df[f"报考专业{i}"] = majors[pick]
+    return df
+
+
+# --- 各阶段 -----------------------------------------------------------------
+
+def setup_stage(stage: str, n: int, workdir: str):
+    """准备输入（不计时），返回无参可调用对象。"""
+    rng = np.random.default_rng(SEED)
+    if stage == "load_data":
+        synth_scores(n, rng).to_csv(os.path.join(workdir, SCORE_FILES[0]), index=False)
+        df_plan = synth_plan(n, rng)
+        df_plan.to_csv(os.path.join(workdir, PLAN_FILE), index=False)
+        synth_volunteers(n, df_plan, rng).to_csv(os.path.join(workdir, VOL_FILE), index=False)
+        return lambda: load_datasets(workdir)
+    if stage == "grade_score":
+        zhejiang_grade_score = _load_script("apply_zhejiang_fufen").zhejiang_grade_score
+        raw = synth_scores(n, rng)["物理原始"]
+        return lambda: zhejiang_grade_score(raw)
+    if stage == "enforce_rules":
+        enforce_rules = _load_script("enforce_exam_rules").enforce_rules
+        df = synth_scores(n, rng)
+        return lambda: enforce_rules(df)
+    if stage == "tab3_filter":
+        df_plan = synth_plan(n, rng)
+        # 推荐筛选本身只依赖招生计划，按考生规模放大计划表以体现扩展性
+        df_plan = pd.concat([df_plan] * max(1, n // len(df_plan) // 10), ignore_index=True)
+        return lambda: [recommend(df_plan, s) for s in (520, 580, 640)]
+    if stage == "admission":
+        df_plan = synth_plan(n, rng)
+        df_vol = synth_volunteers(n, df_plan, rng)
+        return lambda: simulate_admission(df_plan, df_vol)
+    if stage == "admission_rounds":
+        df_plan = synth_plan(n, rng)
+        df_vol = synth_volunteers(n, df_plan, rng)
+        df_vol["服从调剂"] = np.where(rng.random(n) < 0.5, "是", "否")
+        return lambda: simulate_admission(df_plan, df_vol, mode=MODE_ROUNDS)
+    if stage == "batch_reports":
+        df_score = synth_scores(n, rng)
+        df_score["总成绩"] = compute_total_score(df_score)
+        segments = ScoreSegments(df_score["总成绩"].to_numpy(dtype=float))
+        ctx = build_context(df_score.sample(min(n, REPORT_COHORT), random_state=SEED), synth_plan(n, rng), segments)
+
+        def run():
+            with open(os.devnull, "wb") as out:
+                generate_reports(ctx, out)
+        return run
+    raise ValueError(f"未知阶段: {stage}")
+
+
+def run_child(stage: str, n: int, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        fn = setup_stage(stage, n, workdir)
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 上 ru_maxrss 单位为 KB
+    return {
+        "seconds": round(min(timings), 4),
+        "peak_rss_mb": round(rss_after / 1024, 1),
+        "stage_rss_mb": round(max(rss_after - rss_before, 0) / 1024, 1),
+    }
+
+
+def run_stage(stage: str, n: int, repeat: int) -> dict:
+    proc = subprocess.run(
+        [sys.executable, __file__, "--child", stage, str(n), "--repeat", str(repeat)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+# --- 基线比较 ---------------------------------------------------------------
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """返回超出容差的 (键, 指标, 基线值, 本次值) 列表。"""
+    regressions = []
+    for key, cur in results.items():
+        ref = baseline.get("results", {}).get(key)
+        if ref is None:
+            continue
+        if cur["seconds"] > ref["seconds"] * (1 + tolerance):
+            regressions.append((key, "seconds", ref["seconds"], cur["seconds"]))
+        # 阶段内存增量可能接近 0，另加绝对余量，避免几 MB 的分配抖动被判为退化
+        if cur["stage_rss_mb"] > ref["stage_rss_mb"] * (1 + tolerance) + RSS_SLACK_MB:
+            regressions.append((key, "stage_rss_mb", ref["stage_rss_mb"], cur["stage_rss_mb"]))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="分阶段性能基准")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="数据规模，逗号分隔，如 10k,100k,1m")
+    parser.add_argument("--stages", default=",".join(STAGES), help="要运行的阶段，逗号分隔")
+    parser.add_argument("--repeat", type=int, default=3, help="每个阶段的重复次数（取最短）")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="基线 JSON 路径")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="允许的相对退化，0.25 即 25%%")
+    parser.add_argument("--update-baseline", action="store_true", help="用本次结果覆盖基线")
+    parser.add_argument("--child", nargs=2, metavar=("STAGE", "N"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        stage, n = args.child
+        print(json.dumps(run_child(stage, int(n), args.repeat)))
+        return
+
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+
+    results = {}
+    print(f"{'阶段@规模':<24}{'耗时(s)':>10}{'峰值RSS(MB)':>14}{'阶段RSS(MB)':>14}")
+    for stage in stages:
+        for n in sizes:
+            key = f"{stage}@{n}"
+            results[key] = run_stage(stage, n, args.repeat)
+            r = results[key]
+            print(f"{key:<24}{r['seconds']:>10.3f}{r['peak_rss_mb']:>14.1f}{r['stage_rss_mb']:>14.1f}")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        payload = {
+            "meta": {
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "cpus": os.cpu_count(),
+                "seed": SEED,
+            },
+            "results": results,
+        }
+        if baseline_path.exists():
+            # 只覆盖本次运行过的条目，保留其它规模/阶段的基线
+            old = json.loads(baseline_path.read_text(encoding="utf-8"))
+            payload["results"] = {**old.get("results", {}), **results}
+        baseline_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"基线已写入: {baseline_path}")
+        return
+
+    if not baseline_path.exists():
+        print(f"未找到基线 {baseline_path}，请先使用 --update-baseline 生成", file=sys.stderr)
+        return
+
+    regressions = compare(results, json.loads(baseline_path.read_text(encoding="utf-8")), args.tolerance)
+    for key, metric, ref, cur in regressions:
+        print(f"退化: {key} {metric} 基线 {ref} → 本次 {cur}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+    print(f"全部阶段均在容差 {args.tolerance:.0%} 内")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""冷启动基准：在全新 Python 进程中执行一次 app.py，检查首屏耗时是否超出预算。
+
+每轮启动一个子进程，用 streamlit.testing 的 AppTest 以“新会话”方式执行 app.py，
+并开启 GAOKAO_PROFILE_STARTUP 记录各阶段耗时。first_paint 为脚本开始到标题区域
+发出的耗时，对应新会话的首字节时间；超出 --budget-ms 时以非零状态退出。
+
+用法：python scripts/bench_startup.py --runs 5 --budget-ms 1500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+BASE = Path(__file__).resolve().parent.parent
+APP_PATH = BASE / "app.py"
+
+_CHILD = """
+import sys
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=300).run()
+if at.exception:
+    print(at.exception, file=sys.stderr)
+    sys.exit(1)
+"""
+
+
+def run_once() -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "profile.json")
+        env = dict(os.environ, GAOKAO_PROFILE_STARTUP="1", GAOKAO_PROFILE_OUTPUT=out)
+        subprocess.run(
+            [sys.executable, "-c", _CHILD, str(APP_PATH)],
+            env=env,
+            check=True,
+            capture_output=True,
+        )
+        with open(out, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="app.py 冷启动基准")
+    parser.add_argument("--runs", type=int, default=5, help="启动次数")
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="first_paint 中位数预算（毫秒）")
+    args = parser.parse_args()
+
+    results = [run_once() for _ in range(args.runs)]
+
+    marks = sorted({name for r in results for name in r["marks"]}, key=lambda n: results[0]["marks"].get(n, 0))
+    print(f"{'阶段':<16}{'中位数(ms)':>12}{'最大(ms)':>12}")
+    for name in marks:
+        values = [r["marks"][name] for r in results if name in r["marks"]]
+        print(f"{name:<16}{statistics.median(values):>12.1f}{max(values):>12.1f}")
+
+    sections = {}
+    for r in results:
+        for sec in r["sections"]:
+            sections.setdefault(sec["name"], []).append(sec["ms"])
+    for name, values in sections.items():
+        print(f"{name:<16}{statistics.median(values):>12.1f}{max(values):>12.1f}")
+
+    first_paint = statistics.median(r["marks"]["first_paint"] for r in results)
+    if first_paint > args.budget_ms:
+        print(f"首屏耗时 {first_paint:.1f}ms 超出预算 {args.budget_ms:.0f}ms", file=sys.stderr)
+        sys.exit(1)
+    print(f"首屏耗时 {first_paint:.1f}ms，预算 {args.budget_ms:.0f}ms 内")
+
+
+if __name__ == "__main__":
+    main()
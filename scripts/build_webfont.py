@@ -0,0 +1,110 @@
+"""把 京華老宋体 子集化为仅包含看板实际用到字形的 WOFF2 网页字体。
+
+完整的中文字体有数 MB，以 Base64 内嵌会拖垮首屏 WebSocket 传输（见 app.py 中
+EMBED_FONT_MAX_BYTES 的说明）。本脚本收集界面文案（app.py 及 gaokao/ 源码中的字符）
+和数据中（清单中的每个数据集分区）的院校/专业/姓名用字，生成几十 KB 的子集字体，由 Streamlit 静态文件服务
+（.streamlit/config.toml 中 enableStaticServing）以独立、可缓存的文件提供。
+
+依赖（仅构建时需要）：pip install fonttools brotli
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+import pandas as pd
+
+
+BASE = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE))
+
+from gaokao.data import DATA_FILES  # noqa: E402
+from gaokao.datasets import load_manifest  # noqa: E402
+
+DEFAULT_FONT = BASE / "static" / "京華老宋体v3.0.ttf"
+DEFAULT_OUTPUT = BASE / "static" / "webfont-subset.woff2"
+
+SOURCE_FILES = [BASE / "app.py", *sorted((BASE / "gaokao").glob("*.py"))]
+# 需要收集用字的数据列（含 报考院校1..N / 报考专业1..N 等宽表列）
+VOCAB_COLUMN_PREFIXES = ("姓名", "院校名称", "专业名称", "报考院校", "报考专业", "录取院校", "录取专业", "班级")
+
+# 始终保留的字符：可打印 ASCII 与常用中文标点
+BASE_CHARS = "".join(chr(c) for c in range(0x20, 0x7F)) + "，。、；：？！“”‘’（）《》【】—…·￥％"
+
+
+def _partition_dirs(data_dir: Path) -> Tuple[List[Path], List[str]]:
+    """清单中各数据集分区的目录（含 data/ 根目录本身）；分区中的名称显示在侧边栏，也一并返回。"""
+    manifest = load_manifest(str(data_dir))
+    dirs = [data_dir] + [Path(manifest.path_of(p)) for p in manifest.partitions]
+    unique = list(dict.fromkeys(d.resolve() for d in dirs))
+    return unique, [p.title for p in manifest.partitions]
+
+
+def collect_text(data_dir: Path) -> set:
+    chars = set(BASE_CHARS)
+
+    for path in SOURCE_FILES:
+        if path.exists():
+            chars.update(path.read_text(encoding="utf-8"))
+
+    dirs, titles = _partition_dirs(data_dir)
+    chars.update("".join(titles))
+    for path in (d / fn for d in dirs for fn in DATA_FILES):
+        if not path.exists():
+            continue
+        header = pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns
+        chars.update("".join(map(str, header)))
+        cols = [c for c in header if str(c).startswith(VOCAB_COLUMN_PREFIXES)]
+        if not cols:
+            continue
+        df = pd.read_csv(path, usecols=cols, dtype=str, encoding="utf-8-sig")
+        for c in cols:
+            for value in df[c].dropna().unique():
+                chars.update(value)
+
+    # 控制字符不进入字体
+    return {ch for ch in chars if ch.isprintable()}
+
+
+def build_subset(font_path: Path, output_path: Path, chars: set) -> int:
+    try:
+        from fontTools import subset
+    except ImportError as e:
+        raise SystemExit("缺少依赖 fonttools：请先执行 pip install fonttools brotli") from e
+
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = ["*"]
+    options.name_IDs = ["*"]
+    options.notdef_outline = True
+    options.desubroutinize = True
+
+    font = subset.load_font(str(font_path), options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text="".join(sorted(chars)))
+    subsetter.subset(font)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    subset.save_font(font, str(output_path), options)
+    return output_path.stat().st_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="生成看板用的子集化 WOFF2 字体")
+    parser.add_argument("--font", default=str(DEFAULT_FONT), help="源字体路径（TTF/OTF）")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="输出 WOFF2 路径")
+    parser.add_argument("--data-dir", default=str(BASE / "data"), help="数据目录，用于收集院校/专业/姓名用字")
+    args = parser.parse_args()
+
+    font_path = Path(args.font)
+    if not font_path.exists():
+        raise SystemExit(f"字体文件未找到: {font_path}")
+
+    chars = collect_text(Path(args.data_dir))
+    size = build_subset(font_path, Path(args.output), chars)
+    print(f"收集字符 {len(chars)} 个，写入 {args.output}（{size / 1024:.1f} KB）")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
 import argparse
+import sys
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gaokao.export import export_file  # noqa: E402
+
 
 SUBJECTS = [
     ("历史", "历史原始", "历史赋分"),
@@ -107,7 +112,7 @@ def enforce_rules(df: pd.DataFrame) -> pd.DataFrame:
 def main() -> None:
     parser = argparse.ArgumentParser(description="按满分与6选3规则规范化成绩 CSV")
     parser.add_argument("--input", required=True, help="输入 CSV 路径")
-    parser.add_argument("--output", required=True, help="输出 CSV 路径")
+    parser.add_argument("--output", required=True, help="输出路径，按后缀选择格式：.csv / .csv.zst / .parquet")
     args = parser.parse_args()
 
     input_path = Path(args.input)
@@ -116,8 +121,8 @@ def main() -> None:
     df = pd.read_csv(input_path)
     df2 = enforce_rules(df)
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    df2.to_csv(output_path, index=False, encoding="utf-8-sig")
+    # 分块写出，CSV 为 UTF-8 BOM
+    export_file(df2, str(output_path))
 
 
 if __name__ == "__main__":
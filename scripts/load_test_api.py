@@ -0,0 +1,143 @@
+"""对本地查询服务（python -m gaokao.api）压测，报告吞吐量与尾延迟。
+
+以多个线程各自保持一条 HTTP/1.1 连接，在给定时长内按比例混合请求
+/student、/rank、/recommend、/admit，最后输出每秒请求数与 p50/p95/p99 延迟。
+
+用法：python scripts/load_test_api.py --port 8600 --concurrency 16 --duration 10 [--partition 2025/一模]
+（--partition 应与服务端 python -m gaokao.api --dataset 一致，准考证号从该分区的成绩文件中抽样）
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gaokao.data import default_data_dir, find_score_file  # noqa: E402
+from gaokao.datasets import load_manifest  # noqa: E402
+
+
+def _score_file(data_dir: str, partition: Optional[str]) -> str:
+    """按分区清单找到所选数据集（默认数据集）的成绩文件。"""
+    manifest = load_manifest(data_dir)
+    path = find_score_file(manifest.path_of(manifest.get(partition)))
+    if path is None:
+        raise FileNotFoundError(f"数据集 {partition or manifest.default} 中未找到成绩文件")
+    return path
+
+
+def _sample_ids(score_file: str, n: int = 2000) -> list:
+    df = pd.read_csv(score_file, usecols=["准考证号"], encoding="utf-8-sig")
+    ids = df["准考证号"].astype(str).tolist()
+    return random.sample(ids, min(n, len(ids)))
+
+
+def _make_paths(ids: list, rng: random.Random):
+    def next_path() -> str:
+        r = rng.random()
+        if r < 0.4:
+            return f"/student/{quote(rng.choice(ids))}"
+        if r < 0.7:
+            return f"/rank?score={rng.randint(300, 720)}"
+        if r < 0.9:
+            return f"/recommend?score={rng.randint(450, 700)}&limit=20"
+        return f"/admit?id={quote(rng.choice(ids))}"
+    return next_path
+
+
+def _worker(host, port, ids, deadline, seed, latencies, errors, lock):
+    rng = random.Random(seed)
+    next_path = _make_paths(ids, rng)
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    local_lat = []
+    local_err = 0
+    while time.perf_counter() < deadline:
+        path = next_path()
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status >= 500:
+                local_err += 1
+        except (OSError, http.client.HTTPException):
+            local_err += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=10)
+            continue
+        local_lat.append(time.perf_counter() - start)
+    conn.close()
+    with lock:
+        latencies.extend(local_lat)
+        errors[0] += local_err
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="查询服务压测")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--concurrency", type=int, default=16, help="并发连接数")
+    parser.add_argument("--duration", type=float, default=10.0, help="压测时长（秒）")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    parser.add_argument("--data-dir", default=default_data_dir(), help="数据根目录")
+    parser.add_argument("--partition", help="数据集（分区）键，如 2025/一模；默认取清单中的默认数据集")
+    args = parser.parse_args()
+
+    ids = _sample_ids(_score_file(args.data_dir, args.partition))
+    latencies: list = []
+    errors = [0]
+    lock = threading.Lock()
+
+    start = time.perf_counter()
+    deadline = start + args.duration
+    threads = [
+        threading.Thread(
+            target=_worker,
+            args=(args.host, args.port, ids, deadline, seed, latencies, errors, lock),
+        )
+        for seed in range(args.concurrency)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    if not latencies:
+        print("没有成功的请求，请确认服务已启动", file=sys.stderr)
+        sys.exit(1)
+
+    lat_ms = np.asarray(latencies) * 1000.0
+    report = {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "seconds": round(elapsed, 2),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(lat_ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(lat_ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(lat_ms, 99)), 2),
+        "max_ms": round(float(lat_ms.max()), 2),
+        "concurrency": args.concurrency,
+        "cpus": os.cpu_count(),
+    }
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False))
+    else:
+        for k, v in report.items():
+            print(f"{k:<12}{v}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""测试公用：把仓库根目录加入 sys.path，并提供小规模的合成成绩数据。"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gaokao.data import ELECTIVE_SUBJECTS  # noqa: E402
+
+
+def synth_scores(n: int, rng: np.random.Generator, prefix: str = "KS") -> pd.DataFrame:
+    """n 名考生的成绩表：语数英 + 每人随机 3 门选考（原始分为整数，同分很多）。"""
+    df = pd.DataFrame({
+        "准考证号": [f"{prefix}{i:05d}" for i in range(n)],
+        "姓名": [f"考生{i}" for i in range(n)],
+    })
+    for c in ["语文", "数学", "英语"]:
+        df[c] = rng.integers(60, 151, n)
+    chosen = np.argsort(rng.random((n, len(ELECTIVE_SUBJECTS))), axis=1)[:, :3]
+    picked = np.zeros((n, len(ELECTIVE_SUBJECTS)), dtype=bool)
+    picked[np.arange(n)[:, None], chosen] = True
+    for j, subj in enumerate(ELECTIVE_SUBJECTS):
+        # 分数范围窄，保证各科有大量同分
+        raw = rng.integers(40, 81, n).astype(float)
+        df[f"{subj}原始"] = np.where(picked[:, j], raw, np.nan)
+    return df
+
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    return np.random.default_rng(20250607)
@@ -0,0 +1,154 @@
+"""录取引擎与逐个考生的朴素参考实现结果一致。"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gaokao import admission
+from gaokao.admission import ADMITTED, REJECTED, SLIDE, admit, admit_rounds, build_choices, simulate_admission
+from gaokao.choices import PAD
+
+
+def _random_case(rng: np.random.Generator, n_students: int, n_schools: int = 5, majors: int = 4, k: int = 6):
+    plan = pd.DataFrame(
+        [
+            {"院校名称": f"院校{s}", "专业名称": f"专业{m}", "招收人数": int(rng.integers(0, 4))}
+            for s in range(n_schools)
+            for m in range(majors)
+        ]
+    )
+    rows = []
+    for i in range(n_students):
+        row = {
+            "位次": int(rng.integers(1, n_students // 2 + 2)),  # 位次有并列
+            "准考证号": f"KS{i:04d}",
+            "姓名": f"考生{i}",
+            "服从调剂": rng.choice(["是", "否", None]),
+        }
+        for j in range(1, k + 1):
+            r = rng.random()
+            if r < 0.15:
+                school, major = None, None  # 空志愿
+            elif r < 0.2:
+                school, major = "院校X", "专业X"  # 不在招生计划中
+            else:
+                school, major = f"院校{rng.integers(0, n_schools)}", f"专业{rng.integers(0, majors)}"
+            row[f"报考院校{j}"] = school
+            row[f"报考专业{j}"] = major
+        rows.append(row)
+    return plan, pd.DataFrame(rows)
+
+
+def _reference_admit(choices) -> np.ndarray:
+    """按位次（同位次按行号）逐个考生检索志愿。"""
+    ranks = choices.ranks
+    seats = choices.plan.seats.tolist()
+    admitted = np.full(len(ranks), PAD, dtype=np.int32)
+    for row in sorted(range(len(ranks)), key=lambda i: ranks[i]):
+        for pid in choices.matrix[row].tolist():
+            if pid >= 0 and seats[pid] > 0:
+                seats[pid] -= 1
+                admitted[row] = pid
+                break
+    return admitted
+
+
+def _reference_rounds(choices, adjust: np.ndarray, max_rounds: int):
+    """院校投档 + 退档/调剂规则的逐个考生实现。"""
+    plan = choices.plan
+    ranks = choices.ranks
+    school_of = list(plan.schools)
+    seats = plan.seats.tolist()
+    n = len(ranks)
+    admitted = np.full(n, PAD, dtype=np.int32)
+    status = np.full(n, SLIDE, dtype=np.int8)
+    adjusted = np.zeros(n, dtype=bool)
+    round_no = np.zeros(n, dtype=np.int8)
+    excluded = {i: set() for i in range(n)}
+
+    def school_left(school):
+        return sum(seats[p] for p in range(len(seats)) if school_of[p] == school)
+
+    queue = sorted(range(n), key=lambda i: ranks[i])
+    for rnd in range(1, max_rounds + 1):
+        rejected = []
+        for row in queue:
+            prefs = [p for p in choices.matrix[row].tolist() if p >= 0]
+            for k, pid in enumerate(prefs):
+                school = school_of[pid]
+                if school_left(school) <= 0 or school in excluded[row]:
+                    continue
+                placed = next((q for q in prefs[k:] if school_of[q] == school and seats[q] > 0), None)
+                if placed is None and adjust[row]:
+                    # 调剂到该校剩余名额最多的专业，并列时取 id 最小的
+                    candidates = [p for p in range(len(seats)) if school_of[p] == school and seats[p] > 0]
+                    placed = min(candidates, key=lambda p: (-seats[p], p))
+                    adjusted[row] = True
+                if placed is None:
+                    status[row] = REJECTED
+                    excluded[row].add(school)
+                    rejected.append(row)
+                else:
+                    seats[placed] -= 1
+                    admitted[row] = placed
+                    status[row] = ADMITTED
+                    round_no[row] = rnd
+                break
+        if not rejected:
+            break
+        queue = sorted(rejected, key=lambda i: ranks[i])
+    return admitted, status, adjusted, round_no
+
+
+@pytest.fixture(params=[1, 7, 4096], ids=lambda size: f"chunk{size}")
+def chunk_size(request, monkeypatch):
+    # 小批次使批内名额变化与批次开始时的预筛选都被覆盖到
+    monkeypatch.setattr(admission, "CHUNK_SIZE", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_admit_matches_reference(seed, chunk_size):
+    rng = np.random.default_rng(seed)
+    plan, vol = _random_case(rng, n_students=int(rng.integers(1, 120)))
+    choices = build_choices(plan, vol)
+    np.testing.assert_array_equal(admit(choices), _reference_admit(choices))
+
+
+@pytest.mark.parametrize("max_rounds", [1, 2, 3])
+@pytest.mark.parametrize("seed", range(8))
+def test_admit_rounds_matches_reference(seed, max_rounds, chunk_size):
+    rng = np.random.default_rng(100 + seed)
+    # 院校较多时退档考生在后续轮次仍有院校可投
+    plan, vol = _random_case(rng, n_students=int(rng.integers(1, 120)), n_schools=12, majors=3)
+    choices = build_choices(plan, vol)
+    adjust = admission.adjust_flags(choices, default=bool(seed % 2))
+    got = admit_rounds(choices, adjust=adjust, max_rounds=max_rounds)
+    expected = _reference_rounds(choices, adjust, max_rounds)
+    for a, b in zip(got, expected):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_simulate_admission_result_table(rng):
+    plan, vol = _random_case(rng, n_students=60)
+    df_result = simulate_admission(plan, vol)
+    choices = build_choices(plan, vol)
+    expected = _reference_admit(choices)
+    by_id = dict(zip(choices.candidates["准考证号"], expected.tolist()))
+
+    assert df_result["位次"].is_monotonic_increasing
+    for _, row in df_result.iterrows():
+        pid = by_id[row["准考证号"]]
+        if pid < 0:
+            assert row["录取状态"] == "滑档"
+        else:
+            assert row["录取状态"] == "录取"
+            assert (row["录取院校"], row["录取专业"]) == choices.plan.pair(pid)
+
+
+def test_rounds_never_exceed_seats(rng):
+    plan, vol = _random_case(rng, n_students=200)
+    df_result = simulate_admission(plan, vol, mode=admission.MODE_ROUNDS, adjust_default=True, max_rounds=3)
+    taken = df_result[df_result["录取状态"] == "录取"].groupby(["录取院校", "录取专业"]).size()
+    seats = plan.set_index(["院校名称", "专业名称"])["招收人数"]
+    assert (taken <= seats.reindex(taken.index)).all()
@@ -0,0 +1,78 @@
+"""分块导出的各格式都能原样读回。"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gaokao.export import HAS_PARQUET, HAS_ZSTD, export_bytes, export_file, format_for_path, iter_csv_chunks
+
+
+def _frame(n: int = 23) -> pd.DataFrame:
+    # 后几块里整列为空：逐块推断类型时会得到 null，与首块的类型不一致
+    df = pd.DataFrame({
+        "准考证号": [f"KS{i:05d}" for i in range(n)],
+        "总成绩": np.arange(n, dtype=float) + 500.5,
+        "位次": np.arange(1, n + 1),
+        "录取院校": [f"院校{i % 3}" if i < 5 else None for i in range(n)],
+        "是否调剂": pd.array([True if i < 4 else None for i in range(n)], dtype="boolean"),
+    })
+    df["备注"] = np.where(np.arange(n) < 3, 1.0, np.nan)
+    df["录取轮次"] = pd.Series([i % 2 + 1 if i < 5 else None for i in range(n)], dtype=object)
+    return df
+
+
+def test_csv_chunks_match_to_csv():
+    df = _frame()
+    joined = b"".join(iter_csv_chunks(df, chunk_rows=4))
+    assert joined == b"\xef\xbb\xbf" + df.to_csv(index=False).encode("utf-8")
+    empty = df.iloc[:0]
+    assert b"".join(iter_csv_chunks(empty)) == b"\xef\xbb\xbf" + empty.to_csv(index=False).encode("utf-8")
+
+
+def test_csv_round_trip():
+    df = _frame()
+    back = pd.read_csv(io.BytesIO(export_bytes(df, "csv", chunk_rows=4)), encoding="utf-8-sig")
+    pd.testing.assert_frame_equal(back, pd.read_csv(io.StringIO(df.to_csv(index=False))))
+
+
+@pytest.mark.skipif(not HAS_PARQUET, reason="需要 pyarrow")
+@pytest.mark.parametrize("chunk_rows", [1, 4, 1000])
+def test_parquet_round_trip(chunk_rows):
+    df = _frame()
+    back = pd.read_parquet(io.BytesIO(export_bytes(df, "parquet", chunk_rows=chunk_rows)))
+    # 含空值的整数列读回为浮点
+    expected = df.assign(录取轮次=pd.to_numeric(df["录取轮次"]))
+    pd.testing.assert_frame_equal(back, expected, check_dtype=False)
+
+
+@pytest.mark.skipif(not HAS_PARQUET, reason="需要 pyarrow")
+def test_parquet_empty_frame():
+    df = _frame().iloc[:0]
+    back = pd.read_parquet(io.BytesIO(export_bytes(df, "parquet")))
+    assert list(back.columns) == list(df.columns)
+    assert len(back) == 0
+
+
+@pytest.mark.skipif(not HAS_ZSTD, reason="需要 zstandard")
+def test_zstd_round_trip():
+    import zstandard
+
+    df = _frame()
+    raw = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(export_bytes(df, "csv.zst", chunk_rows=4))).read()
+    assert raw == b"\xef\xbb\xbf" + df.to_csv(index=False).encode("utf-8")
+
+
+def test_export_file_infers_format(tmp_path):
+    df = _frame()
+    path = tmp_path / "out" / "结果.csv"
+    export_file(df, str(path), chunk_rows=5)
+    assert format_for_path(str(path)) == "csv"
+    assert path.read_bytes() == export_bytes(df, "csv")
+    assert [p.name for p in path.parent.iterdir()] == ["结果.csv"]  # 临时文件已替换
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        export_bytes(_frame(), "xlsx")
@@ -0,0 +1,58 @@
+"""向量化赋分与原逐级赋分实现结果一致。"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gaokao.fufen import LEVEL_CUM_RATIOS, LEVEL_SCORE_RANGES, level_bounds, zhejiang_grade_score
+
+
+def _reference_grade(raw_scores: pd.Series) -> pd.Series:
+    """原 scripts/apply_zhejiang_fufen.py 的实现：按名次分级，再逐级线性映射。"""
+    raw = pd.to_numeric(raw_scores, errors="coerce")
+    out = pd.Series(pd.NA, index=raw.index, dtype="Int64")
+    valid = raw[raw.notna()]
+    if valid.empty:
+        return out
+
+    ranks = valid.rank(method="first", ascending=False).astype(int)
+    p = ((ranks - 1) / len(valid)).to_numpy(dtype=float)
+    levels = pd.Series(
+        np.searchsorted(np.array(LEVEL_CUM_RATIOS), p, side="right") + 1, index=valid.index,
+    )
+    for level in range(1, 21):
+        group = valid[levels == level].astype(float)
+        if group.empty:
+            continue
+        t_low, t_high = LEVEL_SCORE_RANGES[level - 1]
+        s1, s2 = float(group.min()), float(group.max())
+        if s2 == s1:
+            t = np.full(len(group), (t_low + t_high) / 2.0)
+        else:
+            t = t_low + (group.to_numpy() - s1) * (t_high - t_low) / (s2 - s1)
+        out.loc[group.index] = np.clip(np.floor(t + 0.5).astype(int), 40, 100)
+    return out
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_grade_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 500))
+    # 窄分数段制造大量同分，部分考生缺考
+    raw = pd.Series(rng.integers(30, 101, n).astype(float))
+    raw[rng.random(n) < 0.3] = np.nan
+    pd.testing.assert_series_equal(zhejiang_grade_score(raw), _reference_grade(raw))
+
+
+@pytest.mark.parametrize("values", [[], [np.nan, np.nan], [70.0], [60.0] * 37, [55.5, 90.25, 55.5, 71.0]])
+def test_grade_edge_cases(values):
+    raw = pd.Series(values, dtype=float)
+    pd.testing.assert_series_equal(zhejiang_grade_score(raw), _reference_grade(raw))
+
+
+def test_level_bounds_match_ratio_rule():
+    # 名次 i（从 0 起）的等级 = 1 + 累计比例中不超过 i/n 的个数
+    for n in range(1, 1000):
+        levels = np.searchsorted(np.array(LEVEL_CUM_RATIOS), np.arange(n) / n, side="right") + 1
+        expected = np.searchsorted(levels, np.arange(1, 21), side="left")
+        np.testing.assert_array_equal(level_bounds(n), np.r_[expected, n], err_msg=f"n={n}")
@@ -0,0 +1,74 @@
+"""ScoreBook 增量追加与全量重建结果一致。"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import synth_scores
+from gaokao.incremental import ScoreBook
+
+
+def _assert_same(a: np.ndarray, b: np.ndarray) -> None:
+    np.testing.assert_array_equal(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+
+
+def _assert_matches_rebuild(book: ScoreBook) -> None:
+    fresh = ScoreBook(book.df.drop(columns=["总成绩"]), regrade=True)
+    for raw_col, subject in book.subjects.items():
+        _assert_same(book.df[subject.fufen_col], fresh.df[subject.fufen_col])
+        np.testing.assert_array_equal(subject.index.order, fresh.subjects[raw_col].index.order)
+        np.testing.assert_array_equal(subject.bounds, fresh.subjects[raw_col].bounds)
+    _assert_same(book.df["总成绩"], fresh.df["总成绩"])
+    _assert_same(book.ranks, fresh.ranks)
+    np.testing.assert_array_equal(book.segments._sorted, fresh.segments._sorted)
+    pd.testing.assert_frame_equal(book.rank_table(), fresh.rank_table())
+
+
+def _remarks(book: ScoreBook, rng: np.random.Generator, k: int) -> pd.DataFrame:
+    """k 名已有考生的改分：一门选考（含缺考→有成绩）与语文分数变化。"""
+    rows = book.df.sample(k, random_state=int(rng.integers(1_000_000)))
+    batch = rows[[c for c in rows.columns if not c.endswith("赋分") and c != "总成绩"]].copy()
+    batch["物理原始"] = rng.integers(40, 81, k).astype(float)
+    batch["语文"] = rng.integers(60, 151, k)
+    return batch
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_append_matches_rebuild(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(5, 300))
+    book = ScoreBook(synth_scores(n, rng), regrade=True)
+    for step in range(3):
+        m = int(rng.integers(1, 25))
+        batch = synth_scores(m, rng, prefix=f"N{step}_")
+        k = int(rng.integers(0, 5))
+        if k:
+            batch = pd.concat([batch, _remarks(book, rng, k)], ignore_index=True)
+        report = book.append(batch)
+        assert report.added == m
+        assert report.updated == k
+        _assert_matches_rebuild(book)
+
+
+def test_append_duplicate_ids_keep_last(rng):
+    book = ScoreBook(synth_scores(50, rng), regrade=True)
+    batch = synth_scores(3, rng, prefix="N")
+    batch = pd.concat([batch, batch.assign(语文=150)], ignore_index=True)
+    report = book.append(batch)
+    assert report.added == 3
+    assert (book.df.loc[book.df["准考证号"].str.startswith("N"), "语文"] == 150).all()
+    _assert_matches_rebuild(book)
+
+
+def test_keep_published_reports_stale_subjects(rng):
+    df = synth_scores(200, rng)
+    published = ScoreBook(df, regrade=True).df.drop(columns=["总成绩"])
+    book = ScoreBook(published, regrade=False)
+    before = book.df.copy()
+
+    report = book.append(synth_scores(40, rng, prefix="N"))
+    assert report.regraded == []
+    assert report.stale  # 追加 20% 的考生，等级边界必然移动
+    assert report.changed_rows == 0
+    for subject in book.subjects.values():
+        _assert_same(book.df[subject.fufen_col].iloc[:len(before)], before[subject.fufen_col])
@@ -0,0 +1,100 @@
+"""流式 zip 写出器与批量报告的输出能被标准 zipfile 完整读回。"""
+
+import io
+import struct
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import synth_scores
+from gaokao.data import compute_total_score
+from gaokao.fufen import zhejiang_grade_score
+from gaokao.reports import INDEX_FILE, ZipStream, build_context, file_name, generate_reports
+
+
+def _read_back(data: bytes) -> zipfile.ZipFile:
+    zf = zipfile.ZipFile(io.BytesIO(data))
+    assert zf.testzip() is None
+    return zf
+
+
+def test_zipstream_round_trip(rng):
+    files = {
+        "报告/张三.html": "<p>总成绩 650</p>".encode("utf-8") * 50,
+        "随机.bin": rng.bytes(5000),
+        "空.txt": b"",
+    }
+    buf = io.BytesIO()
+    zs = ZipStream(buf)
+    for name, raw in files.items():
+        zs.writestr(name, raw)
+    zs.close()
+
+    zf = _read_back(buf.getvalue())
+    assert zf.namelist() == list(files)
+    for name, raw in files.items():
+        assert zf.read(name) == raw
+        # 文件名按 UTF-8 标记写出
+        assert zf.getinfo(name).flag_bits & 0x0800
+
+
+def test_zipstream_zip64_entry_count():
+    n = 0x10000 + 10  # 超过 zip 格式 65535 个条目的上限
+    buf = io.BytesIO()
+    zs = ZipStream(buf)
+    for i in range(n):
+        zs.writestr(f"{i}.txt", str(i).encode())
+    zs.close()
+
+    data = buf.getvalue()
+    assert struct.pack("<I", 0x06064B50) in data[-200:]  # zip64 中央目录结束记录
+    zf = _read_back(data)
+    assert len(zf.infolist()) == n
+    assert zf.read(f"{n - 1}.txt") == str(n - 1).encode()
+
+
+def test_zipstream_zip64_header_offset():
+    # 假装前面已写出 4 GiB：条目偏移超出 32 位，须写入 zip64 扩展字段。
+    # zipfile 把缺少的前缀当作附加在 zip 前的数据，仍可按相对位置读回
+    buf = io.BytesIO()
+    zs = ZipStream(buf)
+    zs._offset = 2**32 + 5
+    zs.writestr("a.html", "你好".encode("utf-8") * 1000)
+    zs.writestr("b.txt", b"xyz" * 100)
+    zs.close()
+
+    zf = _read_back(buf.getvalue())
+    for info in zf.infolist():
+        assert info.extra[:2] == struct.pack("<H", 0x0001)
+    assert zf.read("a.html") == "你好".encode("utf-8") * 1000
+    assert zf.read("b.txt") == b"xyz" * 100
+
+
+@pytest.mark.parametrize("fmt", ["html", "svg"])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_generate_reports_round_trip(rng, fmt, workers):
+    df = synth_scores(37, rng)
+    for subj in ["历史", "地理", "政治", "物理", "化学", "生物", "技术"]:
+        df[f"{subj}赋分"] = zhejiang_grade_score(df[f"{subj}原始"]).astype(float)
+    df["总成绩"] = compute_total_score(df)
+    plan = pd.DataFrame({
+        "院校名称": [f"院校{i}" for i in range(30)],
+        "专业名称": [f"专业{i}" for i in range(30)],
+        "招收人数": np.arange(30) + 1,
+        "最低分数线": np.linspace(400, 700, 30),
+    })
+    ctx = build_context(df, plan)
+
+    buf = io.BytesIO()
+    summary = generate_reports(ctx, buf, fmt=fmt, workers=workers, chunk_size=10)
+    assert summary.count == len(df)
+
+    zf = _read_back(buf.getvalue())
+    expected = [file_name(ctx, i, fmt) for i in range(len(df))]
+    assert zf.namelist() == expected + [INDEX_FILE]
+    index = pd.read_csv(io.BytesIO(zf.read(INDEX_FILE)), encoding="utf-8-sig", dtype={"准考证号": str})
+    assert index["文件"].tolist() == expected
+    assert index["准考证号"].tolist() == df["准考证号"].tolist()
+    assert df["姓名"].iloc[0] in zf.read(expected[0]).decode("utf-8")